@@ -1,20 +1,29 @@
 """
 Authentication API routes.
 """
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Depends, status
+from app.responses import ORJSONResponse
 from app.schemas.auth import AdminLogin, TokenResponse
 from app.services.auth_service import AuthService
+from app.dependencies import get_auth_service, rate_limit
 
 router = APIRouter(prefix="/admin", tags=["authentication"])
 
 
-@router.post("/login", response_model=TokenResponse, status_code=status.HTTP_200_OK)
-async def admin_login(login_data: AdminLogin):
+@router.post(
+    "/login",
+    response_model=TokenResponse,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(rate_limit("/admin/login"))]
+)
+async def admin_login(
+    login_data: AdminLogin,
+    service: AuthService = Depends(get_auth_service)
+):
     """Admin login endpoint."""
-    service = AuthService()
     result = await service.authenticate_admin(
         email=login_data.email,
         password=login_data.password
     )
-    return TokenResponse(**result)
+    return ORJSONResponse(result)
 
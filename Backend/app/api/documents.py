@@ -0,0 +1,166 @@
+"""
+Tenant document API routes.
+"""
+from typing import AsyncIterator, List, Optional
+from bson import json_util
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from app.api.organization import NDJSON_MEDIA_TYPE
+from app.config import settings
+from app.responses import ORJSONResponse, dumps_line
+from app.schemas.document import (
+    DocumentInsertResponse,
+    DocumentListResponse,
+    DocumentSingleInsertResponse
+)
+from app.services.document_service import INVALID_ID_ERROR, TenantDocumentService, parse_filter
+from app.dependencies import get_current_admin, get_document_service
+
+router = APIRouter(prefix="/org/{organization_name}/documents", tags=["documents"])
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Parse the comma-separated ``fields`` query parameter."""
+    if not fields:
+        return None
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    if any(field.startswith("$") for field in requested):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Field names must not start with '$'"
+        )
+    return requested or None
+
+
+@router.post(
+    "",
+    response_model=DocumentInsertResponse,
+    responses={201: {"model": DocumentSingleInsertResponse, "description": "Single document inserted"}},
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "oneOf": [
+                            {"type": "object", "description": "One document"},
+                            {"type": "array", "items": {"type": "object"}, "description": "Several documents"}
+                        ]
+                    }
+                }
+            },
+            "required": True
+        }
+    }
+)
+async def insert_documents(
+    organization_name: str,
+    request: Request,
+    admin: dict = Depends(get_current_admin),
+    service: TenantDocumentService = Depends(get_document_service)
+):
+    """
+    Insert one document (a JSON object) or several (a JSON array).
+    
+    The body is MongoDB Extended JSON, so ``{"$date": ...}`` and
+    ``{"$oid": ...}`` values are stored as dates and ObjectIds. A given
+    ``_id`` must be an ObjectId; one is generated when it is left out. Concurrent
+    inserts are coalesced into bulk writes; every document is acknowledged
+    individually. A single document returns 201 with its ``inserted_id``;
+    an array returns one result per document.
+    """
+    body = await request.body()
+    if len(body) > settings.tenant_documents_max_request_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Request body exceeds {settings.tenant_documents_max_request_bytes} bytes"
+        )
+    try:
+        payload = json_util.loads(body)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Body must be a JSON object or array"
+        ) from None
+    
+    single = isinstance(payload, dict)
+    documents = [payload] if single else payload
+    if not isinstance(documents, list) or not documents:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Body must be a JSON object or a non-empty array"
+        )
+    if len(documents) > settings.tenant_documents_max_batch:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.tenant_documents_max_batch} documents per request"
+        )
+    
+    results = await service.insert_documents(organization_name, admin["sub"], documents)
+    if single:
+        result = results[0]
+        if result["status"] != "inserted":
+            if result["error"] == "Duplicate _id":
+                status_code = status.HTTP_409_CONFLICT
+            elif result["error"] == INVALID_ID_ERROR:
+                status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+            else:
+                status_code = status.HTTP_400_BAD_REQUEST
+            raise HTTPException(status_code=status_code, detail=result["error"])
+        return ORJSONResponse({"inserted_id": result["inserted_id"]}, status_code=status.HTTP_201_CREATED)
+    inserted = sum(1 for result in results if result["status"] == "inserted")
+    return ORJSONResponse({"results": results, "inserted": inserted, "failed": len(results) - inserted})
+
+
+async def _export_ndjson(documents: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    async for document in documents:
+        yield dumps_line(document)
+
+
+@router.get(
+    "",
+    response_model=DocumentListResponse,
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}}
+)
+async def find_documents(
+    organization_name: str,
+    filter: Optional[str] = Query(None, description="MongoDB filter as Extended JSON"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return besides _id"),
+    limit: int = Query(50, ge=1, le=settings.tenant_documents_max_limit),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    admin: dict = Depends(get_current_admin),
+    service: TenantDocumentService = Depends(get_document_service)
+):
+    """
+    Query documents with keyset pagination on ``_id``.
+    
+    Pass the returned ``next_cursor`` to fetch the following page. With
+    ``format=ndjson`` every matching document (after ``cursor``, if given) is
+    streamed as one JSON object per line and ``limit`` is ignored.
+    """
+    query = parse_filter(filter)
+    selected = _parse_fields(fields)
+    descending = order == "desc"
+    if format == "ndjson":
+        documents = await service.export_documents(
+            organization_name, admin["sub"], query, cursor=cursor, descending=descending, fields=selected
+        )
+        return StreamingResponse(_export_ndjson(documents), media_type=NDJSON_MEDIA_TYPE)
+    
+    result = await service.find_documents(
+        organization_name, admin["sub"], query, limit, cursor=cursor, descending=descending, fields=selected
+    )
+    return ORJSONResponse(result)
+
+
+@router.get("/{document_id}")
+async def get_document(
+    organization_name: str,
+    document_id: str,
+    admin: dict = Depends(get_current_admin),
+    service: TenantDocumentService = Depends(get_document_service)
+):
+    """Get a document by ``_id`` (an ObjectId hex string)."""
+    document = await service.get_document(organization_name, admin["sub"], document_id)
+    return ORJSONResponse(document)
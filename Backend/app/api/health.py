@@ -0,0 +1,26 @@
+"""
+Liveness and readiness probe routes.
+"""
+from fastapi import APIRouter, Depends, status
+from app.dependencies import get_readiness_probe
+from app.health import ReadinessProbe
+from app.responses import ORJSONResponse
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("/live")
+async def liveness():
+    """The worker process is up and its event loop is responsive."""
+    return {"status": "alive"}
+
+
+@router.get("/ready", responses={503: {"description": "Worker should not receive traffic"}})
+async def readiness(probe: ReadinessProbe = Depends(get_readiness_probe)):
+    """Report whether this worker can take traffic; 503 when it should be drained."""
+    result = await probe.check()
+    result["status"] = "ready" if result["ready"] else "unready"
+    return ORJSONResponse(
+        status_code=status.HTTP_200_OK if result["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content=result
+    )
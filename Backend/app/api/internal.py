@@ -0,0 +1,26 @@
+"""
+Internal operational endpoints.
+"""
+from fastapi import APIRouter, Depends
+from app.config import settings
+from app.db_metrics import pool_metrics, command_metrics
+from app.dependencies import require_operator
+
+router = APIRouter(
+    prefix="/internal",
+    tags=["internal"],
+    dependencies=[Depends(require_operator)]
+)
+
+
+@router.get("/metrics/db")
+async def database_metrics():
+    """Connection pool and per-command MongoDB metrics."""
+    return {
+        "pool": {
+            "max_pool_size": settings.mongodb_max_pool_size,
+            "in_use": pool_metrics.in_use(),
+            "pools": pool_metrics.snapshot()
+        },
+        "commands": command_metrics.snapshot()
+    }
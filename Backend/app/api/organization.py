@@ -1,59 +1,447 @@
 """
 Organization API routes.
 """
-from fastapi import APIRouter, status
+from typing import AsyncIterator, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from app.config import settings
+from app.responses import DuplexStreamingResponse, ORJSONResponse, dumps_line
 from app.schemas.organization import (
     OrganizationCreate,
+    OrganizationBulkCreate,
+    OrganizationBulkCreateResponse,
     OrganizationUpdate,
     OrganizationGet,
+    OrganizationBatchGet,
     OrganizationDelete,
-    OrganizationResponse
+    OrganizationDeleteResponse,
+    OrganizationRestore,
+    OrganizationResponse,
+    OrganizationBatchResponse,
+    OrganizationListResponse,
+    JobResponse
 )
-from app.services.organization_service import OrganizationService
+from app.services.organization_service import LIST_FIELDS, LIST_SORT_KEYS, OrganizationService
+from app.services.job_queue import JobQueue, serialize_job
+from app.dependencies import get_current_admin, get_job_queue, get_organization_service, rate_limit
 
 router = APIRouter(prefix="/org", tags=["organizations"])
 
 
-@router.post("/create", response_model=OrganizationResponse, status_code=status.HTTP_201_CREATED)
-async def create_organization(org_data: OrganizationCreate):
+@router.post(
+    "/create",
+    response_model=OrganizationResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit("/org/create"))]
+)
+async def create_organization(
+    org_data: OrganizationCreate,
+    service: OrganizationService = Depends(get_organization_service)
+):
     """Create a new organization with admin user."""
-    service = OrganizationService()
     result = await service.create_organization(
         organization_name=org_data.organization_name,
         email=org_data.email,
         password=org_data.password
     )
-    return OrganizationResponse(**result)
+    return ORJSONResponse(result, status_code=status.HTTP_201_CREATED)
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _body_too_large(limit: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Request body exceeds {limit} bytes"
+    )
+
+
+def _check_content_length(request: Request, limit: int) -> None:
+    """Reject a body whose declared length is over ``limit`` before reading it."""
+    try:
+        declared = int(request.headers.get("content-length", ""))
+    except ValueError:
+        return
+    if declared > limit:
+        raise _body_too_large(limit)
+
+
+async def _read_body(request: Request, limit: int) -> bytes:
+    """Read the request body, stopping with 413 once it passes ``limit`` bytes."""
+    _check_content_length(request, limit)
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > limit:
+            raise _body_too_large(limit)
+    return bytes(body)
+
+
+async def _read_ndjson_lines(request: Request) -> AsyncIterator[Optional[bytes]]:
+    """
+    Yield the non-empty lines of a streamed request body.
+    
+    A line longer than ``BULK_CREATE_MAX_LINE_BYTES`` is discarded as it
+    arrives and yielded as ``None``.
+    
+    Raises:
+        HTTPException: 413 once the body passes ``BULK_CREATE_MAX_NDJSON_BYTES``
+    """
+    limit = settings.bulk_create_max_ndjson_bytes
+    max_line = settings.bulk_create_max_line_bytes
+    received = 0
+    buffer = bytearray()
+    oversized = False
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > limit:
+            raise _body_too_large(limit)
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            if not oversized:
+                buffer += chunk[start:] if end < 0 else chunk[start:end]
+                if len(buffer) > max_line:
+                    oversized = True
+                    buffer.clear()
+            if end < 0:
+                break
+            if oversized:
+                yield None
+            elif buffer.strip():
+                yield bytes(buffer)
+            oversized = False
+            buffer.clear()
+            start = end + 1
+    if oversized:
+        yield None
+    elif buffer.strip():
+        yield bytes(buffer)
+
+
+def _error_line(index: int, error: str) -> bytes:
+    return dumps_line({
+        "index": index,
+        "organization_name": None,
+        "status": "error",
+        "error": error
+    })
+
+
+async def _bulk_create_ndjson(
+    request: Request,
+    service: OrganizationService
+) -> AsyncIterator[bytes]:
+    """
+    Validate and create NDJSON items chunk by chunk as the body arrives.
+    
+    Yields one NDJSON result line per input line as soon as its chunk has
+    been created. A body that passes the size cap after the response started
+    ends with an error line for the first unread index.
+    """
+    chunk: List[dict] = []
+    chunk_indexes: List[int] = []
+    
+    async def flush() -> List[bytes]:
+        results = await service.bulk_create_organizations(chunk)
+        lines = []
+        for index, result in zip(chunk_indexes, results):
+            result["index"] = index
+            lines.append(dumps_line(result))
+        chunk.clear()
+        chunk_indexes.clear()
+        return lines
+    
+    index = -1
+    try:
+        async for line in _read_ndjson_lines(request):
+            index += 1
+            if line is None:
+                yield _error_line(index, f"Line exceeds {settings.bulk_create_max_line_bytes} bytes")
+                continue
+            try:
+                item = OrganizationCreate.model_validate_json(line)
+            except ValidationError as exc:
+                yield _error_line(index, "; ".join(error["msg"] for error in exc.errors()))
+                continue
+            chunk.append(item.model_dump())
+            chunk_indexes.append(index)
+            if len(chunk) >= settings.bulk_create_chunk_size:
+                for result in await flush():
+                    yield result
+    except HTTPException as exc:
+        if chunk:
+            for result in await flush():
+                yield result
+        yield _error_line(index + 1, f"{exc.detail}; the remaining lines were not read")
+        return
+    if chunk:
+        for result in await flush():
+            yield result
+
+
+@router.post(
+    "/bulk-create",
+    response_model=OrganizationBulkCreateResponse,
+    dependencies=[Depends(rate_limit("/org/bulk-create"))],
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {
+                    "schema": OrganizationBulkCreate.model_json_schema(ref_template="#/components/schemas/{model}")
+                },
+                NDJSON_MEDIA_TYPE: {
+                    "schema": {"type": "string", "description": "One OrganizationCreate object per line"}
+                }
+            },
+            "required": True
+        }
+    }
+)
+async def bulk_create_organizations(
+    request: Request,
+    service: OrganizationService = Depends(get_organization_service)
+):
+    """
+    Create many organizations in one request.
+    
+    Send ``{"organizations": [...]}`` as JSON to get a single summary, or
+    stream one organization per line as ``application/x-ndjson`` (processed
+    in chunks as it arrives) to get one result line back per input line,
+    streamed as each chunk is created.
+    """
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith(NDJSON_MEDIA_TYPE):
+        _check_content_length(request, settings.bulk_create_max_ndjson_bytes)
+        return DuplexStreamingResponse(
+            _bulk_create_ndjson(request, service),
+            media_type=NDJSON_MEDIA_TYPE
+        )
+    
+    body = await _read_body(request, settings.bulk_create_max_request_bytes)
+    try:
+        payload = OrganizationBulkCreate.model_validate_json(body)
+    except ValidationError as exc:
+        raise RequestValidationError(exc.errors()) from None
+    results = await service.bulk_create_organizations(
+        [item.model_dump() for item in payload.organizations]
+    )
+    created = sum(1 for result in results if result["status"] == "created")
+    return ORJSONResponse({
+        "results": results,
+        "created": created,
+        "failed": len(results) - created
+    })
 
 
 @router.get("/get", response_model=OrganizationResponse)
-async def get_organization(org_data: OrganizationGet):
+async def get_organization(
+    org_data: OrganizationGet,
+    service: OrganizationService = Depends(get_organization_service)
+):
     """Get organization by name."""
-    service = OrganizationService()
     result = await service.get_organization(org_data.organization_name)
-    return OrganizationResponse(**result)
+    return ORJSONResponse(result)
+
+
+def _parse_fields(fields: Optional[str]) -> List[str]:
+    """Parse the comma-separated ``fields`` query parameter."""
+    if not fields:
+        return list(LIST_FIELDS)
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in LIST_FIELDS]
+    if unknown or not requested:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields {unknown}; choose from {list(LIST_FIELDS)}"
+        )
+    return requested
+
+
+async def _export_ndjson(rows: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    async for row in rows:
+        yield dumps_line(row)
 
 
-@router.put("/update", response_model=OrganizationResponse)
-async def update_organization(org_data: OrganizationUpdate):
+@router.get(
+    "/list",
+    response_model=OrganizationListResponse,
+    response_model_exclude_unset=True,
+    dependencies=[Depends(rate_limit("/org/list"))],
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}}
+)
+async def list_organizations(
+    limit: Optional[int] = Query(
+        None,
+        ge=1,
+        le=settings.org_export_max_rows,
+        description=f"Page size (default 50, at most {settings.org_list_max_limit}); "
+                    f"ndjson rows (default and at most {settings.org_export_max_rows})"
+    ),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    prefix: Optional[str] = Query(None, min_length=1, description="Organization name prefix"),
+    sort: str = Query("_id", pattern=f"^({'|'.join(LIST_SORT_KEYS)})$"),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    fields: Optional[str] = Query(None, description=f"Comma-separated subset of {', '.join(LIST_FIELDS)}"),
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    service: OrganizationService = Depends(get_organization_service)
+):
+    """
+    List organizations with keyset pagination.
+    
+    Pass the returned ``next_cursor`` to fetch the following page. With
+    ``format=ndjson`` up to ``limit`` matching organizations (after
+    ``cursor``, if given) are streamed as one JSON object per line, followed
+    by a ``{"next_cursor": ...}`` line if more match.
+    """
+    selected = _parse_fields(fields)
+    descending = order == "desc"
+    if format == "ndjson":
+        rows = await service.export_organizations(
+            limit=limit or settings.org_export_max_rows,
+            cursor=cursor, prefix=prefix, sort=sort, descending=descending, fields=selected
+        )
+        return StreamingResponse(_export_ndjson(rows), media_type=NDJSON_MEDIA_TYPE)
+    
+    if limit is None:
+        limit = 50
+    elif limit > settings.org_list_max_limit:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"limit must be at most {settings.org_list_max_limit} for json pages"
+        )
+    result = await service.list_organizations(
+        limit=limit, cursor=cursor, prefix=prefix, sort=sort, descending=descending, fields=selected
+    )
+    return ORJSONResponse(result)
+
+
+@router.post("/get-many", response_model=OrganizationBatchResponse)
+async def get_organizations(
+    org_data: OrganizationBatchGet,
+    service: OrganizationService = Depends(get_organization_service)
+):
+    """Get several organizations by name in a single query."""
+    result = await service.get_organizations(org_data.organization_names)
+    return ORJSONResponse(result)
+
+
+def _accepted(job: dict) -> ORJSONResponse:
+    """Build a 202 response pointing at the job status endpoint."""
+    return ORJSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=job,
+        headers={"Location": f"/org/jobs/{job['job_id']}"}
+    )
+
+
+@router.put(
+    "/update",
+    response_model=OrganizationResponse,
+    dependencies=[Depends(rate_limit("/org/update"))],
+    responses={202: {"model": JobResponse, "description": "Migration queued as a background job"}}
+)
+async def update_organization(
+    org_data: OrganizationUpdate,
+    service: OrganizationService = Depends(get_organization_service)
+):
     """Update organization name and migrate data."""
-    service = OrganizationService()
     result = await service.update_organization(
         organization_name=org_data.current_organization_name,
         new_organization_name=org_data.new_organization_name,
         email=org_data.email,
         password=org_data.password
     )
-    return OrganizationResponse(**result)
+    if "job_id" in result:
+        return _accepted(result)
+    return ORJSONResponse(result)
 
 
-@router.delete("/delete", status_code=status.HTTP_200_OK)
-async def delete_organization(org_data: OrganizationDelete):
-    """Delete organization (authenticated admin only)."""
-    service = OrganizationService()
+@router.delete(
+    "/delete",
+    response_model=OrganizationDeleteResponse,
+    status_code=status.HTTP_200_OK
+)
+async def delete_organization(
+    org_data: OrganizationDelete,
+    service: OrganizationService = Depends(get_organization_service)
+):
+    """Delete organization (authenticated admin only); restorable until the reaper purges it."""
     result = await service.delete_organization(
         organization_name=org_data.organization_name,
         admin_email=org_data.email
     )
-    return result
+    return ORJSONResponse(result)
+
+
+@router.post(
+    "/restore",
+    response_model=OrganizationResponse,
+    dependencies=[Depends(rate_limit("/org/restore"))]
+)
+async def restore_organization(
+    org_data: OrganizationRestore,
+    service: OrganizationService = Depends(get_organization_service)
+):
+    """Restore a deleted organization within its undelete window."""
+    result = await service.restore_organization(
+        organization_name=org_data.organization_name,
+        email=org_data.email,
+        password=org_data.password
+    )
+    return ORJSONResponse(result)
+
+
+async def _load_admin_job(
+    job_id: str,
+    admin: dict,
+    job_queue: JobQueue,
+    service: OrganizationService
+) -> dict:
+    """
+    Load a job of the token holder's organization.
+    
+    Jobs of other organizations are reported as missing, so job ids cannot
+    be probed.
+    """
+    job = await job_queue.get(job_id)
+    if not job or not await service.is_organization_admin(job["tenant"], admin["sub"]):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job '{job_id}' not found"
+        )
+    return job
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: str,
+    admin: dict = Depends(get_current_admin),
+    job_queue: JobQueue = Depends(get_job_queue),
+    service: OrganizationService = Depends(get_organization_service)
+):
+    """Get the status of a background job of the admin's organization."""
+    job = await _load_admin_job(job_id, admin, job_queue, service)
+    return ORJSONResponse(serialize_job(job))
+
+
+@router.post("/jobs/{job_id}/cancel", response_model=JobResponse)
+async def cancel_job(
+    job_id: str,
+    admin: dict = Depends(get_current_admin),
+    job_queue: JobQueue = Depends(get_job_queue),
+    service: OrganizationService = Depends(get_organization_service)
+):
+    """Cancel a queued or running background job of the admin's organization."""
+    await _load_admin_job(job_id, admin, job_queue, service)
+    job = await job_queue.cancel(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job '{job_id}' not found"
+        )
+    return ORJSONResponse(serialize_job(job))
 
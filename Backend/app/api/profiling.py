@@ -0,0 +1,45 @@
+"""
+Profile download endpoints for the sampled request profiler.
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse, Response
+from app.dependencies import require_operator
+from app.profiling import profile_store
+
+router = APIRouter(
+    prefix="/internal/profiles",
+    tags=["internal"],
+    dependencies=[Depends(require_operator)]
+)
+
+
+@router.get("")
+async def list_profiles():
+    """List the slowest captured request profiles, slowest first."""
+    return {"profiles": [record.summary() for record in profile_store.list()]}
+
+
+@router.get("/{profile_id}")
+async def download_profile(
+    profile_id: str,
+    format: str = Query("pstats", pattern="^(pstats|collapsed)$")
+):
+    """
+    Download a profile.
+    
+    ``pstats`` can be loaded with ``pstats.Stats(path)`` or snakeviz;
+    ``collapsed`` is the folded-stack input of flamegraph.pl and speedscope.
+    """
+    record = profile_store.get(profile_id)
+    if record is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Profile '{profile_id}' not found"
+        )
+    if format == "collapsed":
+        return PlainTextResponse(record.collapsed_stacks())
+    return Response(
+        content=record.pstats_bytes(),
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="{profile_id}.prof"'}
+    )
@@ -1,12 +1,121 @@
 """
 JWT token handling utilities.
 """
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional
-from jose import JWTError, jwt
+from jose import JWTError, jwk, jwt
 from app.config import settings
 
 
+class JoseBackend:
+    """python-jose backend with the signing key constructed once."""
+    
+    name = "jose"
+    
+    def __init__(self, secret_key: str, algorithm: str):
+        self.algorithm = algorithm
+        # A prepared Key skips jose's per-call JSON parsing and key construction
+        self.key = jwk.construct(secret_key, algorithm)
+    
+    def encode(self, claims: dict) -> str:
+        return jwt.encode(claims, self.key, algorithm=self.algorithm)
+    
+    def decode(self, token: str) -> Optional[dict]:
+        try:
+            return jwt.decode(token, self.key, algorithms=[self.algorithm])
+        except JWTError:
+            return None
+
+
+class PyJWTBackend:
+    """PyJWT backend; requires the optional ``PyJWT`` package."""
+    
+    name = "pyjwt"
+    
+    def __init__(self, secret_key: str, algorithm: str):
+        try:
+            import jwt as pyjwt
+        except ImportError as exc:
+            raise RuntimeError("JWT_BACKEND=pyjwt requires the PyJWT package") from exc
+        self._pyjwt = pyjwt
+        self.algorithm = algorithm
+        self.key = secret_key.encode()
+    
+    def encode(self, claims: dict) -> str:
+        return self._pyjwt.encode(claims, self.key, algorithm=self.algorithm)
+    
+    def decode(self, token: str) -> Optional[dict]:
+        try:
+            return self._pyjwt.decode(token, self.key, algorithms=[self.algorithm])
+        except self._pyjwt.PyJWTError:
+            return None
+
+
+JWT_BACKENDS = {
+    JoseBackend.name: JoseBackend,
+    PyJWTBackend.name: PyJWTBackend
+}
+
+
+def build_backend(name: str, secret_key: str, algorithm: str):
+    """Construct a JWT backend by name."""
+    try:
+        backend_class = JWT_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown JWT backend '{name}'") from None
+    return backend_class(secret_key, algorithm)
+
+
+class TokenVerifier:
+    """
+    Verifies tokens and memoizes successful decodes until they expire.
+    
+    Cache entries are keyed by the full token string, so only byte-identical
+    tokens whose signature was already checked are served from memory. Tokens
+    without an ``exp`` claim are never cached.
+    """
+    
+    def __init__(self, backend, max_entries: int = 10000):
+        self.backend = backend
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()
+    
+    def verify(self, token: str) -> Optional[dict]:
+        """Return the token claims, or None if the token is invalid or expired."""
+        entry = self._cache.get(token)
+        if entry is not None:
+            payload, expires_at = entry
+            if expires_at > time.time():
+                self._cache.move_to_end(token)
+                self.hits += 1
+                return dict(payload)
+            del self._cache[token]
+        
+        self.misses += 1
+        payload = self.backend.decode(token)
+        if payload is None:
+            return None
+        
+        expires_at = payload.get("exp")
+        if self.max_entries > 0 and isinstance(expires_at, (int, float)):
+            self._cache[token] = (payload, expires_at)
+            if len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return dict(payload)
+    
+    def clear(self):
+        """Drop every memoized token."""
+        self._cache.clear()
+
+
+backend = build_backend(settings.jwt_backend, settings.jwt_secret_key, settings.jwt_algorithm)
+token_verifier = TokenVerifier(backend, max_entries=settings.jwt_cache_max_entries)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -16,15 +125,10 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.utcnow() + timedelta(minutes=settings.jwt_access_token_expire_minutes)
     
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
+    encoded_jwt = backend.encode(to_encode)
     return encoded_jwt
 
 
 def verify_token(token: str) -> Optional[dict]:
     """Verify and decode a JWT token."""
-    try:
-        payload = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
-        return payload
-    except JWTError:
-        return None
-
+    return token_verifier.verify(token)
@@ -1,13 +1,42 @@
 """
 Password hashing utilities.
 """
+import argparse
+import asyncio
+import statistics
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional
 from passlib.context import CryptContext
+from fastapi import HTTPException, status
+from app.config import settings
+from app.metrics import component_timer
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+def build_context(schemes: str, bcrypt_rounds: int) -> CryptContext:
+    """
+    Build the passlib context from the configured schemes and bcrypt cost.
+    
+    Every scheme but the first is deprecated, and bcrypt hashes whose cost
+    differs from ``bcrypt_rounds`` (in either direction) need an update, so
+    changing either setting migrates users as they log in.
+    """
+    scheme_list = [scheme.strip() for scheme in schemes.split(",") if scheme.strip()]
+    options = {}
+    if "bcrypt" in scheme_list:
+        options.update({
+            "bcrypt__default_rounds": bcrypt_rounds,
+            "bcrypt__min_rounds": bcrypt_rounds,
+            "bcrypt__max_rounds": bcrypt_rounds
+        })
+    return CryptContext(schemes=scheme_list, deprecated="auto", **options)
+
+
+pwd_context = build_context(settings.password_schemes, settings.password_bcrypt_rounds)
 
 
 def hash_password(password: str) -> str:
-    """Hash a password using bcrypt."""
+    """Hash a password with the default scheme."""
     return pwd_context.hash(password)
 
 
@@ -15,3 +44,132 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash."""
     return pwd_context.verify(plain_password, hashed_password)
 
+
+def needs_rehash(hashed_password: str) -> bool:
+    """Whether a hash uses a deprecated scheme or a different cost. Cheap: no hashing."""
+    return pwd_context.needs_update(hashed_password)
+
+
+class PasswordHasherPool:
+    """
+    Bounded worker pool for bcrypt work.
+    
+    bcrypt releases the GIL, so a thread pool gives real parallelism; a process
+    pool is available for hosts where that is not the case. Submissions beyond
+    ``max_pending`` are rejected with 503 instead of queueing behind the pool.
+    """
+    
+    def __init__(
+        self,
+        executor_type: str = "thread",
+        max_workers: int = 4,
+        max_pending: int = 64
+    ):
+        if executor_type not in ("thread", "process"):
+            raise ValueError(f"Unknown password executor type '{executor_type}'")
+        self.executor_type = executor_type
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self._executor: Optional[Executor] = None
+    
+    def _get_executor(self) -> Executor:
+        """Create the executor lazily so importing this module stays cheap."""
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="bcrypt"
+                )
+        return self._executor
+    
+    async def run(self, func, *args):
+        """
+        Run a password function on the pool.
+        
+        Raises:
+            HTTPException: 503 when the pool already has ``max_pending`` jobs
+        """
+        if self.pending >= self.max_pending:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please retry shortly",
+                headers={"Retry-After": "1"}
+            )
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            with component_timer("bcrypt"):
+                return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.pending -= 1
+    
+    def shutdown(self):
+        """Shut down the underlying executor."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_pool = PasswordHasherPool(
+    executor_type=settings.password_executor_type,
+    max_workers=settings.password_executor_workers,
+    max_pending=settings.password_executor_max_pending
+)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the worker pool without blocking the event loop."""
+    return await password_pool.run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the worker pool without blocking the event loop."""
+    return await password_pool.run(verify_password, plain_password, hashed_password)
+
+
+def measure_bcrypt_verify(rounds: int, samples: int = 3) -> float:
+    """Median seconds to verify a password against a bcrypt hash of the given cost."""
+    context = CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=rounds)
+    hashed = context.hash("calibration-password")
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        context.verify("calibration-password", hashed)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def calibrate_bcrypt_rounds(target_ms: float, min_rounds: int = 4, max_rounds: int = 16) -> List[tuple]:
+    """
+    Time bcrypt verification at increasing costs on this machine.
+    
+    Each extra round doubles the work, so measuring stops at the first cost
+    above the target.
+    
+    Returns:
+        ``(rounds, milliseconds)`` pairs in increasing cost order
+    """
+    results = []
+    for rounds in range(min_rounds, max_rounds + 1):
+        elapsed_ms = measure_bcrypt_verify(rounds) * 1000
+        results.append((rounds, elapsed_ms))
+        if elapsed_ms > target_ms:
+            break
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pick the bcrypt cost for a target verify time")
+    parser.add_argument("--target-ms", type=float, default=250.0, help="Target verify time per login")
+    parser.add_argument("--min-rounds", type=int, default=10, help="Never recommend a cost below this")
+    args = parser.parse_args()
+    
+    measurements = calibrate_bcrypt_rounds(args.target_ms)
+    for rounds, elapsed_ms in measurements:
+        print(f"rounds={rounds:<3} verify={elapsed_ms:8.1f}ms")
+    within_target = [rounds for rounds, elapsed_ms in measurements if elapsed_ms <= args.target_ms]
+    recommended = max(within_target + [args.min_rounds])
+    print(f"Recommended: PASSWORD_BCRYPT_ROUNDS={recommended} (currently {settings.password_bcrypt_rounds})")
@@ -2,7 +2,7 @@
 Configuration settings for the application.
 """
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Optional
 
 
 class Settings(BaseSettings):
@@ -11,15 +11,138 @@ class Settings(BaseSettings):
     # MongoDB Configuration
     mongodb_url: str = "mongodb://localhost:27017"
     mongodb_db_name: str = "org_master_db"
+    mongodb_max_pool_size: int = 100
+    mongodb_min_pool_size: int = 0
+    mongodb_max_idle_time_ms: Optional[int] = None
+    mongodb_wait_queue_timeout_ms: Optional[int] = 5000
+    mongodb_server_selection_timeout_ms: int = 5000
+    mongodb_timeout_ms: Optional[int] = None  # per-operation timeout (timeoutMS)
+    mongodb_compressors: str = ""  # e.g. "zstd,snappy"
+    mongodb_read_preference: str = "primary"
+    mongodb_retry_writes: bool = True
+    # Multi-document transactions: "auto" (when connected to a replica set
+    # or mongos), "on" or "off"
+    mongodb_transactions: str = "auto"
     
     # JWT Configuration
     jwt_secret_key: str = "your-secret-key-change-this-in-production"
     jwt_algorithm: str = "HS256"
     jwt_access_token_expire_minutes: int = 30
+    jwt_backend: str = "jose"  # "jose" or "pyjwt"
+    jwt_cache_max_entries: int = 10000
+    
+    # Password Hashing
+    # Comma-separated passlib schemes; the first hashes new passwords and
+    # hashes in the others are upgraded on the next successful login
+    password_schemes: str = "bcrypt"
+    password_bcrypt_rounds: int = 12  # calibrate with: python -m app.auth.password
+    
+    # Password Hashing Pool
+    password_executor_type: str = "thread"  # "thread" or "process"
+    password_executor_workers: int = 4
+    password_executor_max_pending: int = 64
+    
+    # Organization Metadata Cache
+    org_cache_max_entries: int = 10000
+    org_cache_ttl_seconds: float = 60.0
+    
+    # Tenant Directory (every organization and admin in memory, per worker)
+    tenant_directory_enabled: bool = True
+    tenant_directory_sync: str = "auto"  # "auto", "change_stream" or "poll"
+    tenant_directory_poll_seconds: float = 5.0  # standalone servers reload this often
+    tenant_directory_batch_size: int = 1000
+    
+    # Organization Listing
+    org_list_max_limit: int = 200
+    org_export_batch_size: int = 500
+    org_export_max_rows: int = 10000  # per ndjson export; continue from its next_cursor row
+    
+    # Bulk Provisioning
+    bulk_create_chunk_size: int = 500
+    bulk_create_max_request_bytes: int = 1024 * 1024  # JSON body
+    bulk_create_max_ndjson_bytes: int = 64 * 1024 * 1024  # whole NDJSON body
+    bulk_create_max_line_bytes: int = 16 * 1024  # one NDJSON line
+    
+    # Tenant Documents API
+    tenant_write_batch_size: int = 500  # flush a coalesced bulk_write at this many documents
+    tenant_write_window_ms: float = 5.0  # or this long after its first document
+    tenant_documents_max_batch: int = 1000
+    tenant_documents_max_request_bytes: int = 8 * 1024 * 1024
+    tenant_documents_max_limit: int = 1000
+    tenant_export_batch_size: int = 500
+    
+    # Tenant Storage (collection, database or shared)
+    tenant_storage_strategy: str = "collection"  # for new organizations
+    tenant_database_prefix: str = "tenant_"  # database strategy: prefix + organization id
+    
+    # Tenant Clusters
+    # Extra deployments for tenant data, as JSON {"name": "mongodb://..."};
+    # the master database's deployment is always available as "default"
+    tenant_clusters: Dict[str, str] = {}
+    tenant_placement: str = "least_loaded"  # "least_loaded", "round_robin" or a cluster name
+    tenant_placement_clusters: str = ""  # comma-separated clusters open to new tenants (all when empty)
+    tenant_placement_refresh_seconds: float = 30.0
+    
+    # Tenant Deletion (tombstones purged by a background reaper)
+    tenant_undelete_window_seconds: float = 86400.0
+    tenant_reaper_enabled: bool = True
+    tenant_reaper_drops_per_minute: float = 6.0
+    tenant_reaper_poll_seconds: float = 30.0
+    tenant_reaper_lease_seconds: float = 600.0  # a crashed purge is retried after this
+    
+    # Existence Filters (Bloom filters of organization names and emails)
+    existence_filter_enabled: bool = True
+    existence_filter_capacity: int = 100000
+    existence_filter_error_rate: float = 0.01
+    existence_filter_sync_seconds: float = 1.0
+    
+    # Tenant Collection Migration
+    migration_batch_size: int = 1000
+    
+    # Background Jobs
+    job_workers: int = 2
+    job_max_attempts: int = 3
+    job_poll_interval_seconds: float = 1.0
+    job_lease_seconds: float = 60.0
+    job_background_threshold_docs: int = 50000
     
     # Application
     app_name: str = "Organization Management Service"
     debug: bool = True
+    internal_metrics_enabled: bool = True
+    metrics_enabled: bool = True
+    
+    # Rate Limiting
+    rate_limit_enabled: bool = True
+    rate_limit_backend: str = "memory"  # "memory" or "mongo" (shared by all workers)
+    rate_limit_max_keys: int = 100000
+    rate_limit_trust_forwarded_for: bool = False
+    # Per route: scope ("ip", "email" or "organization") -> "count/seconds"
+    rate_limit_rules: Dict[str, Dict[str, str]] = {
+        "/admin/login": {"ip": "20/60", "email": "5/60"},
+        "/org/create": {"ip": "10/60"},
+        "/org/bulk-create": {"ip": "2/60"},
+        "/org/update": {"ip": "20/60", "organization": "5/60"},
+        "/org/restore": {"ip": "10/60", "organization": "5/60"},
+        "/org/list": {"ip": "60/60"}
+    }
+    
+    # Health Checks
+    health_ping_cache_seconds: float = 1.0
+    health_ping_timeout_seconds: float = 1.0
+    health_max_mongo_rtt_ms: float = 250.0
+    health_max_pool_utilisation: float = 0.9
+    health_max_worker_queue_depth: int = 48
+    
+    # Operator Access
+    # Bearer token for the operator-only endpoints; they refuse every
+    # request while it is unset. Tenant admin tokens are never accepted.
+    operator_token: Optional[str] = None
+    
+    # Request Profiling (only active when debug is also enabled)
+    profiling_enabled: bool = False
+    profiling_sample_rate: float = 0.01
+    profiling_max_profiles: int = 20
     
     class Config:
         env_file = ".env"
@@ -1,9 +1,17 @@
 """
 Database connection and utilities for MongoDB.
 """
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorClientSession, AsyncIOMotorDatabase
+from pymongo import WriteConcern
 from app.config import settings
-from typing import Optional
+from app.indexes import ensure_master_indexes
+from app.db_metrics import ClusterTimeListener, pool_metrics, command_metrics
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Cluster name of the master database's deployment
+DEFAULT_CLUSTER = "default"
 
 
 class Database:
@@ -11,20 +19,91 @@ class Database:
     
     client: Optional[AsyncIOMotorClient] = None
     database: Optional[AsyncIOMotorDatabase] = None
+    transactions: bool = False
+    # Tenant clusters by name, each with its own pooled client
+    clusters: Dict[str, AsyncIOMotorClient] = {}
+    # Operation times seen by the master client
+    cluster_clock: Optional[ClusterTimeListener] = None
 
 
 db = Database()
 
 
+def mongo_client_options() -> dict:
+    """Build Motor client options from settings."""
+    options = {
+        "maxPoolSize": settings.mongodb_max_pool_size,
+        "minPoolSize": settings.mongodb_min_pool_size,
+        "serverSelectionTimeoutMS": settings.mongodb_server_selection_timeout_ms,
+        "readPreference": settings.mongodb_read_preference,
+        "retryWrites": settings.mongodb_retry_writes,
+        "event_listeners": [pool_metrics, command_metrics]
+    }
+    if settings.mongodb_max_idle_time_ms is not None:
+        options["maxIdleTimeMS"] = settings.mongodb_max_idle_time_ms
+    if settings.mongodb_wait_queue_timeout_ms is not None:
+        options["waitQueueTimeoutMS"] = settings.mongodb_wait_queue_timeout_ms
+    if settings.mongodb_timeout_ms is not None:
+        options["timeoutMS"] = settings.mongodb_timeout_ms
+    if settings.mongodb_compressors:
+        options["compressors"] = settings.mongodb_compressors
+    return options
+
+
 async def connect_to_mongo():
     """Create database connection."""
-    db.client = AsyncIOMotorClient(settings.mongodb_url)
+    db.cluster_clock = ClusterTimeListener()
+    options = mongo_client_options()
+    options["event_listeners"] = options["event_listeners"] + [db.cluster_clock]
+    db.client = AsyncIOMotorClient(settings.mongodb_url, **options)
     db.database = db.client[settings.mongodb_db_name]
+    db.clusters = {DEFAULT_CLUSTER: db.client}
+    for name, url in settings.tenant_clusters.items():
+        db.clusters[name] = AsyncIOMotorClient(url, **mongo_client_options())
     print(f"Connected to MongoDB: {settings.mongodb_db_name}")
+    if len(db.clusters) > 1:
+        print(f"Tenant clusters: {', '.join(db.clusters)}")
+    await ensure_master_indexes(db.database)
+    db.transactions = await detect_transaction_support(db.client)
+    print(f"Multi-document transactions: {'enabled' if db.transactions else 'disabled'}")
+
+
+async def detect_transaction_support(client: AsyncIOMotorClient) -> bool:
+    """Transactions need a replica set or a sharded cluster."""
+    if settings.mongodb_transactions != "auto":
+        return settings.mongodb_transactions == "on"
+    hello = await client.admin.command("hello")
+    return "setName" in hello or hello.get("msg") == "isdbgrid"
+
+
+async def run_in_transaction(
+    database: AsyncIOMotorDatabase,
+    callback: Callable[[Optional[AsyncIOMotorClientSession]], Awaitable[T]]
+) -> T:
+    """
+    Run ``callback(session)`` in a multi-document transaction.
+    
+    The driver retries the whole callback on transient errors (write
+    conflicts, elections) and retries the commit when its outcome is unknown,
+    so the callback must be safe to run more than once. Without transaction
+    support the callback runs once with ``session=None`` and has to keep the
+    data consistent on its own, e.g. through unique indexes and conditional
+    updates.
+    """
+    if not db.transactions:
+        return await callback(None)
+    async with await database.client.start_session() as session:
+        return await session.with_transaction(
+            callback, write_concern=WriteConcern("majority")
+        )
 
 
 async def close_mongo_connection():
     """Close database connection."""
+    for name, client in db.clusters.items():
+        if client is not db.client:
+            client.close()
+    db.clusters = {}
     if db.client:
         db.client.close()
         print("Disconnected from MongoDB")
@@ -35,6 +114,16 @@ def get_database() -> AsyncIOMotorDatabase:
     return db.database
 
 
+def get_cluster_clock() -> Optional[ClusterTimeListener]:
+    """Get the operation time tracker of the master client (None before connecting)."""
+    return db.cluster_clock
+
+
+def get_cluster_databases() -> Dict[str, AsyncIOMotorDatabase]:
+    """Get the tenant database (named like the master database) on every cluster."""
+    return {name: client[db.database.name] for name, client in db.clusters.items()}
+
+
 def get_organization_collection(organization_name: str):
     """Get a dynamic collection for a specific organization."""
     collection_name = f"org_{organization_name.lower().replace(' ', '_')}"
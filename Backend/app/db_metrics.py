@@ -0,0 +1,190 @@
+"""
+MongoDB driver event listeners that collect connection pool and command metrics.
+"""
+import threading
+import time
+from typing import Optional
+from bson import Timestamp
+from pymongo import monitoring
+from app.config import settings
+from app.metrics import record_component
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """
+    Tracks connection pool state from CMAP events.
+    
+    Checkout latency is measured between the checkout-started and
+    checked-out/failed events, which the driver emits on the same thread.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.pools = {}
+    
+    def _pool(self, address) -> dict:
+        key = f"{address[0]}:{address[1]}"
+        pool = self.pools.get(key)
+        if pool is None:
+            pool = self.pools[key] = {
+                "open_connections": 0,
+                "in_use": 0,
+                "checkouts": 0,
+                "checkout_failures": 0,
+                "checkout_total_ms": 0.0,
+                "checkout_max_ms": 0.0,
+                "cleared": 0
+            }
+        return pool
+    
+    def _checkout_elapsed_ms(self) -> float:
+        started = getattr(self._local, "checkout_started", None)
+        self._local.checkout_started = None
+        return (time.perf_counter() - started) * 1000 if started else 0.0
+    
+    def pool_created(self, event):
+        with self._lock:
+            pool = self._pool(event.address)
+            pool["max_pool_size"] = event.options.get("maxPoolSize")
+    
+    def pool_ready(self, event):
+        pass
+    
+    def pool_cleared(self, event):
+        with self._lock:
+            self._pool(event.address)["cleared"] += 1
+    
+    def pool_closed(self, event):
+        with self._lock:
+            self.pools.pop(f"{event.address[0]}:{event.address[1]}", None)
+    
+    def connection_created(self, event):
+        with self._lock:
+            self._pool(event.address)["open_connections"] += 1
+    
+    def connection_ready(self, event):
+        pass
+    
+    def connection_closed(self, event):
+        with self._lock:
+            self._pool(event.address)["open_connections"] -= 1
+    
+    def connection_check_out_started(self, event):
+        self._local.checkout_started = time.perf_counter()
+    
+    def connection_check_out_failed(self, event):
+        elapsed = self._checkout_elapsed_ms()
+        with self._lock:
+            pool = self._pool(event.address)
+            pool["checkout_failures"] += 1
+            pool["checkout_max_ms"] = max(pool["checkout_max_ms"], elapsed)
+    
+    def connection_checked_out(self, event):
+        elapsed = self._checkout_elapsed_ms()
+        with self._lock:
+            pool = self._pool(event.address)
+            pool["in_use"] += 1
+            pool["checkouts"] += 1
+            pool["checkout_total_ms"] += elapsed
+            pool["checkout_max_ms"] = max(pool["checkout_max_ms"], elapsed)
+    
+    def connection_checked_in(self, event):
+        with self._lock:
+            self._pool(event.address)["in_use"] -= 1
+    
+    def in_use(self) -> int:
+        """Connections currently checked out across all pools."""
+        with self._lock:
+            return sum(pool["in_use"] for pool in self.pools.values())
+    
+    def snapshot(self) -> dict:
+        """Return a copy of the per-pool metrics."""
+        with self._lock:
+            result = {}
+            for address, pool in self.pools.items():
+                stats = dict(pool)
+                checkouts = stats["checkouts"]
+                stats["checkout_avg_ms"] = stats["checkout_total_ms"] / checkouts if checkouts else 0.0
+                # Pools seen before their creation event get the configured size
+                max_pool_size = stats.get("max_pool_size") or settings.mongodb_max_pool_size
+                stats["max_pool_size"] = max_pool_size
+                stats["utilisation"] = stats["in_use"] / max_pool_size if max_pool_size else 0.0
+                result[address] = stats
+            return result
+
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """Aggregates per-command durations reported by the driver."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.commands = {}
+    
+    def _record(self, command_name: str, duration_micros: int, failed: bool):
+        duration_ms = duration_micros / 1000
+        # Attributed to the service method that issued the command, if measured
+        record_component("mongo", duration_micros / 1_000_000)
+        with self._lock:
+            stats = self.commands.get(command_name)
+            if stats is None:
+                stats = self.commands[command_name] = {
+                    "count": 0,
+                    "failures": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0
+                }
+            stats["count"] += 1
+            stats["total_ms"] += duration_ms
+            stats["max_ms"] = max(stats["max_ms"], duration_ms)
+            if failed:
+                stats["failures"] += 1
+    
+    def started(self, event):
+        pass
+    
+    def succeeded(self, event):
+        self._record(event.command_name, event.duration_micros, failed=False)
+    
+    def failed(self, event):
+        self._record(event.command_name, event.duration_micros, failed=True)
+    
+    def snapshot(self) -> dict:
+        """Return a copy of the per-command metrics."""
+        with self._lock:
+            result = {}
+            for name, stats in self.commands.items():
+                stats = dict(stats)
+                stats["avg_ms"] = stats["total_ms"] / stats["count"] if stats["count"] else 0.0
+                result[name] = stats
+            return result
+
+
+class ClusterTimeListener(monitoring.CommandListener):
+    """
+    Tracks the highest ``operationTime`` in one client's replies.
+    
+    Read right after a write is acknowledged, it is at or past that write's
+    position in the oplog. Standalone servers report no operation time.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latest: Optional[Timestamp] = None
+    
+    def started(self, event):
+        pass
+    
+    def succeeded(self, event):
+        operation_time = event.reply.get("operationTime")
+        if isinstance(operation_time, Timestamp):
+            with self._lock:
+                if self.latest is None or operation_time > self.latest:
+                    self.latest = operation_time
+    
+    def failed(self, event):
+        pass
+
+
+pool_metrics = PoolMetricsListener()
+command_metrics = CommandMetricsListener()
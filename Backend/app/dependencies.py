@@ -0,0 +1,100 @@
+"""
+FastAPI dependencies that hand out the application-scoped services.
+
+Services are constructed once per worker in the application lifespan and
+stored on ``app.state``. Tests can swap in fakes with
+``app.dependency_overrides[get_organization_service] = lambda: fake``.
+"""
+import secrets
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from app.auth.jwt_handler import verify_token
+from app.config import settings
+from app.health import ReadinessProbe
+from app.services.auth_service import AuthService
+from app.services.document_service import TenantDocumentService
+from app.services.job_queue import JobQueue
+from app.services.organization_service import OrganizationService
+
+
+def get_organization_service(request: Request) -> OrganizationService:
+    """Return the shared OrganizationService."""
+    return request.app.state.organization_service
+
+
+def get_auth_service(request: Request) -> AuthService:
+    """Return the shared AuthService."""
+    return request.app.state.auth_service
+
+
+def get_document_service(request: Request) -> TenantDocumentService:
+    """Return the shared TenantDocumentService."""
+    return request.app.state.document_service
+
+
+def get_job_queue(request: Request) -> JobQueue:
+    """Return the shared background JobQueue."""
+    return request.app.state.job_queue
+
+
+def get_readiness_probe(request: Request) -> ReadinessProbe:
+    """Return the shared ReadinessProbe."""
+    return request.app.state.readiness_probe
+
+
+def rate_limit(route: str):
+    """
+    Build a dependency that applies the rate limit rules configured for a route.
+    
+    Usage: ``dependencies=[Depends(rate_limit("/admin/login"))]``
+    """
+    async def check_rate_limit(request: Request):
+        limiter = getattr(request.app.state, "rate_limiter", None)
+        if limiter is not None:
+            await limiter.check(route, request)
+    return check_rate_limit
+
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+def get_current_admin(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)
+) -> dict:
+    """Return the claims of the admin's bearer token, or raise 401."""
+    payload = verify_token(credentials.credentials) if credentials else None
+    if payload is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or missing access token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+    return payload
+
+
+def require_operator(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)
+):
+    """
+    Allow only requests bearing ``OPERATOR_TOKEN``.
+    
+    Anyone can obtain a tenant admin token by creating an organization, so
+    endpoints exposing data across tenants use this credential instead.
+    
+    Raises:
+        HTTPException: 403 while no operator token is configured, 401 for a
+        missing or wrong token
+    """
+    if not settings.operator_token:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Operator endpoints are disabled; set OPERATOR_TOKEN to enable them"
+        )
+    if credentials is None or not secrets.compare_digest(
+        credentials.credentials.encode(), settings.operator_token.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or missing operator token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
@@ -0,0 +1,105 @@
+"""
+Liveness and readiness checks.
+"""
+import asyncio
+import time
+from typing import Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from app.config import settings
+from app.db_metrics import pool_metrics
+
+
+class ReadinessProbe:
+    """
+    Decides whether this worker should receive traffic.
+    
+    The MongoDB ping is cached for ``cache_seconds`` and concurrent probes
+    share a single in-flight ping, so a load balancer polling every worker
+    cannot turn health checks into database load. The worker is reported
+    unready when the ping fails or exceeds its RTT threshold, when the
+    connection pool is nearly exhausted, or when too many password hashes are
+    queued, so traffic is shed before latency collapses.
+    """
+    
+    def __init__(
+        self,
+        database: AsyncIOMotorDatabase,
+        password_pool,
+        job_queue=None,
+        cache_seconds: Optional[float] = None,
+        ping_timeout: Optional[float] = None
+    ):
+        self.database = database
+        self.password_pool = password_pool
+        self.job_queue = job_queue
+        self.cache_seconds = cache_seconds if cache_seconds is not None else settings.health_ping_cache_seconds
+        self.ping_timeout = ping_timeout if ping_timeout is not None else settings.health_ping_timeout_seconds
+        self._ping_result: Optional[dict] = None
+        self._ping_expires = 0.0
+        self._lock = asyncio.Lock()
+    
+    async def _ping(self) -> dict:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.database.command("ping"), timeout=self.ping_timeout)
+        except Exception as exc:
+            return {"ok": False, "rtt_ms": None, "error": f"{type(exc).__name__}: {exc}"}
+        return {"ok": True, "rtt_ms": (time.perf_counter() - started) * 1000}
+    
+    async def ping(self) -> dict:
+        """Return the cached ping result, refreshing it at most once per cache period."""
+        if self._ping_result is not None and time.monotonic() < self._ping_expires:
+            return self._ping_result
+        async with self._lock:
+            # Another probe may have refreshed it while we waited
+            if self._ping_result is None or time.monotonic() >= self._ping_expires:
+                self._ping_result = await self._ping()
+                self._ping_expires = time.monotonic() + self.cache_seconds
+        return self._ping_result
+    
+    async def check(self) -> dict:
+        """
+        Evaluate readiness.
+        
+        Returns:
+            Dictionary with ``ready``, the failing ``reasons`` and per-check details
+        """
+        reasons = []
+        
+        mongo = await self.ping()
+        if not mongo["ok"]:
+            reasons.append("mongodb ping failed")
+        elif mongo["rtt_ms"] > settings.health_max_mongo_rtt_ms:
+            reasons.append(f"mongodb rtt {mongo['rtt_ms']:.1f}ms above {settings.health_max_mongo_rtt_ms}ms")
+        
+        # Every server of every cluster has its own pool; the busiest one decides
+        pools = pool_metrics.snapshot()
+        busiest = max(pools, key=lambda address: pools[address]["utilisation"], default=None)
+        utilisation = pools[busiest]["utilisation"] if busiest else 0.0
+        if utilisation > settings.health_max_pool_utilisation:
+            reasons.append(f"connection pool {busiest} {utilisation:.0%} in use")
+        
+        pending = self.password_pool.pending
+        if pending > settings.health_max_worker_queue_depth:
+            reasons.append(f"{pending} password jobs queued")
+        
+        return {
+            "ready": not reasons,
+            "reasons": reasons,
+            "checks": {
+                "mongodb": mongo,
+                "connection_pool": {
+                    "busiest": busiest,
+                    "in_use": pools[busiest]["in_use"] if busiest else 0,
+                    "max_pool_size": pools[busiest]["max_pool_size"] if busiest else settings.mongodb_max_pool_size,
+                    "utilisation": utilisation
+                },
+                "password_pool": {
+                    "pending": pending,
+                    "max_pending": self.password_pool.max_pending
+                },
+                "job_queue": {
+                    "running": self.job_queue.depth if self.job_queue is not None else 0
+                }
+            }
+        }
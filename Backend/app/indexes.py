@@ -0,0 +1,203 @@
+"""
+Index management for the master database and tenant collections.
+
+Indexes are declared per collection and applied idempotently at startup.
+The module can also be run as a CLI:
+
+    python -m app.indexes            # create missing indexes
+    python -m app.indexes --check    # only report missing/extra indexes
+"""
+import argparse
+import asyncio
+from typing import Dict, List
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import OperationFailure
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection, AsyncIOMotorDatabase
+from app.config import settings
+
+
+# Indexes for the collections in the master database
+MASTER_INDEXES: Dict[str, List[IndexModel]] = {
+    "organizations": [
+        IndexModel([("organization_name", ASCENDING)], name="organization_name_unique", unique=True),
+        IndexModel([("collection_name", ASCENDING)], name="collection_name_unique", unique=True),
+        # Keyset pagination on created_at with _id as the tie-breaker
+        IndexModel([("created_at", ASCENDING), ("_id", ASCENDING)], name="created_at_id"),
+        # Existence filter sync polls recently written organizations
+        IndexModel([("updated_at", ASCENDING)], name="updated_at"),
+        # The reaper looks for tombstones due for purging
+        IndexModel([("purge_after", ASCENDING)], name="purge_after", sparse=True),
+    ],
+    "admin_users": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        IndexModel([("organization_name", ASCENDING)], name="organization_name"),
+        IndexModel([("created_at", ASCENDING)], name="created_at"),
+    ],
+    "rate_limits": [
+        # Drop buckets once they would have refilled
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    ],
+    "jobs": [
+        IndexModel([("status", ASCENDING), ("created_at", ASCENDING)], name="status_created_at"),
+    ],
+}
+
+# Indexes applied to every dynamic org_* collection when it is created
+TENANT_INDEXES: List[IndexModel] = []
+
+# Collection holding the tenants that use the shared storage strategy
+SHARED_TENANT_COLLECTION = "tenant_documents"
+
+
+def register_tenant_index(index: IndexModel):
+    """Add an index to the set applied to every tenant collection."""
+    TENANT_INDEXES.append(index)
+
+
+def _index_name(index: IndexModel) -> str:
+    return index.document["name"]
+
+
+async def ensure_collection_indexes(
+    collection: AsyncIOMotorCollection,
+    indexes: List[IndexModel]
+) -> List[str]:
+    """
+    Create the declared indexes on a collection.
+    
+    Creating an index that already exists with the same definition is a no-op,
+    so this is safe to run on every startup.
+    
+    Returns:
+        Names of the indexes ensured
+    """
+    if not indexes:
+        return []
+    return await collection.create_indexes(indexes)
+
+
+async def ensure_master_indexes(database: AsyncIOMotorDatabase):
+    """Create all declared indexes on the master database collections."""
+    for collection_name, indexes in MASTER_INDEXES.items():
+        try:
+            await ensure_collection_indexes(database[collection_name], indexes)
+        except OperationFailure as exc:
+            # Typically duplicate data blocking a unique index; report and keep serving
+            print(f"Failed to create indexes on '{collection_name}': {exc}")
+
+
+async def ensure_tenant_indexes(collection: AsyncIOMotorCollection):
+    """Create the pluggable tenant index set on an org_* collection."""
+    await ensure_collection_indexes(collection, TENANT_INDEXES)
+
+
+def shared_tenant_indexes() -> List[IndexModel]:
+    """
+    Indexes of the shared tenant collection.
+    
+    Every tenant index is prefixed with ``tenant_id`` so it only ever scans
+    one tenant's documents, and ``tenant_id, _id.id`` (the client ``_id``
+    inside the stored ``{tenant_id, id}`` key) serves the document API's
+    lookups and keyset pagination.
+    """
+    indexes = [IndexModel([("tenant_id", ASCENDING), ("_id.id", ASCENDING)], name="tenant_id_doc_id")]
+    for index in TENANT_INDEXES:
+        options = dict(index.document)
+        keys = [("tenant_id", ASCENDING)] + list(options.pop("key").items())
+        indexes.append(IndexModel(keys, name=f"tenant_id_{options.pop('name')}", **options))
+    return indexes
+
+
+async def ensure_shared_tenant_indexes(collection: AsyncIOMotorCollection):
+    """Create the tenant_id-prefixed index set on the shared tenant collection."""
+    await ensure_collection_indexes(collection, shared_tenant_indexes())
+
+
+async def tenant_database_names(client: AsyncIOMotorClient) -> List[str]:
+    """Names of the per-tenant databases of the database storage strategy."""
+    return [
+        name for name in await client.list_database_names()
+        if name.startswith(settings.tenant_database_prefix)
+    ]
+
+
+async def diff_collection_indexes(
+    collection: AsyncIOMotorCollection,
+    indexes: List[IndexModel]
+) -> dict:
+    """
+    Compare declared indexes with the ones present on a collection.
+    
+    Returns:
+        Dictionary with ``missing`` and ``extra`` index names
+    """
+    declared = {_index_name(index) for index in indexes}
+    existing = set()
+    async for index in collection.list_indexes():
+        existing.add(index["name"])
+    # The implicit _id index is never declared
+    existing.discard("_id_")
+    return {
+        "missing": sorted(declared - existing),
+        "extra": sorted(existing - declared)
+    }
+
+
+async def index_report(database: AsyncIOMotorDatabase) -> Dict[str, dict]:
+    """
+    Report missing or extra indexes for the master and tenant collections.
+    
+    Returns:
+        Mapping of collection name to its ``missing``/``extra`` index names
+    """
+    report = {}
+    for collection_name, indexes in MASTER_INDEXES.items():
+        report[collection_name] = await diff_collection_indexes(
+            database[collection_name], indexes
+        )
+    for collection_name in await database.list_collection_names(filter={"name": {"$regex": "^org_"}}):
+        report[collection_name] = await diff_collection_indexes(
+            database[collection_name], TENANT_INDEXES
+        )
+    if SHARED_TENANT_COLLECTION in await database.list_collection_names():
+        report[SHARED_TENANT_COLLECTION] = await diff_collection_indexes(
+            database[SHARED_TENANT_COLLECTION], shared_tenant_indexes()
+        )
+    for database_name in await tenant_database_names(database.client):
+        report[f"{database_name}.documents"] = await diff_collection_indexes(
+            database.client[database_name]["documents"], TENANT_INDEXES
+        )
+    return report
+
+
+async def _run_cli(check_only: bool) -> int:
+    client = AsyncIOMotorClient(settings.mongodb_url)
+    database = client[settings.mongodb_db_name]
+    try:
+        if not check_only:
+            await ensure_master_indexes(database)
+            for collection_name in await database.list_collection_names(filter={"name": {"$regex": "^org_"}}):
+                await ensure_tenant_indexes(database[collection_name])
+            if SHARED_TENANT_COLLECTION in await database.list_collection_names():
+                await ensure_shared_tenant_indexes(database[SHARED_TENANT_COLLECTION])
+            for database_name in await tenant_database_names(client):
+                await ensure_tenant_indexes(client[database_name]["documents"])
+        report = await index_report(database)
+    finally:
+        client.close()
+    
+    out_of_sync = False
+    for collection_name, diff in report.items():
+        if diff["missing"] or diff["extra"]:
+            out_of_sync = out_of_sync or bool(diff["missing"])
+            print(f"{collection_name}: missing={diff['missing']} extra={diff['extra']}")
+    if not out_of_sync:
+        print("All declared indexes are present")
+    return 1 if out_of_sync else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage MongoDB indexes")
+    parser.add_argument("--check", action="store_true", help="Report only, do not create indexes")
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(_run_cli(args.check)))
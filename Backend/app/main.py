@@ -1,16 +1,96 @@
 """
 Main FastAPI application.
 """
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from app.config import settings
-from app.database import connect_to_mongo, close_mongo_connection
-from app.api import organization, auth
+from app.dependencies import require_operator
+from app.database import (
+    connect_to_mongo,
+    close_mongo_connection,
+    get_cluster_clock,
+    get_cluster_databases,
+    get_database
+)
+from app.auth.password import password_pool
+from app.metrics import MetricsMiddleware, registry
+from app.rate_limit import RateLimiter, build_backend
+from app.responses import ORJSONResponse
+from app.profiling import ProfilingMiddleware, profile_store, profiling_enabled
+from app.health import ReadinessProbe
+from app.services.auth_service import AuthService
+from app.services.document_service import TenantDocumentService
+from app.services.existence_filter import ExistenceFilter
+from app.services.job_queue import JobQueue
+from app.services.organization_service import OrganizationService
+from app.services.tenant_clusters import ClusterRouter
+from app.services.tenant_directory import TenantDirectory
+from app.services.tenant_reaper import TenantReaper
+from app.services.tenant_storage import TenantStorageRouter
+from app.services.write_coalescer import WriteCoalescer
+from app.api import organization, documents, auth, health, internal, profiling
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Connect to MongoDB and build the per-worker services once."""
+    await connect_to_mongo()
+    database = get_database()
+    job_queue = JobQueue()
+    existence_filter = ExistenceFilter(database) if settings.existence_filter_enabled else None
+    if existence_filter is not None:
+        await existence_filter.start()
+    directory = TenantDirectory(
+        database,
+        cluster_clock=get_cluster_clock()
+    ) if settings.tenant_directory_enabled else None
+    if directory is not None:
+        await directory.start()
+    app.state.tenant_directory = directory
+    app.state.job_queue = job_queue
+    clusters = ClusterRouter(get_cluster_databases(), database["organizations"])
+    app.state.organization_service = OrganizationService(
+        database,
+        cache=directory,
+        job_queue=job_queue,
+        existence_filter=existence_filter,
+        storage=TenantStorageRouter(database, clusters=clusters)
+    )
+    app.state.auth_service = AuthService(database, existence_filter=existence_filter, directory=directory)
+    write_coalescer = WriteCoalescer()
+    app.state.document_service = TenantDocumentService(app.state.organization_service, write_coalescer)
+    app.state.readiness_probe = ReadinessProbe(database, password_pool, job_queue=job_queue)
+    app.state.rate_limiter = RateLimiter(
+        build_backend(settings.rate_limit_backend, database),
+        settings.rate_limit_rules
+    ) if settings.rate_limit_enabled else None
+    app.state.tenant_reaper = TenantReaper(
+        app.state.organization_service
+    ) if settings.tenant_reaper_enabled else None
+    await job_queue.start(database)
+    if app.state.tenant_reaper is not None:
+        await app.state.tenant_reaper.start()
+    yield
+    if app.state.tenant_reaper is not None:
+        await app.state.tenant_reaper.stop()
+    await job_queue.stop()
+    await write_coalescer.close()
+    if existence_filter is not None:
+        await existence_filter.stop()
+    if directory is not None:
+        await directory.stop()
+    await close_mongo_connection()
+    password_pool.shutdown()
+
 
 app = FastAPI(
     title=settings.app_name,
     description="A multi-tenant organization management service with dynamic MongoDB collections",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -21,22 +101,24 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+if profiling_enabled():
+    app.add_middleware(
+        ProfilingMiddleware,
+        store=profile_store,
+        sample_rate=settings.profiling_sample_rate
+    )
 
 # Include routers
 app.include_router(organization.router)
+app.include_router(documents.router)
 app.include_router(auth.router)
-
-
-@app.on_event("startup")
-async def startup_event():
-    """Initialize database connection on startup."""
-    await connect_to_mongo()
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Close database connection on shutdown."""
-    await close_mongo_connection()
+app.include_router(health.router)
+if settings.internal_metrics_enabled:
+    app.include_router(internal.router)
+if profiling_enabled():
+    app.include_router(profiling.router)
 
 
 @app.get("/")
@@ -51,6 +133,17 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint."""
+    """Health check endpoint; see /health/live and /health/ready for probes."""
     return {"status": "healthy"}
 
+
+if settings.metrics_enabled:
+    @app.get(
+        "/metrics",
+        response_class=PlainTextResponse,
+        include_in_schema=False,
+        dependencies=[Depends(require_operator)]
+    )
+    async def metrics():
+        """Prometheus metrics in the text exposition format."""
+        return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,293 @@
+"""
+Prometheus-style request and service metrics.
+
+Metrics are kept in process memory and rendered in the Prometheus text
+exposition format by the ``/metrics`` endpoint. Besides per-route request
+metrics, service methods decorated with ``instrument`` record their total
+duration and a breakdown into components (``bcrypt``, ``mongo``,
+``migration``). Components can overlap: MongoDB commands issued during a
+migration count towards both ``mongo`` and ``migration``.
+"""
+import functools
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional, Sequence, Tuple
+from starlette.routing import Match
+from app.config import settings
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+class Metric:
+    """Base class for a metric family with a fixed set of label names."""
+    
+    type_name = "untyped"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], object] = {}
+    
+    def _samples(self):
+        raise NotImplementedError
+    
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}"
+        ]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing value per label set."""
+    
+    type_name = "counter"
+    
+    def inc(self, *labels: str, amount: float = 1.0):
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+    
+    def _samples(self):
+        for labels, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    """Value that can go up and down per label set."""
+    
+    type_name = "gauge"
+    
+    def dec(self, *labels: str, amount: float = 1.0):
+        self.inc(*labels, amount=-amount)
+    
+    def set(self, value: float, *labels: str):
+        self._values[labels] = value
+
+
+class Histogram(Metric):
+    """Cumulative bucketed observations per label set."""
+    
+    type_name = "histogram"
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+    
+    def observe(self, value: float, *labels: str):
+        state = self._values.get(labels)
+        if state is None:
+            # Per-bucket counts (last slot is +Inf), sum, count
+            state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        state[0][bisect_left(self.buckets, value)] += 1
+        state[1] += value
+        state[2] += 1
+    
+    def _samples(self):
+        for labels, (counts, total, count) in self._values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                bucket_labels = _format_labels(self.labelnames, labels, f'le="{le}"')
+                yield f"{self.name}_bucket{bucket_labels} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {count}"
+
+
+class MetricsRegistry:
+    """
+    Collection of metric families.
+    
+    Metrics are only updated from the event loop thread, so no locking is
+    needed on the hot path.
+    """
+    
+    def __init__(self):
+        self.metrics: Dict[str, Metric] = {}
+    
+    def _register(self, metric: Metric) -> Metric:
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric '{metric.name}' is already registered")
+        self.metrics[metric.name] = metric
+        return metric
+    
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+    
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+    
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+    
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        return "\n".join(metric.render() for metric in self.metrics.values()) + "\n"
+
+
+registry = MetricsRegistry()
+
+REQUESTS_TOTAL = registry.counter(
+    "http_requests_total", "HTTP requests by route and status.", ("method", "route", "status")
+)
+REQUESTS_IN_FLIGHT = registry.gauge(
+    "http_requests_in_flight", "HTTP requests currently being served.", ("method", "route")
+)
+REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route and status.", ("method", "route", "status")
+)
+OPERATION_DURATION = registry.histogram(
+    "service_operation_duration_seconds", "Service method latency.", ("operation",)
+)
+COMPONENT_DURATION = registry.histogram(
+    "service_component_duration_seconds",
+    "Time spent in bcrypt, MongoDB and migrations per service method.",
+    ("operation", "component")
+)
+
+
+class Breakdown:
+    """
+    Per-call accumulator of component durations.
+    
+    MongoDB durations are added from Motor's executor threads, which run with
+    a copy of the calling task's context, hence the lock.
+    """
+    
+    __slots__ = ("components", "_lock")
+    
+    def __init__(self):
+        self.components: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def add(self, component: str, seconds: float):
+        with self._lock:
+            self.components[component] = self.components.get(component, 0.0) + seconds
+
+
+_breakdown: ContextVar[Optional[Breakdown]] = ContextVar("metrics_breakdown", default=None)
+
+
+def record_component(component: str, seconds: float):
+    """Attribute time to a component of the service method being measured, if any."""
+    breakdown = _breakdown.get()
+    if breakdown is not None:
+        breakdown.add(component, seconds)
+
+
+@contextmanager
+def component_timer(component: str):
+    """Time a block as a component of the current service method."""
+    breakdown = _breakdown.get()
+    if breakdown is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        breakdown.add(component, time.perf_counter() - started)
+
+
+def instrument(operation: str):
+    """
+    Decorate an async service method to record its duration and breakdown.
+    
+    When ``METRICS_ENABLED`` is false the wrapper only adds a function call.
+    A nested instrumented call records its own breakdown, which is not added
+    to the caller's.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if not settings.metrics_enabled:
+                return await func(*args, **kwargs)
+            breakdown = Breakdown()
+            token = _breakdown.set(breakdown)
+            started = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                OPERATION_DURATION.observe(time.perf_counter() - started, operation)
+                _breakdown.reset(token)
+                for component, seconds in breakdown.components.items():
+                    COMPONENT_DURATION.observe(seconds, operation, component)
+        return wrapper
+    return decorator
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request counts, in-flight requests and latency.
+    
+    Requests are labelled with the matched route template (e.g.
+    ``/org/jobs/{job_id}``) rather than the raw path to bound label cardinality.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    @staticmethod
+    def _route_template(scope) -> str:
+        for route in scope["app"].router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+        return "unmatched"
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        method = scope["method"]
+        route = self._route_template(scope)
+        status_code = "500"
+        
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = str(message["status"])
+            await send(message)
+        
+        REQUESTS_IN_FLIGHT.inc(method, route)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            REQUESTS_IN_FLIGHT.dec(method, route)
+            REQUESTS_TOTAL.inc(method, route, status_code)
+            REQUEST_DURATION.observe(elapsed, method, route, status_code)
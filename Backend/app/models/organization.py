@@ -14,6 +14,8 @@ class Organization:
         organization_name: str,
         collection_name: str,
         admin_user_id: str,
+        storage: str = "collection",
+        cluster: str = "default",
         created_at: Optional[datetime] = None,
         updated_at: Optional[datetime] = None,
         _id: Optional[ObjectId] = None
@@ -22,6 +24,10 @@ class Organization:
         self.organization_name = organization_name
         self.collection_name = collection_name
         self.admin_user_id = admin_user_id
+        # Tenant storage strategy holding the organization's documents
+        self.storage = storage
+        # Tenant cluster holding them
+        self.cluster = cluster
         self.created_at = created_at or datetime.utcnow()
         self.updated_at = updated_at or datetime.utcnow()
     
@@ -32,6 +38,8 @@ class Organization:
             "organization_name": self.organization_name,
             "collection_name": self.collection_name,
             "admin_user_id": self.admin_user_id,
+            "storage": self.storage,
+            "cluster": self.cluster,
             "created_at": self.created_at,
             "updated_at": self.updated_at
         }
@@ -44,6 +52,8 @@ class Organization:
             organization_name=data["organization_name"],
             collection_name=data["collection_name"],
             admin_user_id=data["admin_user_id"],
+            storage=data.get("storage", "collection"),
+            cluster=data.get("cluster", "default"),
             created_at=data.get("created_at"),
             updated_at=data.get("updated_at")
         )
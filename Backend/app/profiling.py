@@ -0,0 +1,209 @@
+"""
+Sampled per-request profiling for debugging slow endpoints.
+
+A configurable fraction of requests runs under cProfile. The slowest profiled
+requests are kept in memory and can be downloaded as pstats data or as
+collapsed stacks for flamegraph tools. Only enabled when both ``DEBUG`` and
+``PROFILING_ENABLED`` are set.
+"""
+import cProfile
+import heapq
+import io
+import marshal
+import os
+import random
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+from app.config import settings
+
+# Collapsed-stack generation limits
+MAX_STACK_DEPTH = 64
+MIN_FRAME_SECONDS = 1e-6
+
+
+class ProfileRecord:
+    """A captured request profile."""
+    
+    def __init__(self, profile_id: str, method: str, path: str, duration: float, stats: dict):
+        self.id = profile_id
+        self.method = method
+        self.path = path
+        self.duration = duration
+        self.captured_at = datetime.utcnow()
+        self.stats = stats
+    
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "duration_ms": self.duration * 1000,
+            "captured_at": self.captured_at
+        }
+    
+    def pstats_bytes(self) -> bytes:
+        """Serialize in the format read by ``pstats.Stats(filename)``."""
+        return marshal.dumps(self.stats)
+    
+    def collapsed_stacks(self) -> str:
+        """Render as ``frame;frame;frame microseconds`` lines."""
+        return collapse_stats(self.stats)
+
+
+class ProfileStore:
+    """Keeps the N slowest profiles seen so far."""
+    
+    def __init__(self, max_profiles: int):
+        self.max_profiles = max_profiles
+        self._heap: List[tuple] = []
+        self._by_id: Dict[str, ProfileRecord] = {}
+        self._sequence = 0
+    
+    def add(self, record: ProfileRecord):
+        if self.max_profiles <= 0:
+            return
+        # The sequence number breaks ties so records are never compared
+        self._sequence += 1
+        entry = (record.duration, self._sequence, record)
+        if len(self._heap) < self.max_profiles:
+            heapq.heappush(self._heap, entry)
+        elif record.duration > self._heap[0][0]:
+            evicted = heapq.heapreplace(self._heap, entry)[2]
+            self._by_id.pop(evicted.id, None)
+        else:
+            return
+        self._by_id[record.id] = record
+    
+    def get(self, profile_id: str) -> Optional[ProfileRecord]:
+        return self._by_id.get(profile_id)
+    
+    def list(self) -> List[ProfileRecord]:
+        """Profiles ordered from slowest to fastest."""
+        return [entry[2] for entry in sorted(self._heap, key=lambda entry: entry[0], reverse=True)]
+    
+    def clear(self):
+        self._heap.clear()
+        self._by_id.clear()
+
+
+def _frame_label(func: tuple) -> str:
+    filename, lineno, name = func
+    if filename == "~":
+        label = name
+    else:
+        label = f"{os.path.basename(filename)}:{lineno}:{name}"
+    return label.replace(";", ":").replace(" ", "_")
+
+
+def collapse_stats(stats: dict) -> str:
+    """
+    Expand cProfile's caller/callee graph into collapsed stacks.
+    
+    cProfile records edges rather than full stacks, so a function's time on a
+    particular path is estimated by scaling its edge times by the share of the
+    caller's cumulative time that reached it along that path.
+    """
+    callees: Dict[tuple, Dict[tuple, tuple]] = {}
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, {})[func] = edge
+    
+    totals: Dict[str, float] = {}
+    
+    def walk(func: tuple, path: tuple, self_time: float, cumulative: float):
+        frames = path + (func,)
+        if self_time >= MIN_FRAME_SECONDS:
+            key = ";".join(_frame_label(frame) for frame in frames)
+            totals[key] = totals.get(key, 0.0) + self_time
+        if len(frames) >= MAX_STACK_DEPTH:
+            return
+        func_cumulative = stats[func][3]
+        if func_cumulative <= 0:
+            return
+        share = cumulative / func_cumulative
+        for callee, (_, _, edge_tt, edge_ct) in callees.get(func, {}).items():
+            # Recursive calls are already accounted for in the outer frame
+            if callee in frames or edge_ct * share < MIN_FRAME_SECONDS:
+                continue
+            walk(callee, frames, edge_tt * share, edge_ct * share)
+    
+    for func, (_, _, tottime, cumtime, callers) in stats.items():
+        if not callers:
+            walk(func, (), tottime, cumtime)
+    
+    output = io.StringIO()
+    for key, seconds in sorted(totals.items()):
+        micros = int(seconds * 1_000_000)
+        if micros:
+            output.write(f"{key} {micros}\n")
+    return output.getvalue()
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that profiles a sample of requests with cProfile.
+    
+    Every response gets a ``Server-Timing`` header with the time to the first
+    response byte; sampled responses also name their profile id. cProfile
+    traces the whole thread, so a profile also contains work that other
+    requests did on the event loop meanwhile, and only one request is
+    profiled at a time.
+    """
+    
+    def __init__(self, app, store: ProfileStore, sample_rate: float):
+        self.app = app
+        self.store = store
+        self.sample_rate = sample_rate
+        self._active = False
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        sampled = not self._active and random.random() < self.sample_rate
+        profile_id = uuid.uuid4().hex[:12] if sampled else None
+        started = time.perf_counter()
+        
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                timing = f"app;dur={elapsed_ms:.1f}"
+                if profile_id:
+                    timing += f', profile;desc="{profile_id}"'
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"server-timing", timing.encode())
+                ]
+            await send(message)
+        
+        if not sampled:
+            await self.app(scope, receive, send_wrapper)
+            return
+        
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler (e.g. a debugger) owns the thread
+            await self.app(scope, receive, send_wrapper)
+            return
+        self._active = True
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.disable()
+            self._active = False
+            profiler.create_stats()
+            self.store.add(ProfileRecord(
+                profile_id, scope["method"], scope["path"], time.perf_counter() - started, profiler.stats
+            ))
+
+
+profile_store = ProfileStore(settings.profiling_max_profiles)
+
+
+def profiling_enabled() -> bool:
+    """Profiling is only available in debug deployments that opt in."""
+    return settings.debug and settings.profiling_enabled
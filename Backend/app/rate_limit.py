@@ -0,0 +1,221 @@
+"""
+Token-bucket rate limiting for expensive endpoints.
+
+Rules are configured per route in ``Settings.rate_limit_rules`` as
+``{"/admin/login": {"ip": "10/60", "email": "5/60"}}``: each scope (``ip``,
+``email`` or ``organization``) allows ``count`` requests per ``seconds`` with
+bursts of up to ``count``. Buckets live in a pluggable backend: in process
+memory by default, or in MongoDB to share limits between workers.
+"""
+import math
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from fastapi import HTTPException, Request, status
+from pymongo import ReturnDocument
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from app.config import settings
+
+SCOPES = ("ip", "email", "organization")
+
+
+class Rule:
+    """A token bucket definition: ``capacity`` tokens refilled over ``period`` seconds."""
+    
+    def __init__(self, capacity: float, period: float):
+        if capacity <= 0 or period <= 0:
+            raise ValueError("Rate limit capacity and period must be positive")
+        self.capacity = capacity
+        self.period = period
+        self.rate = capacity / period
+    
+    @classmethod
+    def parse(cls, spec: str) -> "Rule":
+        """Parse ``"count/seconds"``."""
+        try:
+            count, seconds = spec.split("/")
+            return cls(float(count), float(seconds))
+        except ValueError:
+            raise ValueError(f"Invalid rate limit '{spec}', expected 'count/seconds'") from None
+
+
+class RateLimitBackend:
+    """Storage for token buckets."""
+    
+    async def acquire(self, key: str, rule: Rule) -> float:
+        """
+        Take one token from a bucket.
+        
+        Returns:
+            0 if the request is allowed, otherwise seconds until a token is available
+        """
+        raise NotImplementedError
+
+
+class MemoryBackend(RateLimitBackend):
+    """
+    Per-process buckets in an LRU-ordered dict.
+    
+    Each active key costs one small list. A bucket idle long enough to have
+    refilled completely is indistinguishable from a missing one, so such
+    entries are evicted from the least recently used end as requests arrive;
+    ``max_keys`` bounds memory under key floods.
+    """
+    
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        # key -> [tokens, last refill time, time at which the bucket is full]
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._buckets)
+    
+    def _evict(self, now: float):
+        while self._buckets:
+            oldest = next(iter(self._buckets.values()))
+            if oldest[2] > now and len(self._buckets) < self.max_keys:
+                break
+            self._buckets.popitem(last=False)
+    
+    async def acquire(self, key: str, rule: Rule) -> float:
+        now = time.monotonic()
+        self._evict(now)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            tokens = rule.capacity
+        else:
+            tokens = min(rule.capacity, bucket[0] + (now - bucket[1]) * rule.rate)
+            self._buckets.move_to_end(key)
+        
+        if tokens >= 1:
+            tokens -= 1
+            retry_after = 0.0
+        else:
+            retry_after = (1 - tokens) / rule.rate
+        full_at = now + (rule.capacity - tokens) / rule.rate
+        if bucket is None:
+            self._buckets[key] = [tokens, now, full_at]
+        else:
+            bucket[0], bucket[1], bucket[2] = tokens, now, full_at
+        return retry_after
+
+
+class MongoBackend(RateLimitBackend):
+    """
+    Buckets shared by all workers in the ``rate_limits`` collection.
+    
+    Each acquire is one atomic ``find_one_and_update`` with a pipeline update
+    that refills and spends tokens server-side. A TTL index removes buckets
+    once they would have refilled.
+    """
+    
+    def __init__(self, database: AsyncIOMotorDatabase):
+        self.collection = database["rate_limits"]
+    
+    async def acquire(self, key: str, rule: Rule) -> float:
+        now = time.time()
+        refilled = {
+            "$min": [
+                rule.capacity,
+                {
+                    "$add": [
+                        {"$ifNull": ["$tokens", rule.capacity]},
+                        {"$multiply": [{"$subtract": [now, {"$ifNull": ["$updated", now]}]}, rule.rate]}
+                    ]
+                }
+            ]
+        }
+        bucket = await self.collection.find_one_and_update(
+            {"_id": key},
+            [
+                {"$set": {"tokens": refilled, "updated": now}},
+                {"$set": {
+                    "allowed": {"$gte": ["$tokens", 1]},
+                    "tokens": {"$cond": [{"$gte": ["$tokens", 1]}, {"$subtract": ["$tokens", 1]}, "$tokens"]},
+                    "expires_at": datetime.utcnow() + timedelta(seconds=rule.period)
+                }}
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        if bucket["allowed"]:
+            return 0.0
+        return (1 - bucket["tokens"]) / rule.rate
+
+
+def build_backend(name: str, database: Optional[AsyncIOMotorDatabase] = None) -> RateLimitBackend:
+    """Construct a rate limit backend by name."""
+    if name == "memory":
+        return MemoryBackend(max_keys=settings.rate_limit_max_keys)
+    if name == "mongo":
+        return MongoBackend(database)
+    raise ValueError(f"Unknown rate limit backend '{name}'")
+
+
+class RateLimiter:
+    """Applies the configured per-route rules to incoming requests."""
+    
+    def __init__(self, backend: RateLimitBackend, rules: Dict[str, Dict[str, str]]):
+        self.backend = backend
+        self.rules: Dict[str, List[Tuple[str, Rule]]] = {}
+        for route, scopes in rules.items():
+            for scope, spec in scopes.items():
+                if scope not in SCOPES:
+                    raise ValueError(f"Unknown rate limit scope '{scope}' for {route}")
+                self.rules.setdefault(route, []).append((scope, Rule.parse(spec)))
+    
+    @staticmethod
+    def client_ip(request: Request) -> str:
+        if settings.rate_limit_trust_forwarded_for:
+            forwarded = request.headers.get("x-forwarded-for")
+            if forwarded:
+                return forwarded.split(",")[0].strip()
+        return request.client.host if request.client else "unknown"
+    
+    @staticmethod
+    async def _body_keys(request: Request) -> dict:
+        """Email and organization name from a JSON body, if there is one."""
+        if not request.headers.get("content-type", "").startswith("application/json"):
+            return {}
+        try:
+            # FastAPI has already read the body, so this is served from cache
+            body = await request.json()
+        except ValueError:
+            return {}
+        if not isinstance(body, dict):
+            return {}
+        keys = {}
+        email = body.get("email")
+        if isinstance(email, str):
+            keys["email"] = email.lower()
+        organization = body.get("organization_name") or body.get("current_organization_name")
+        if isinstance(organization, str):
+            keys["organization"] = organization
+        return keys
+    
+    async def check(self, route: str, request: Request):
+        """
+        Spend a token from each of the route's buckets.
+        
+        Raises:
+            HTTPException: 429 with Retry-After when a bucket is empty
+        """
+        rules = self.rules.get(route)
+        if not rules:
+            return
+        keys = {"ip": self.client_ip(request)}
+        if any(scope != "ip" for scope, _ in rules):
+            keys.update(await self._body_keys(request))
+        
+        for scope, rule in rules:
+            value = keys.get(scope)
+            if value is None:
+                continue
+            retry_after = await self.backend.acquire(f"{route}|{scope}|{value}", rule)
+            if retry_after > 0:
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Too many requests, please retry later",
+                    headers={"Retry-After": str(math.ceil(retry_after))}
+                )
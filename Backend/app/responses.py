@@ -0,0 +1,63 @@
+"""
+orjson-based response serialization.
+
+Routes return already-shaped dictionaries wrapped in ``ORJSONResponse``, which
+FastAPI sends as-is instead of validating them against the response model
+and re-encoding them with ``jsonable_encoder`` and the stdlib ``json``
+module. The response models stay on the route decorators for the OpenAPI
+schema.
+"""
+from typing import Any
+import orjson
+from bson import ObjectId, json_util
+from fastapi.responses import ORJSONResponse as BaseORJSONResponse
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from starlette.types import Receive, Scope, Send
+
+# datetime, date and UUID are handled natively by orjson
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    """Encode the types orjson does not know about."""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    # Other BSON types (Decimal128, Binary, ...) as Extended JSON
+    return json_util.default(value)
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize a value to JSON bytes."""
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+def dumps_line(content: Any) -> bytes:
+    """Serialize a value as one NDJSON line."""
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE)
+
+
+class ORJSONResponse(BaseORJSONResponse):
+    """JSON response rendered by orjson with the application's encoders."""
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    Streaming response that can start while the request body is still read.
+    
+    ``StreamingResponse`` listens for the client disconnect on the request's
+    receive channel, which would take body chunks away from a generator that
+    is still consuming the request. This variant leaves the channel to the
+    generator, which sees a disconnect as ``ClientDisconnect`` from
+    ``request.stream()``.
+    """
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
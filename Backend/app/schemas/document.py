@@ -0,0 +1,32 @@
+"""
+Pydantic schemas for tenant document requests and responses.
+"""
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+
+
+class DocumentInsertResult(BaseModel):
+    """Schema for the acknowledgement of one inserted document."""
+    index: int
+    status: str
+    inserted_id: Optional[Any] = None
+    error: Optional[str] = None
+    code: Optional[int] = None
+
+
+class DocumentInsertResponse(BaseModel):
+    """Schema for a multi-document insert response."""
+    results: List[DocumentInsertResult]
+    inserted: int
+    failed: int
+
+
+class DocumentSingleInsertResponse(BaseModel):
+    """Schema for a single-document insert response."""
+    inserted_id: Any
+
+
+class DocumentListResponse(BaseModel):
+    """Schema for one page of tenant documents."""
+    documents: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None
@@ -2,7 +2,7 @@
 Pydantic schemas for organization requests and responses.
 """
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from typing import Any, List, Optional
 from datetime import datetime
 
 
@@ -13,6 +13,11 @@ class OrganizationCreate(BaseModel):
     password: str = Field(..., min_length=6)
 
 
+class OrganizationBulkCreate(BaseModel):
+    """Schema for creating several organizations at once."""
+    organizations: List[OrganizationCreate] = Field(..., min_length=1, max_length=1000)
+
+
 class OrganizationUpdate(BaseModel):
     """Schema for updating an organization."""
     current_organization_name: str = Field(..., min_length=1, max_length=100)
@@ -26,12 +31,30 @@ class OrganizationGet(BaseModel):
     organization_name: str = Field(..., min_length=1)
 
 
+class OrganizationBatchGet(BaseModel):
+    """Schema for getting several organizations at once."""
+    organization_names: List[str] = Field(..., min_length=1, max_length=100)
+
+
 class OrganizationDelete(BaseModel):
     """Schema for deleting an organization."""
     organization_name: str = Field(..., min_length=1)
     email: EmailStr
 
 
+class OrganizationDeleteResponse(BaseModel):
+    """Schema for an organization delete response."""
+    message: str
+    restorable_until: datetime
+
+
+class OrganizationRestore(BaseModel):
+    """Schema for restoring a deleted organization."""
+    organization_name: str = Field(..., min_length=1)
+    email: EmailStr
+    password: str = Field(..., min_length=6)
+
+
 class OrganizationResponse(BaseModel):
     """Schema for organization response."""
     id: str
@@ -44,3 +67,53 @@ class OrganizationResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+class OrganizationBatchResponse(BaseModel):
+    """Schema for a batch organization lookup response."""
+    organizations: List[OrganizationResponse]
+    not_found: List[str]
+
+
+class OrganizationBulkCreateResult(BaseModel):
+    """Schema for the outcome of one item of a bulk create."""
+    index: int
+    organization_name: Optional[str] = None
+    status: str
+    organization: Optional[OrganizationResponse] = None
+    error: Optional[str] = None
+
+
+class OrganizationBulkCreateResponse(BaseModel):
+    """Schema for a bulk create response."""
+    results: List[OrganizationBulkCreateResult]
+    created: int
+    failed: int
+
+
+class OrganizationListItem(BaseModel):
+    """Schema for a listed organization; only the requested fields are set."""
+    id: Optional[str] = None
+    organization_name: Optional[str] = None
+    collection_name: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class OrganizationListResponse(BaseModel):
+    """Schema for one page of the organization listing."""
+    organizations: List[OrganizationListItem]
+    next_cursor: Optional[str] = None
+
+
+class JobResponse(BaseModel):
+    """Schema for a background job status response."""
+    job_id: str
+    kind: str
+    status: str
+    attempts: int
+    progress: Optional[dict] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
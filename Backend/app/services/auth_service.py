@@ -1,22 +1,36 @@
 """
 Authentication service for admin login.
 """
-from typing import Optional
+import asyncio
+from typing import Optional, Set
 from bson import ObjectId
 from app.database import get_database
 from app.models.user import AdminUser
-from app.auth.password import verify_password
+from app.auth.password import hash_password_async, needs_rehash, verify_password_async
 from app.auth.jwt_handler import create_access_token
+from app.metrics import instrument
+from app.services.existence_filter import ExistenceFilter
+from app.services.tenant_directory import TenantDirectory
 from fastapi import HTTPException, status
 
 
 class AuthService:
     """Service class for authentication operations."""
     
-    def __init__(self):
-        self.db = get_database()
+    def __init__(
+        self,
+        database=None,
+        existence_filter: Optional[ExistenceFilter] = None,
+        directory: Optional[TenantDirectory] = None
+    ):
+        self.db = database if database is not None else get_database()
         self.users_collection = self.db["admin_users"]
+        self.existence_filter = existence_filter
+        self.directory = directory
+        # Strong references keep pending hash upgrades from being garbage collected
+        self._rehash_tasks: Set[asyncio.Task] = set()
     
+    @instrument("authenticate_admin")
     async def authenticate_admin(self, email: str, password: str) -> dict:
         """
         Authenticate admin user and return JWT token.
@@ -28,22 +42,36 @@ class AuthService:
         Returns:
             Dictionary with access token and user info
         """
-        # Find admin user
-        user_data = await self.users_collection.find_one({"email": email})
+        # Find admin user in the directory, else in MongoDB; emails the
+        # existence filter rules out skip the query
+        user_data = self.directory.admin_by_email(email) if self.directory is not None else None
+        if user_data is None and self._might_have_email(email):
+            user_data = await self.users_collection.find_one({"email": email})
+            if not user_data and self.existence_filter is not None:
+                self.existence_filter.record_absent(email=True)
         
-        if not user_data:
+        # Admins of deleted organizations cannot log in until it is restored
+        if not user_data or user_data.get("deleted_at"):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password"
             )
         
         # Verify password
-        if not verify_password(password, user_data["password_hash"]):
+        if not await verify_password_async(password, user_data["password_hash"]):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password"
             )
         
+        # Upgrade the hash to the current scheme/cost without delaying the response
+        if needs_rehash(user_data["password_hash"]):
+            task = asyncio.create_task(
+                self._upgrade_password_hash(user_data["_id"], user_data["password_hash"], password)
+            )
+            self._rehash_tasks.add(task)
+            task.add_done_callback(self._rehash_tasks.discard)
+        
         # Create JWT token
         token_data = {
             "sub": str(user_data["_id"]),
@@ -58,4 +86,24 @@ class AuthService:
             "organization_name": user_data["organization_name"],
             "admin_id": str(user_data["_id"])
         }
-
+    
+    def _might_have_email(self, email: str) -> bool:
+        """False only when the existence filter rules the email out."""
+        return self.existence_filter is None or self.existence_filter.might_have_email(email)
+    
+    async def _upgrade_password_hash(self, user_id: ObjectId, old_hash: str, password: str):
+        """
+        Store a re-hashed password.
+        
+        The update only applies if the stored hash is still the one that was
+        verified, so a concurrent password change is never overwritten.
+        """
+        try:
+            new_hash = await hash_password_async(password)
+            await self.users_collection.update_one(
+                {"_id": user_id, "password_hash": old_hash},
+                {"$set": {"password_hash": new_hash}}
+            )
+        except Exception as exc:
+            # The old hash still works; the upgrade is retried on the next login
+            print(f"Password hash upgrade for {user_id} failed: {exc}")
@@ -0,0 +1,221 @@
+"""
+Tenant document service for reading and writing an organization's documents.
+"""
+import asyncio
+from typing import Any, AsyncIterator, List, Optional, Sequence
+from bson import ObjectId, json_util
+from bson.errors import InvalidId
+from fastapi import HTTPException, status
+from app.config import settings
+from app.metrics import instrument
+from app.services.organization_service import OrganizationService, decode_list_cursor, encode_list_cursor
+from app.services.tenant_storage import TenantLocation
+from app.services.write_coalescer import DocumentWriteError, WriteCoalescer
+
+# Query operators that run server-side JavaScript
+FORBIDDEN_OPERATORS = {"$where", "$function", "$accumulator"}
+
+# Documents are paginated by _id, and MongoDB orders values of different
+# types apart, so every _id is an ObjectId
+INVALID_ID_ERROR = "_id must be an ObjectId"
+
+
+def parse_filter(raw: Optional[str]) -> dict:
+    """
+    Parse a query filter given as MongoDB Extended JSON.
+    
+    Raises:
+        HTTPException: 400 if the filter is not a JSON object or uses a forbidden operator
+    """
+    if not raw:
+        return {}
+    try:
+        query = json_util.loads(raw)
+    except (ValueError, TypeError):
+        query = None
+    if not isinstance(query, dict):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="filter must be a JSON object"
+        )
+    
+    def check(value):
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if key in FORBIDDEN_OPERATORS:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"Operator '{key}' is not allowed in filters"
+                    )
+                check(item)
+        elif isinstance(value, list):
+            for item in value:
+                check(item)
+    
+    check(query)
+    return query
+
+
+def parse_document_id(document_id: str) -> Optional[ObjectId]:
+    """Parse a path id as an ObjectId, or None if it is not one."""
+    try:
+        return ObjectId(document_id)
+    except (InvalidId, TypeError):
+        return None
+
+
+class TenantDocumentService:
+    """Service class for an organization's own documents."""
+    
+    def __init__(self, organization_service: OrganizationService, coalescer: WriteCoalescer):
+        self.organization_service = organization_service
+        self.coalescer = coalescer
+    
+    async def _location(self, organization_name: str, admin_user_id: str, writable: bool = False) -> TenantLocation:
+        return await self.organization_service.get_tenant_location(organization_name, admin_user_id, writable)
+    
+    @instrument("insert_documents")
+    async def insert_documents(
+        self,
+        organization_name: str,
+        admin_user_id: str,
+        documents: List[Any]
+    ) -> List[dict]:
+        """
+        Insert documents through the write coalescer.
+        
+        Args:
+            organization_name: Name of the organization
+            admin_user_id: Id of the authenticated admin
+            documents: Documents to insert; each is acknowledged separately
+        
+        Returns:
+            One result per document, in input order
+        """
+        location = await self._location(organization_name, admin_user_id, writable=True)
+        
+        async def insert_one(document: Any):
+            if not isinstance(document, dict):
+                raise DocumentWriteError(None, "Document must be a JSON object")
+            if any(key.startswith("$") for key in document):
+                raise DocumentWriteError(None, "Top-level field names must not start with '$'")
+            if "_id" in document and not isinstance(document["_id"], ObjectId):
+                raise DocumentWriteError(None, INVALID_ID_ERROR)
+            stored_id = await self.coalescer.insert(location.collection, location.prepare(document))
+            return location.document_id(stored_id)
+        
+        outcomes = await asyncio.gather(
+            *(insert_one(document) for document in documents), return_exceptions=True
+        )
+        results = []
+        for index, outcome in enumerate(outcomes):
+            if isinstance(outcome, DocumentWriteError):
+                results.append({
+                    "index": index,
+                    "status": "error",
+                    "error": "Duplicate _id" if outcome.duplicate_key else str(outcome),
+                    "code": outcome.code
+                })
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                results.append({"index": index, "status": "inserted", "inserted_id": outcome})
+        return results
+    
+    @staticmethod
+    def _query(query: dict, cursor: Optional[str], descending: bool) -> dict:
+        if not cursor:
+            return query
+        position = decode_list_cursor(cursor, "_id", descending)
+        keyset = {"_id": {"$lt" if descending else "$gt": position["id"]}}
+        return {"$and": [query, keyset]} if query else keyset
+    
+    @staticmethod
+    def _projection(fields: Optional[Sequence[str]]) -> Optional[dict]:
+        # _id is always returned since it is the pagination key
+        return {field: 1 for field in fields} if fields else None
+    
+    @instrument("find_documents")
+    async def find_documents(
+        self,
+        organization_name: str,
+        admin_user_id: str,
+        query: dict,
+        limit: int,
+        cursor: Optional[str] = None,
+        descending: bool = False,
+        fields: Optional[Sequence[str]] = None
+    ) -> dict:
+        """
+        Find one page of documents in ``_id`` order.
+        
+        Args:
+            organization_name: Name of the organization
+            admin_user_id: Id of the authenticated admin
+            query: MongoDB filter
+            limit: Maximum number of documents to return
+            cursor: ``next_cursor`` from the previous page
+            descending: Walk ``_id`` in descending order
+            fields: Fields to include besides ``_id`` (all when omitted)
+        
+        Returns:
+            Dictionary with ``documents`` and ``next_cursor`` (None on the last page)
+        """
+        location = await self._location(organization_name, admin_user_id)
+        # Read one extra document to learn whether another page exists
+        documents = await location.collection.find(
+            location.query(self._query(query, cursor, descending)), self._projection(fields)
+        ).sort(location.key, -1 if descending else 1).limit(limit + 1).to_list(length=None)
+        documents = [location.strip(document) for document in documents]
+        
+        next_cursor = None
+        if len(documents) > limit:
+            documents = documents[:limit]
+            next_cursor = encode_list_cursor("_id", descending, documents[-1])
+        return {"documents": documents, "next_cursor": next_cursor}
+    
+    async def export_documents(
+        self,
+        organization_name: str,
+        admin_user_id: str,
+        query: dict,
+        cursor: Optional[str] = None,
+        descending: bool = False,
+        fields: Optional[Sequence[str]] = None
+    ) -> AsyncIterator[dict]:
+        """
+        Stream every matching document from a single server-side cursor.
+        
+        Access and the cursor are checked before the stream is returned, so
+        errors surface before a streaming response has started. Documents are
+        fetched in batches of ``TENANT_EXPORT_BATCH_SIZE``.
+        """
+        location = await self._location(organization_name, admin_user_id)
+        documents = location.collection.find(
+            location.query(self._query(query, cursor, descending)),
+            self._projection(fields),
+            batch_size=settings.tenant_export_batch_size
+        ).sort(location.key, -1 if descending else 1)
+        if not location.scope:
+            return documents
+        return (location.strip(document) async for document in documents)
+    
+    @instrument("get_document")
+    async def get_document(self, organization_name: str, admin_user_id: str, document_id: str) -> dict:
+        """
+        Get a single document by ``_id``.
+        
+        Raises:
+            HTTPException: 404 if the document does not exist
+        """
+        location = await self._location(organization_name, admin_user_id)
+        object_id = parse_document_id(document_id)
+        document = None
+        if object_id is not None:
+            document = await location.collection.find_one(location.query({"_id": object_id}))
+        if document is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Document '{document_id}' not found"
+            )
+        return location.strip(document)
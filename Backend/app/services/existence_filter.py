@@ -0,0 +1,232 @@
+"""
+In-memory existence filters for organization names and admin emails.
+
+Lookups for names or emails that definitely do not exist are answered without
+a database round-trip, which keeps enumeration traffic off MongoDB.
+"""
+import asyncio
+import hashlib
+import math
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from app.config import settings
+from app.metrics import registry
+
+FILTER_FALSE_POSITIVE_RATE = registry.gauge(
+    "existence_filter_false_positive_rate",
+    "Share of lookups for absent keys that the filter could not rule out.",
+    ("filter",)
+)
+FILTER_ESTIMATED_FALSE_POSITIVE_RATE = registry.gauge(
+    "existence_filter_estimated_false_positive_rate",
+    "Theoretical false positive rate for the number of keys in the filter.",
+    ("filter",)
+)
+FILTER_SHORT_CIRCUITS = registry.counter(
+    "existence_filter_short_circuits_total",
+    "Lookups answered as definite misses without querying MongoDB.",
+    ("filter",)
+)
+
+# Overlap between sync polls, covering clock skew between workers
+SYNC_OVERLAP = timedelta(seconds=5)
+
+
+class CountingBloomFilter:
+    """
+    Bloom filter with 8-bit counters so keys can be removed.
+    
+    Counters saturate at 255 and are never decremented from there, which can
+    only cause extra false positives, never false negatives.
+    """
+    
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.counters = bytearray(self.size)
+        self.count = 0
+    
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+    
+    def add(self, key: str):
+        for position in self._positions(key):
+            if self.counters[position] < 255:
+                self.counters[position] += 1
+        self.count += 1
+    
+    def remove(self, key: str):
+        positions = self._positions(key)
+        if not all(self.counters[position] for position in positions):
+            return
+        for position in positions:
+            if 0 < self.counters[position] < 255:
+                self.counters[position] -= 1
+        self.count = max(0, self.count - 1)
+    
+    def __contains__(self, key: str) -> bool:
+        return all(self.counters[position] for position in self._positions(key))
+    
+    def estimated_false_positive_rate(self) -> float:
+        return (1 - math.exp(-self.hash_count * self.count / self.size)) ** self.hash_count
+
+
+class KeyFilter:
+    """A counting Bloom filter plus the statistics behind its false-positive metric."""
+    
+    def __init__(self, name: str, capacity: int, error_rate: float):
+        self.name = name
+        self.bloom = CountingBloomFilter(capacity, error_rate)
+        self.definite_misses = 0
+        self.false_positives = 0
+    
+    def might_contain(self, key: str) -> bool:
+        if key in self.bloom:
+            return True
+        self.definite_misses += 1
+        FILTER_SHORT_CIRCUITS.inc(self.name)
+        return False
+    
+    def record_false_positive(self):
+        """Report that a key the filter could not rule out was absent from MongoDB."""
+        self.false_positives += 1
+        self.update_metrics()
+    
+    def false_positive_rate(self) -> float:
+        absent_lookups = self.false_positives + self.definite_misses
+        return self.false_positives / absent_lookups if absent_lookups else 0.0
+    
+    def update_metrics(self):
+        FILTER_FALSE_POSITIVE_RATE.set(self.false_positive_rate(), self.name)
+        FILTER_ESTIMATED_FALSE_POSITIVE_RATE.set(self.bloom.estimated_false_positive_rate(), self.name)
+
+
+class ExistenceFilter:
+    """
+    Filters of known organization names and admin emails.
+    
+    The filters are warmed at startup by streaming a projection of the master
+    collections and updated by this worker's own writes. Writes made by other
+    workers are picked up by polling ``updated_at``/``created_at`` every
+    ``sync_interval`` seconds, so a tenant created elsewhere can be reported
+    missing here for up to that long. Removed keys may linger as false
+    positives, which only costs a database lookup.
+    """
+    
+    def __init__(
+        self,
+        database: AsyncIOMotorDatabase,
+        capacity: Optional[int] = None,
+        error_rate: Optional[float] = None,
+        sync_interval: Optional[float] = None
+    ):
+        self.db = database
+        capacity = capacity or settings.existence_filter_capacity
+        error_rate = error_rate or settings.existence_filter_error_rate
+        self.sync_interval = sync_interval if sync_interval is not None else settings.existence_filter_sync_seconds
+        self.organizations = KeyFilter("organization_name", capacity, error_rate)
+        self.emails = KeyFilter("email", capacity, error_rate)
+        self.ready = False
+        self._watermark: Optional[datetime] = None
+        # Keys added recently, so overlapping sync polls do not count them twice
+        self._recent: Dict[Tuple[str, str], datetime] = {}
+        self._task: Optional[asyncio.Task] = None
+    
+    async def warm(self):
+        """Load every organization name and admin email."""
+        self._watermark = datetime.utcnow() - SYNC_OVERLAP
+        async for org in self.db["organizations"].find({}, {"organization_name": 1, "_id": 0}):
+            self.organizations.bloom.add(org["organization_name"])
+        async for user in self.db["admin_users"].find({}, {"email": 1, "_id": 0}):
+            self.emails.bloom.add(user["email"])
+        self.organizations.update_metrics()
+        self.emails.update_metrics()
+        self.ready = True
+    
+    async def start(self):
+        """Warm the filters and start following other workers' writes."""
+        await self.warm()
+        if self.sync_interval > 0:
+            self._task = asyncio.create_task(self._sync_loop())
+    
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+    
+    def _add_once(self, key_filter: KeyFilter, key: str, now: datetime):
+        if self.sync_interval <= 0:
+            # Without polling nothing is seen twice and nothing prunes _recent
+            key_filter.bloom.add(key)
+            return
+        if (key_filter.name, key) not in self._recent:
+            key_filter.bloom.add(key)
+        self._recent[(key_filter.name, key)] = now
+    
+    async def sync(self):
+        """Add names and emails written since the last sync."""
+        now = datetime.utcnow()
+        since = self._watermark
+        self._watermark = now - SYNC_OVERLAP
+        async for org in self.db["organizations"].find(
+            {"updated_at": {"$gte": since}}, {"organization_name": 1, "_id": 0}
+        ):
+            self._add_once(self.organizations, org["organization_name"], now)
+        async for user in self.db["admin_users"].find(
+            {"created_at": {"$gte": since}}, {"email": 1, "_id": 0}
+        ):
+            self._add_once(self.emails, user["email"], now)
+        
+        horizon = now - 2 * SYNC_OVERLAP
+        self._recent = {key: seen for key, seen in self._recent.items() if seen >= horizon}
+        self.organizations.update_metrics()
+        self.emails.update_metrics()
+    
+    async def _sync_loop(self):
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await self.sync()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                print(f"Existence filter sync failed: {exc}")
+    
+    def might_have_organization(self, organization_name: str) -> bool:
+        """False only if the organization definitely does not exist."""
+        return not self.ready or self.organizations.might_contain(organization_name)
+    
+    def might_have_email(self, email: str) -> bool:
+        """False only if no admin definitely has this email."""
+        return not self.ready or self.emails.might_contain(email)
+    
+    def record_absent(self, organization_name: bool = False, email: bool = False):
+        """Report that a lookup the filter let through found nothing in MongoDB."""
+        if not self.ready:
+            return
+        if organization_name:
+            self.organizations.record_false_positive()
+        if email:
+            self.emails.record_false_positive()
+    
+    def add(self, organization_name: Optional[str] = None, email: Optional[str] = None):
+        """Record keys written by this worker."""
+        now = datetime.utcnow()
+        if organization_name is not None:
+            self._add_once(self.organizations, organization_name, now)
+        if email is not None:
+            self._add_once(self.emails, email, now)
+    
+    def remove(self, organization_name: Optional[str] = None, email: Optional[str] = None):
+        """Forget keys deleted by this worker."""
+        if organization_name is not None:
+            self.organizations.bloom.remove(organization_name)
+            self._recent.pop((self.organizations.name, organization_name), None)
+        if email is not None:
+            self.emails.bloom.remove(email)
+            self._recent.pop((self.emails.name, email), None)
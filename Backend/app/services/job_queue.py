@@ -0,0 +1,329 @@
+"""
+Background job queue for long-running tenant operations.
+
+Jobs are persisted in the master database so their status survives restarts
+and can be polled from any worker process.
+"""
+import asyncio
+import os
+import socket
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Optional
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from app.config import settings
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+JobHandler = Callable[[dict, Callable[[dict], Awaitable[None]]], Awaitable[Optional[dict]]]
+
+
+class JobQueue:
+    """
+    asyncio job queue backed by the ``jobs`` collection.
+    
+    A configurable number of worker tasks claim queued jobs atomically. Jobs
+    for the same tenant never run concurrently: a worker must hold the
+    tenant's row in ``job_locks`` before executing. Running jobs keep a lease
+    alive; a job whose lease expires (e.g. its process died) is picked up
+    again by any worker. Failed jobs are retried with exponential backoff.
+    """
+    
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        lease_seconds: Optional[float] = None
+    ):
+        self.workers = workers if workers is not None else settings.job_workers
+        self.max_attempts = max_attempts or settings.job_max_attempts
+        self.poll_interval = poll_interval or settings.job_poll_interval_seconds
+        self.lease_seconds = lease_seconds or settings.job_lease_seconds
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.handlers: Dict[str, JobHandler] = {}
+        self.jobs = None
+        self.locks = None
+        self._tasks = []
+        self._running: Dict[ObjectId, asyncio.Task] = {}
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+    
+    def register(self, kind: str, handler: JobHandler):
+        """Register the coroutine that executes jobs of a given kind."""
+        self.handlers[kind] = handler
+    
+    def bind(self, database: AsyncIOMotorDatabase):
+        """Point the queue at the database holding the job store."""
+        self.jobs = database["jobs"]
+        self.locks = database["job_locks"]
+    
+    async def start(self, database: AsyncIOMotorDatabase):
+        """Bind to the database and start the worker tasks."""
+        self.bind(database)
+        self._stopping = False
+        self._tasks = [
+            asyncio.create_task(self._worker_loop())
+            for _ in range(self.workers)
+        ]
+    
+    async def stop(self):
+        """Stop the workers; interrupted jobs are retried once their lease expires."""
+        self._stopping = True
+        self._wakeup.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+    
+    @property
+    def depth(self) -> int:
+        """Number of jobs currently executing in this process."""
+        return len(self._running)
+    
+    async def enqueue(self, kind: str, tenant: str, payload: dict) -> dict:
+        """
+        Persist a new job.
+        
+        Args:
+            kind: Registered handler name
+            tenant: Key used for per-tenant serialization
+            payload: Handler arguments
+        
+        Returns:
+            The stored job document
+        """
+        now = datetime.utcnow()
+        job = {
+            "kind": kind,
+            "tenant": tenant,
+            "payload": payload,
+            "status": QUEUED,
+            "attempts": 0,
+            "max_attempts": self.max_attempts,
+            "cancel_requested": False,
+            "progress": None,
+            "result": None,
+            "error": None,
+            "run_after": now,
+            "created_at": now,
+            "updated_at": now
+        }
+        result = await self.jobs.insert_one(job)
+        job["_id"] = result.inserted_id
+        self._wakeup.set()
+        return job
+    
+    async def get(self, job_id: str) -> Optional[dict]:
+        """Return a job by id, or None."""
+        try:
+            return await self.jobs.find_one({"_id": ObjectId(job_id)})
+        except InvalidId:
+            return None
+    
+    async def cancel(self, job_id: str) -> Optional[dict]:
+        """
+        Cancel a job.
+        
+        Queued jobs are cancelled immediately. Running jobs are flagged and
+        interrupted by the worker that holds them.
+        """
+        try:
+            oid = ObjectId(job_id)
+        except InvalidId:
+            return None
+        now = datetime.utcnow()
+        job = await self.jobs.find_one_and_update(
+            {"_id": oid, "status": QUEUED},
+            {"$set": {"status": CANCELLED, "cancel_requested": True, "finished_at": now, "updated_at": now}},
+            return_document=ReturnDocument.AFTER
+        )
+        if job:
+            return job
+        job = await self.jobs.find_one_and_update(
+            {"_id": oid, "status": RUNNING},
+            {"$set": {"cancel_requested": True, "updated_at": now}},
+            return_document=ReturnDocument.AFTER
+        )
+        if job and oid in self._running:
+            self._running[oid].cancel()
+        return job or await self.jobs.find_one({"_id": oid})
+    
+    async def _worker_loop(self):
+        while not self._stopping:
+            try:
+                job = await self._claim()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                print(f"Job queue claim failed: {exc}")
+                job = None
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._execute(job)
+    
+    async def _claim(self) -> Optional[dict]:
+        """Atomically claim the oldest runnable job whose tenant is free."""
+        now = datetime.utcnow()
+        job = await self.jobs.find_one_and_update(
+            {
+                "$or": [
+                    {"status": QUEUED, "run_after": {"$lte": now}},
+                    # Lease expired: the worker that held it is gone
+                    {"status": RUNNING, "lease_expires_at": {"$lt": now}}
+                ]
+            },
+            {
+                "$set": {
+                    "status": RUNNING,
+                    "worker": self.worker_id,
+                    "started_at": now,
+                    "lease_expires_at": now + timedelta(seconds=self.lease_seconds),
+                    "updated_at": now
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("created_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+        if job is None:
+            return None
+        if not await self._acquire_tenant(job):
+            # Another job holds this tenant; put this one back for later
+            await self.jobs.update_one(
+                {"_id": job["_id"]},
+                {
+                    "$set": {
+                        "status": QUEUED,
+                        "run_after": now + timedelta(seconds=self.poll_interval),
+                        "updated_at": now
+                    },
+                    "$inc": {"attempts": -1}
+                }
+            )
+            return None
+        return job
+    
+    async def _acquire_tenant(self, job: dict) -> bool:
+        now = datetime.utcnow()
+        lock = {
+            "job_id": job["_id"],
+            "worker": self.worker_id,
+            "expires_at": now + timedelta(seconds=self.lease_seconds)
+        }
+        try:
+            await self.locks.insert_one({"_id": job["tenant"], **lock})
+            return True
+        except DuplicateKeyError:
+            pass
+        # Take over the lock if it is ours already or its holder's lease expired
+        result = await self.locks.update_one(
+            {
+                "_id": job["tenant"],
+                "$or": [{"job_id": job["_id"]}, {"expires_at": {"$lt": now}}]
+            },
+            {"$set": lock}
+        )
+        return result.modified_count == 1
+    
+    async def _release_tenant(self, job: dict):
+        await self.locks.delete_one({"_id": job["tenant"], "job_id": job["_id"]})
+    
+    async def _heartbeat(self, job: dict, task: asyncio.Task):
+        """Extend the job lease and watch for cancellation requests."""
+        while not task.done():
+            await asyncio.sleep(self.lease_seconds / 3)
+            expires_at = datetime.utcnow() + timedelta(seconds=self.lease_seconds)
+            current = await self.jobs.find_one_and_update(
+                {"_id": job["_id"]},
+                {"$set": {"lease_expires_at": expires_at}},
+                projection={"cancel_requested": 1}
+            )
+            await self.locks.update_one(
+                {"_id": job["tenant"], "job_id": job["_id"]},
+                {"$set": {"expires_at": expires_at}}
+            )
+            if current and current.get("cancel_requested"):
+                task.cancel()
+    
+    async def _report_progress(self, job: dict, progress: dict):
+        await self.jobs.update_one(
+            {"_id": job["_id"]},
+            {"$set": {"progress": progress, "updated_at": datetime.utcnow()}}
+        )
+    
+    async def _execute(self, job: dict):
+        handler = self.handlers.get(job["kind"])
+        task = asyncio.create_task(self._run_handler(handler, job))
+        self._running[job["_id"]] = task
+        heartbeat = asyncio.create_task(self._heartbeat(job, task))
+        update = {}
+        try:
+            if job.get("cancel_requested"):
+                task.cancel()
+            result = await task
+            update = {"status": SUCCEEDED, "result": result, "error": None}
+        except asyncio.CancelledError:
+            if self._stopping:
+                # Shutdown: leave the job running so its lease expires and it is retried
+                raise
+            update = {"status": CANCELLED}
+        except Exception as exc:
+            update = {"error": f"{type(exc).__name__}: {exc}"}
+            if job["attempts"] < job["max_attempts"]:
+                backoff = 2 ** job["attempts"]
+                update.update({
+                    "status": QUEUED,
+                    "run_after": datetime.utcnow() + timedelta(seconds=backoff)
+                })
+            else:
+                update["status"] = FAILED
+        finally:
+            heartbeat.cancel()
+            self._running.pop(job["_id"], None)
+            if update:
+                now = datetime.utcnow()
+                update["updated_at"] = now
+                if update["status"] != QUEUED:
+                    update["finished_at"] = now
+                await self.jobs.update_one({"_id": job["_id"]}, {"$set": update})
+                await self._release_tenant(job)
+    
+    async def _run_handler(self, handler: Optional[JobHandler], job: dict):
+        if handler is None:
+            raise LookupError(f"No handler registered for job kind '{job['kind']}'")
+        
+        async def report(progress: dict):
+            await self._report_progress(job, progress)
+        
+        return await handler(job, report)
+
+
+def serialize_job(job: dict) -> dict:
+    """Convert a job document into the public job status payload."""
+    return {
+        "job_id": str(job["_id"]),
+        "kind": job["kind"],
+        "status": job["status"],
+        "attempts": job["attempts"],
+        "progress": job.get("progress"),
+        "result": job.get("result"),
+        "error": job.get("error"),
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+        "finished_at": job.get("finished_at")
+    }
+
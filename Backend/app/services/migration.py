@@ -0,0 +1,203 @@
+"""
+Collection migration engine used when a tenant collection is renamed.
+"""
+import inspect
+from datetime import datetime
+from typing import Callable, Optional
+from bson import json_util
+from pymongo import ASCENDING
+from pymongo.errors import BulkWriteError, OperationFailure
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from app.config import settings
+
+# Server error codes handled explicitly
+NAMESPACE_NOT_FOUND = 26
+DUPLICATE_KEY = 11000
+
+# renameCollection failures that mean the server will not rename this
+# collection at all (sharded, no privilege, unsupported), where copying is
+# the way to move it; any other failure is raised
+RENAME_REFUSED = {
+    13,   # Unauthorized
+    20,   # IllegalOperation, e.g. a sharded collection
+    115,  # CommandNotSupported
+}
+
+
+class CollectionMigrator:
+    """
+    Move every document from one collection to another.
+    
+    A server-side ``renameCollection`` is tried first since it is O(1). If the
+    server refuses it, documents are streamed through a cursor in fixed-size
+    batches, keeping their ``_id``s. Progress is checkpointed in the master
+    database after every batch, so a migration interrupted by a crash resumes
+    from the last copied ``_id`` the next time it is run. A resumed copy then
+    compares ``_id`` sets to pick up documents of other BSON types, which sort
+    apart from the checkpoint. The source is only dropped once the target
+    holds at least as many documents.
+    """
+    
+    def __init__(
+        self,
+        database: AsyncIOMotorDatabase,
+        batch_size: Optional[int] = None,
+        progress_callback: Optional[Callable[[dict], object]] = None
+    ):
+        self.database = database
+        self.batch_size = batch_size or settings.migration_batch_size
+        self.progress_callback = progress_callback
+        self.checkpoints = database["collection_migrations"]
+    
+    async def migrate(
+        self,
+        source_name: str,
+        target_name: str,
+        allow_rename: bool = True
+    ) -> dict:
+        """
+        Migrate a collection to a new name.
+        
+        Args:
+            source_name: Collection to migrate from
+            target_name: Collection to migrate to
+            allow_rename: Try a server-side rename before copying
+        
+        Returns:
+            Summary with the strategy used and the number of documents moved
+        
+        Raises:
+            OperationFailure: The rename failed for a reason copying cannot fix
+            RuntimeError: The copy is incomplete; the source is kept
+        """
+        if source_name == target_name:
+            return {"strategy": "noop", "copied": 0}
+        checkpoint_id = f"{source_name}->{target_name}"
+        checkpoint = await self.checkpoints.find_one({"_id": checkpoint_id})
+        
+        # A pending checkpoint means a previous copy was interrupted
+        if checkpoint is None and allow_rename:
+            try:
+                await self.database[source_name].rename(target_name)
+                return {"strategy": "rename", "copied": None}
+            except OperationFailure as exc:
+                if exc.code == NAMESPACE_NOT_FOUND:
+                    return {"strategy": "noop", "copied": 0}
+                if exc.code not in RENAME_REFUSED:
+                    raise
+                print(f"renameCollection {checkpoint_id} failed, copying instead: {exc}")
+        
+        return await self._copy(checkpoint_id, source_name, target_name, checkpoint)
+    
+    async def _copy(
+        self,
+        checkpoint_id: str,
+        source_name: str,
+        target_name: str,
+        checkpoint: Optional[dict]
+    ) -> dict:
+        source = self.database[source_name]
+        target = self.database[target_name]
+        
+        if checkpoint is None:
+            checkpoint = {
+                "_id": checkpoint_id,
+                "source": source_name,
+                "target": target_name,
+                "copied": 0,
+                "total": await source.estimated_document_count(),
+                "started_at": datetime.utcnow()
+            }
+            await self.checkpoints.insert_one(checkpoint)
+        
+        query = {}
+        resumed = checkpoint.get("last_id") is not None
+        if resumed:
+            query = {"_id": {"$gt": checkpoint["last_id"]}}
+        
+        cursor = source.find(query).sort("_id", ASCENDING).batch_size(self.batch_size)
+        batch = []
+        async for document in cursor:
+            batch.append(document)
+            if len(batch) >= self.batch_size:
+                await self._flush(target, batch, checkpoint)
+                batch = []
+        if batch:
+            await self._flush(target, batch, checkpoint)
+        if resumed:
+            await self._copy_missing(source, target, checkpoint)
+        
+        source_count = await source.count_documents({})
+        target_count = await target.count_documents({})
+        if target_count < source_count:
+            raise RuntimeError(
+                f"Migration {checkpoint_id} is incomplete: {target_count} of {source_count} "
+                "documents copied; the source was kept"
+            )
+        await source.drop()
+        await self.checkpoints.delete_one({"_id": checkpoint_id})
+        return {"strategy": "copy", "copied": checkpoint["copied"]}
+    
+    async def _copy_missing(self, source, target, checkpoint: dict):
+        """Copy the source documents whose ``_id`` the target lacks."""
+        ids = []
+        
+        async def flush():
+            present = {
+                json_util.dumps(document["_id"])
+                async for document in target.find({"_id": {"$in": ids}}, {"_id": 1})
+            }
+            missing = [value for value in ids if json_util.dumps(value) not in present]
+            ids.clear()
+            if missing:
+                documents = await source.find({"_id": {"$in": missing}}).to_list(length=None)
+                await self._insert(target, documents)
+                checkpoint["copied"] += len(documents)
+        
+        async for document in source.find({}, {"_id": 1}).batch_size(self.batch_size):
+            ids.append(document["_id"])
+            if len(ids) >= self.batch_size:
+                await flush()
+        if ids:
+            await flush()
+    
+    @staticmethod
+    async def _insert(target, batch: list):
+        try:
+            await target.insert_many(batch, ordered=False)
+        except BulkWriteError as exc:
+            # Documents already copied before a crash are expected duplicates
+            errors = exc.details.get("writeErrors", [])
+            if any(error.get("code") != DUPLICATE_KEY for error in errors):
+                raise
+    
+    async def _flush(self, target, batch: list, checkpoint: dict):
+        """Insert one batch and advance the checkpoint."""
+        await self._insert(target, batch)
+        
+        checkpoint["copied"] += len(batch)
+        checkpoint["last_id"] = batch[-1]["_id"]
+        await self.checkpoints.update_one(
+            {"_id": checkpoint["_id"]},
+            {
+                "$set": {
+                    "copied": checkpoint["copied"],
+                    "last_id": checkpoint["last_id"],
+                    "updated_at": datetime.utcnow()
+                }
+            }
+        )
+        if self.progress_callback:
+            # Callbacks may be plain functions or coroutines
+            result = self.progress_callback({
+                "source": checkpoint["source"],
+                "target": checkpoint["target"],
+                "copied": checkpoint["copied"],
+                "total": checkpoint["total"]
+            })
+            if inspect.isawaitable(result):
+                await result
+    
+    async def pending(self) -> list:
+        """Return checkpoints of migrations that were interrupted."""
+        return await self.checkpoints.find({}).to_list(length=None)
@@ -0,0 +1,89 @@
+"""
+In-process cache for organization metadata.
+"""
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class OrganizationCache:
+    """
+    Bounded LRU cache of joined organization + admin records with a TTL.
+    
+    Entries are stored by organization ObjectId (as a string) and indexed by
+    organization name, so either key resolves to the same record. Cached
+    records are shared and must be treated as read-only by callers.
+    """
+    
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._ids_by_name = {}
+    
+    def _get(self, org_id: Optional[str]) -> Optional[dict]:
+        entry = self._entries.get(org_id) if org_id else None
+        if entry is None:
+            self.misses += 1
+            return None
+        record, expires_at = entry
+        if expires_at <= time.monotonic():
+            self._remove(org_id)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(org_id)
+        self.hits += 1
+        return record
+    
+    def get_by_name(self, organization_name: str) -> Optional[dict]:
+        """Return the cached record for an organization name, if fresh."""
+        return self._get(self._ids_by_name.get(organization_name))
+    
+    def get_by_id(self, org_id) -> Optional[dict]:
+        """Return the cached record for an organization ObjectId, if fresh."""
+        return self._get(str(org_id))
+    
+    def set(self, record: dict):
+        """Cache a joined organization record, evicting the oldest if full."""
+        if self.max_entries <= 0:
+            return
+        org_id = str(record["_id"])
+        self._remove(org_id)
+        self._entries[org_id] = (record, time.monotonic() + self.ttl_seconds)
+        self._ids_by_name[record["organization_name"]] = org_id
+        while len(self._entries) > self.max_entries:
+            oldest_id = next(iter(self._entries))
+            self._remove(oldest_id)
+    
+    def invalidate(self, organization_name: Optional[str] = None, org_id=None):
+        """Drop a record by name and/or ObjectId."""
+        if organization_name is not None:
+            name_id = self._ids_by_name.get(organization_name)
+            if name_id:
+                self._remove(name_id)
+        if org_id is not None:
+            self._remove(str(org_id))
+    
+    def clear(self):
+        """Drop every cached record."""
+        self._entries.clear()
+        self._ids_by_name.clear()
+    
+    def _remove(self, org_id: str):
+        entry = self._entries.pop(org_id, None)
+        if entry is not None:
+            name = entry[0]["organization_name"]
+            if self._ids_by_name.get(name) == org_id:
+                del self._ids_by_name[name]
+    
+    def stats(self) -> dict:
+        """Return size and hit/miss counters."""
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
@@ -1,24 +1,264 @@
 """
 Organization service for managing organizations and dynamic collections.
 """
-from typing import Optional
-from datetime import datetime
-from bson import ObjectId
-from app.database import get_database, get_organization_collection
+import asyncio
+import base64
+import re
+from typing import AsyncIterator, List, Optional, Sequence
+from datetime import datetime, timedelta
+from bson import ObjectId, json_util
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from app.config import settings
+from app.database import DEFAULT_CLUSTER, get_database, run_in_transaction
+from app.indexes import ensure_tenant_indexes
+from app.metrics import component_timer, instrument
+from app.services.existence_filter import ExistenceFilter
+from app.services.org_cache import OrganizationCache
+from app.services.migration import DUPLICATE_KEY, CollectionMigrator
+from app.services.job_queue import JobQueue, serialize_job
+from app.services.tenant_storage import (
+    TenantLocation,
+    TenantStorageRouter,
+    check_copied,
+    copy_missing_documents,
+    copy_tenant_documents
+)
 from app.models.organization import Organization
 from app.models.user import AdminUser
-from app.auth.password import hash_password, verify_password
+from app.auth.password import hash_password_async, password_pool, verify_password_async
 from fastapi import HTTPException, status
 
 
+# Fields needed to build an OrganizationResponse and to verify the admin
+ORGANIZATION_PROJECTION = {
+    "organization_name": 1,
+    "collection_name": 1,
+    "admin_user_id": 1,
+    "created_at": 1,
+    "updated_at": 1,
+    "migrating_from": 1,
+    "storage": 1,
+    "storage_migration": 1,
+    "cluster": 1,
+    "cluster_move": 1,
+    "moved_from": 1,
+    "deleted_at": 1,
+    "purge_after": 1,
+    "admin": {"$arrayElemAt": ["$admin", 0]}
+}
+
+
+# Deleted organizations keep a tombstone until the reaper purges them and
+# are hidden from every read
+NOT_DELETED = {"deleted_at": {"$exists": False}}
+
+# Matches organizations with no rename, storage migration, cluster move or
+# delete in progress; each of those claims the organization with a
+# conditional update on this filter
+IDLE_ORGANIZATION = {
+    "migrating_from": {"$exists": False},
+    "storage_migration": {"$exists": False},
+    "cluster_move": {"$exists": False},
+    "moved_from": {"$exists": False},
+    "deleting": {"$exists": False},
+    **NOT_DELETED
+}
+
+
+# admin_user_id is stored as a string, so it is converted before the
+# correlated $lookup on admin_users._id
+ADMIN_LOOKUP = {
+    "$lookup": {
+        "from": "admin_users",
+        "let": {"admin_id": {"$toObjectId": "$admin_user_id"}},
+        "pipeline": [
+            {"$match": {"$expr": {"$eq": ["$_id", "$$admin_id"]}}},
+            {"$project": {"email": 1, "password_hash": 1}}
+        ],
+        "as": "admin"
+    }
+}
+
+# Keys usable for keyset pagination; True when the key alone is unique
+LIST_SORT_KEYS = {
+    "_id": True,
+    "organization_name": True,
+    "created_at": False
+}
+
+# Fields that can be requested from the listing endpoint; admin emails are
+# left out so the public listing cannot be used to enumerate logins
+LIST_FIELDS = ("id", "organization_name", "collection_name", "created_at", "updated_at")
+
+
+def organization_pipeline(match: dict, include_deleted: bool = False) -> List[dict]:
+    """Build the aggregation that joins organizations with their admin user."""
+    return [
+        {"$match": match if include_deleted else {**match, **NOT_DELETED}},
+        ADMIN_LOOKUP,
+        {"$project": ORGANIZATION_PROJECTION}
+    ]
+
+
+def encode_list_cursor(sort: str, descending: bool, document: dict) -> str:
+    """Encode the sort key of the last listed document as an opaque cursor."""
+    position = {"sort": sort, "desc": descending, "id": document["_id"]}
+    if sort != "_id":
+        position["value"] = document[sort]
+    return base64.urlsafe_b64encode(json_util.dumps(position).encode()).decode()
+
+
+def decode_list_cursor(cursor: str, sort: str, descending: bool) -> dict:
+    """
+    Decode a listing cursor and check it belongs to the requested ordering.
+    
+    Raises:
+        HTTPException: 400 if the cursor is malformed or was issued for another sort
+    """
+    try:
+        position = json_util.loads(base64.urlsafe_b64decode(cursor.encode()))
+        valid = position["sort"] == sort and position["desc"] == descending
+    except (ValueError, TypeError, KeyError):
+        valid = False
+    if not valid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor for this sort order"
+        )
+    return position
+
+
 class OrganizationService:
     """Service class for organization operations."""
     
-    def __init__(self):
-        self.db = get_database()
+    def __init__(
+        self,
+        database=None,
+        cache: Optional[OrganizationCache] = None,
+        job_queue: Optional[JobQueue] = None,
+        existence_filter: Optional[ExistenceFilter] = None,
+        storage: Optional[TenantStorageRouter] = None
+    ):
+        self.db = database if database is not None else get_database()
         self.orgs_collection = self.db["organizations"]
         self.users_collection = self.db["admin_users"]
+        self.cache = cache if cache is not None else OrganizationCache(
+            max_entries=settings.org_cache_max_entries,
+            ttl_seconds=settings.org_cache_ttl_seconds
+        )
+        self.job_queue = job_queue
+        self.existence_filter = existence_filter
+        self.storage = storage if storage is not None else TenantStorageRouter(self.db)
+        if job_queue is not None:
+            job_queue.register("rename_organization", self._run_rename_job)
+            job_queue.register("delete_organization", self._run_delete_job)
     
+    async def _load_organization(self, organization_name: str) -> dict:
+        """
+        Load an organization joined with its admin user, via the cache.
+        
+        Args:
+            organization_name: Name of the organization
+            
+        Returns:
+            Organization document with an ``admin`` sub-document (None if missing)
+        """
+        record = self.cache.get_by_name(organization_name)
+        if record is not None:
+            return record
+        
+        # Definite misses are answered without a query
+        if self._might_have_organization(organization_name):
+            results = await self._fetch_organizations({"organization_name": organization_name})
+            if not results and self.existence_filter is not None:
+                self.existence_filter.record_absent(organization_name=True)
+        else:
+            results = []
+        
+        if not results:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Organization '{organization_name}' not found"
+            )
+        
+        org_data = results[0]
+        self.cache.set(org_data)
+        return org_data
+    
+    async def get_tenant_location(
+        self,
+        organization_name: str,
+        admin_user_id: str,
+        writable: bool = False
+    ) -> TenantLocation:
+        """
+        Resolve where an organization's documents live, for its admin.
+        
+        Args:
+            organization_name: Name of the organization
+            admin_user_id: Id of the authenticated admin (the token subject)
+            writable: The caller is going to write documents
+            
+        Returns:
+            The organization's tenant location under its storage strategy
+            
+        Raises:
+            HTTPException: 403 for another organization's admin, 409 while the
+            organization's documents are being moved (only for writes during
+            the final phase of a cluster move)
+        """
+        org_data = await self._load_organization(organization_name)
+        if org_data["admin_user_id"] != admin_user_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Not an admin of organization '{organization_name}'"
+            )
+        if org_data.get("migrating_from"):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Organization '{organization_name}' is being renamed, retry later"
+            )
+        if org_data.get("storage_migration"):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Organization '{organization_name}' is changing storage, retry later"
+            )
+        if writable and (org_data.get("cluster_move") or {}).get("frozen"):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Organization '{organization_name}' is moving to another cluster, retry later"
+            )
+        return self.storage.for_organization(org_data).locate(org_data)
+    
+    def _might_have_organization(self, organization_name: str) -> bool:
+        """False only when the existence filter rules the organization out."""
+        return self.existence_filter is None or self.existence_filter.might_have_organization(organization_name)
+    
+    def _might_have_email(self, email: str) -> bool:
+        """False only when the existence filter rules the email out."""
+        return self.existence_filter is None or self.existence_filter.might_have_email(email)
+    
+    async def _fetch_organizations(self, match: dict, include_deleted: bool = False) -> List[dict]:
+        """Run the organization/admin join in a single round-trip."""
+        cursor = self.orgs_collection.aggregate(organization_pipeline(match, include_deleted))
+        return await cursor.to_list(length=None)
+    
+    @staticmethod
+    def _to_response(org_data: dict) -> dict:
+        """Build the response dictionary from a joined organization record."""
+        admin_user = org_data.get("admin")
+        return {
+            "id": str(org_data["_id"]),
+            "organization_name": org_data["organization_name"],
+            "collection_name": org_data["collection_name"],
+            "admin_email": admin_user["email"] if admin_user else "N/A",
+            "created_at": org_data["created_at"],
+            "updated_at": org_data["updated_at"]
+        }
+    
+    @instrument("create_organization")
     async def create_organization(
         self,
         organization_name: str,
@@ -40,52 +280,76 @@ class OrganizationService:
         normalized_name = organization_name.lower().replace(' ', '_')
         collection_name = f"org_{normalized_name}"
         
-        # Check if organization already exists
-        existing_org = await self.orgs_collection.find_one(
-            {"organization_name": organization_name}
-        )
-        if existing_org:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Organization '{organization_name}' already exists"
+        # Check if organization already exists (skipped when the existence
+        # filter rules it out; the unique indexes still catch any race)
+        if self._might_have_organization(organization_name):
+            existing_org = await self.orgs_collection.find_one(
+                {"organization_name": organization_name}
             )
+            if existing_org:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Organization '{organization_name}' already exists"
+                )
+            if self.existence_filter is not None:
+                self.existence_filter.record_absent(organization_name=True)
         
         # Check if email already exists
-        existing_user = await self.users_collection.find_one({"email": email})
-        if existing_user:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Email '{email}' is already registered"
-            )
+        if self._might_have_email(email):
+            existing_user = await self.users_collection.find_one({"email": email})
+            if existing_user:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Email '{email}' is already registered"
+                )
+            if self.existence_filter is not None:
+                self.existence_filter.record_absent(email=True)
         
         # Hash password
-        password_hash = hash_password(password)
+        password_hash = await hash_password_async(password)
         
-        # Create admin user
         admin_user = AdminUser(
             email=email,
             password_hash=password_hash,
             organization_name=organization_name
         )
-        user_result = await self.users_collection.insert_one(admin_user.to_dict())
-        admin_user_id = str(user_result.inserted_id)
-        
-        # Create organization
         organization = Organization(
             organization_name=organization_name,
             collection_name=collection_name,
-            admin_user_id=admin_user_id
+            admin_user_id=str(admin_user._id),
+            storage=self.storage.default.name,
+            cluster=await self.storage.place()
         )
-        org_result = await self.orgs_collection.insert_one(organization.to_dict())
         
-        # Create dynamic collection for the organization
-        org_collection = get_organization_collection(organization_name)
-        # Initialize with a basic schema/document
-        await org_collection.insert_one({
-            "organization_name": organization_name,
-            "created_at": datetime.utcnow(),
-            "initialized": True
-        })
+        async def insert_documents(session):
+            # The checks above are only a fast path: the unique indexes decide
+            # which of several concurrent creates wins
+            try:
+                await self.users_collection.insert_one(admin_user.to_dict(), session=session)
+            except DuplicateKeyError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Email '{email}' is already registered"
+                ) from None
+            try:
+                return await self.orgs_collection.insert_one(organization.to_dict(), session=session)
+            except DuplicateKeyError:
+                if session is None:
+                    # No transaction to abort, so undo the admin user by hand
+                    await self.users_collection.delete_one({"_id": admin_user._id})
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Organization '{organization_name}' already exists"
+                ) from None
+        
+        # Create admin user and organization
+        org_result = await run_in_transaction(self.db, insert_documents)
+        if self.existence_filter is not None:
+            self.existence_filter.add(organization_name=organization_name, email=email)
+        
+        # Create the organization's tenant storage
+        org_dict = organization.to_dict()
+        await self.storage.for_organization(org_dict).initialize(org_dict)
         
         return {
             "id": str(org_result.inserted_id),
@@ -96,6 +360,182 @@ class OrganizationService:
             "updated_at": organization.updated_at
         }
     
+    @instrument("bulk_create_organizations")
+    async def bulk_create_organizations(self, items: List[dict]) -> List[dict]:
+        """
+        Create many organizations with batched database work.
+        
+        Names, collection names and emails are checked with one ``$in`` query
+        per collection, passwords are hashed in parallel on the worker pool,
+        and admin users and organizations are written with unordered
+        ``insert_many`` calls. Items fail individually; a failure never aborts
+        the rest of the batch.
+        
+        Args:
+            items: Dictionaries with organization_name, email and password
+            
+        Returns:
+            One result per item, in input order
+        """
+        results = [
+            {"index": index, "organization_name": item["organization_name"], "status": "error"}
+            for index, item in enumerate(items)
+        ]
+        
+        # Reject duplicates within the batch
+        pending = []
+        seen_names, seen_collections, seen_emails = set(), set(), set()
+        for index, item in enumerate(items):
+            collection_name = "org_" + item["organization_name"].lower().replace(' ', '_')
+            if item["organization_name"] in seen_names or collection_name in seen_collections:
+                results[index]["error"] = f"Organization '{item['organization_name']}' is duplicated in the batch"
+            elif item["email"] in seen_emails:
+                results[index]["error"] = f"Email '{item['email']}' is duplicated in the batch"
+            else:
+                seen_names.add(item["organization_name"])
+                seen_collections.add(collection_name)
+                seen_emails.add(item["email"])
+                pending.append((index, item, collection_name))
+        
+        # Reject names and emails that already exist, one query per collection.
+        # Keys ruled out by the existence filter are left out of the queries;
+        # the unique indexes reject any that were created concurrently.
+        query_names = [name for name in seen_names if self._might_have_organization(name)]
+        query_emails = [email for email in seen_emails if self._might_have_email(email)]
+        existing_orgs, existing_users = await asyncio.gather(
+            self.orgs_collection.find(
+                {"$or": [
+                    {"organization_name": {"$in": query_names}},
+                    {"collection_name": {"$in": list(seen_collections)}}
+                ]},
+                {"organization_name": 1, "collection_name": 1}
+            ).to_list(length=None),
+            self.users_collection.find(
+                {"email": {"$in": query_emails}},
+                {"email": 1}
+            ).to_list(length=None)
+        )
+        taken_names = {org["organization_name"] for org in existing_orgs}
+        taken_collections = {org["collection_name"] for org in existing_orgs}
+        taken_emails = {user["email"] for user in existing_users}
+        
+        candidates = []
+        for index, item, collection_name in pending:
+            if item["organization_name"] in taken_names or collection_name in taken_collections:
+                results[index]["error"] = f"Organization '{item['organization_name']}' already exists"
+            elif item["email"] in taken_emails:
+                results[index]["error"] = f"Email '{item['email']}' is already registered"
+            else:
+                candidates.append((index, item, collection_name))
+        if not candidates:
+            return results
+        
+        # Hash in parallel without overrunning the pool's pending limit
+        semaphore = asyncio.Semaphore(password_pool.max_workers)
+        
+        async def hash_limited(password: str) -> str:
+            async with semaphore:
+                return await hash_password_async(password)
+        
+        password_hashes = await asyncio.gather(
+            *(hash_limited(item["password"]) for _, item, _ in candidates)
+        )
+        
+        # Insert admin users
+        admin_users = [
+            AdminUser(
+                email=item["email"],
+                password_hash=password_hash,
+                organization_name=item["organization_name"]
+            )
+            for (_, item, _), password_hash in zip(candidates, password_hashes)
+        ]
+        failed = await self._insert_unordered(
+            self.users_collection, [user.to_dict() for user in admin_users]
+        )
+        for position in failed:
+            index, item, _ = candidates[position]
+            results[index]["error"] = f"Email '{item['email']}' is already registered"
+        candidates = [
+            (candidate, admin_user)
+            for position, (candidate, admin_user) in enumerate(zip(candidates, admin_users))
+            if position not in failed
+        ]
+        
+        # Insert organizations
+        organizations = [
+            Organization(
+                organization_name=item["organization_name"],
+                collection_name=collection_name,
+                admin_user_id=str(admin_user._id),
+                storage=self.storage.default.name,
+                cluster=await self.storage.place()
+            )
+            for (_, item, collection_name), admin_user in candidates
+        ]
+        failed = await self._insert_unordered(
+            self.orgs_collection, [organization.to_dict() for organization in organizations]
+        )
+        if failed:
+            # Roll back the admin users of organizations that lost a race
+            await self.users_collection.delete_many(
+                {"_id": {"$in": [candidates[position][1]._id for position in failed]}}
+            )
+        for position in failed:
+            index, item, _ = candidates[position][0]
+            results[index]["error"] = f"Organization '{item['organization_name']}' already exists"
+        
+        created = [
+            (candidate, organization)
+            for position, (candidate, organization) in enumerate(zip(candidates, organizations))
+            if position not in failed
+        ]
+        
+        # Create the tenants' storage concurrently
+        org_dicts = [organization.to_dict() for _, organization in created]
+        await asyncio.gather(*(
+            self.storage.for_organization(org_dict).initialize(org_dict)
+            for org_dict in org_dicts
+        ))
+        
+        for ((index, item, collection_name), _), organization in created:
+            if self.existence_filter is not None:
+                self.existence_filter.add(organization_name=organization.organization_name, email=item["email"])
+            results[index] = {
+                "index": index,
+                "organization_name": organization.organization_name,
+                "status": "created",
+                "organization": {
+                    "id": str(organization._id),
+                    "organization_name": organization.organization_name,
+                    "collection_name": collection_name,
+                    "admin_email": item["email"],
+                    "created_at": organization.created_at,
+                    "updated_at": organization.updated_at
+                }
+            }
+        return results
+    
+    @staticmethod
+    async def _insert_unordered(collection, documents: List[dict]) -> set:
+        """
+        Insert documents with ordered=False.
+        
+        Returns:
+            Positions of documents rejected as duplicates
+        """
+        if not documents:
+            return set()
+        try:
+            await collection.insert_many(documents, ordered=False)
+        except BulkWriteError as exc:
+            errors = exc.details.get("writeErrors", [])
+            if any(error.get("code") != DUPLICATE_KEY for error in errors):
+                raise
+            return {error["index"] for error in errors}
+        return set()
+    
+    @instrument("get_organization")
     async def get_organization(self, organization_name: str) -> dict:
         """
         Get organization by name.
@@ -106,30 +546,187 @@ class OrganizationService:
         Returns:
             Organization metadata dictionary
         """
-        org_data = await self.orgs_collection.find_one(
-            {"organization_name": organization_name}
-        )
+        org_data = await self._load_organization(organization_name)
+        return self._to_response(org_data)
+    
+    @instrument("get_organizations")
+    async def get_organizations(self, organization_names: List[str]) -> dict:
+        """
+        Get several organizations by name in one query.
         
-        if not org_data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Organization '{organization_name}' not found"
-            )
+        Cached records are served directly; the remaining names are resolved
+        with a single aggregation.
         
-        # Get admin user details
-        admin_user = await self.users_collection.find_one(
-            {"_id": ObjectId(org_data["admin_user_id"])}
-        )
+        Args:
+            organization_names: Names of the organizations
+            
+        Returns:
+            Dictionary with found organizations and names that were not found
+        """
+        names = list(dict.fromkeys(organization_names))
+        found = {}
+        missing = []
+        for name in names:
+            record = self.cache.get_by_name(name)
+            if record is not None:
+                found[name] = record
+            else:
+                missing.append(name)
+        
+        missing = [name for name in missing if self._might_have_organization(name)]
+        if missing:
+            for org_data in await self._fetch_organizations({"organization_name": {"$in": missing}}):
+                self.cache.set(org_data)
+                found[org_data["organization_name"]] = org_data
+            if self.existence_filter is not None:
+                for name in missing:
+                    if name not in found:
+                        self.existence_filter.record_absent(organization_name=True)
         
         return {
-            "id": str(org_data["_id"]),
-            "organization_name": org_data["organization_name"],
-            "collection_name": org_data["collection_name"],
-            "admin_email": admin_user["email"] if admin_user else "N/A",
-            "created_at": org_data["created_at"],
-            "updated_at": org_data["updated_at"]
+            "organizations": [
+                self._to_response(found[name])
+                for name in names if name in found
+            ],
+            "not_found": [name for name in names if name not in found]
+        }
+    
+    def _list_pipeline(
+        self,
+        prefix: Optional[str],
+        sort: str,
+        descending: bool,
+        cursor: Optional[str],
+        fields: Sequence[str],
+        limit: Optional[int]
+    ) -> List[dict]:
+        """
+        Build a keyset-paginated listing aggregation.
+        
+        The position is expressed as a range on the sort key (plus ``_id`` for
+        non-unique keys) rather than a skip, so every page is an index seek.
+        """
+        match = dict(NOT_DELETED)
+        if prefix:
+            # An anchored, case-sensitive regex is bounded by the name index
+            match["organization_name"] = {"$regex": f"^{re.escape(prefix)}"}
+        
+        direction = -1 if descending else 1
+        comparison = "$lt" if descending else "$gt"
+        if cursor:
+            position = decode_list_cursor(cursor, sort, descending)
+            if sort == "_id":
+                match["_id"] = {comparison: position["id"]}
+            elif LIST_SORT_KEYS[sort]:
+                # Combined with the prefix regex when sorting by name
+                match.setdefault(sort, {})[comparison] = position.get("value")
+            else:
+                match["$or"] = [
+                    {sort: {comparison: position["value"]}},
+                    {sort: position["value"], "_id": {comparison: position["id"]}}
+                ]
+        
+        sort_spec = {sort: direction}
+        if not LIST_SORT_KEYS[sort]:
+            sort_spec["_id"] = direction
+        
+        pipeline = [{"$match": match}, {"$sort": sort_spec}]
+        if limit is not None:
+            pipeline.append({"$limit": limit})
+        projection = {field: 1 for field in fields if field != "id"}
+        projection[sort] = 1
+        pipeline.append({"$project": projection})
+        return pipeline
+    
+    @staticmethod
+    def _to_listing(document: dict, fields: Sequence[str]) -> dict:
+        """Keep only the requested fields of a listed organization."""
+        item = {}
+        for field in fields:
+            if field == "id":
+                item["id"] = str(document["_id"])
+            else:
+                item[field] = document.get(field)
+        return item
+    
+    @instrument("list_organizations")
+    async def list_organizations(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        prefix: Optional[str] = None,
+        sort: str = "_id",
+        descending: bool = False,
+        fields: Sequence[str] = LIST_FIELDS
+    ) -> dict:
+        """
+        List one page of organizations.
+        
+        Args:
+            limit: Maximum number of organizations to return
+            cursor: ``next_cursor`` from the previous page
+            prefix: Only organizations whose name starts with this string
+            sort: Keyset field, one of ``LIST_SORT_KEYS``
+            descending: Walk the sort key in descending order
+            fields: Fields to include, from ``LIST_FIELDS``
+            
+        Returns:
+            Dictionary with ``organizations`` and ``next_cursor`` (None on the last page)
+        """
+        # Read one extra document to learn whether another page exists
+        pipeline = self._list_pipeline(prefix, sort, descending, cursor, fields, limit + 1)
+        documents = await self.orgs_collection.aggregate(pipeline).to_list(length=None)
+        
+        next_cursor = None
+        if len(documents) > limit:
+            documents = documents[:limit]
+            next_cursor = encode_list_cursor(sort, descending, documents[-1])
+        return {
+            "organizations": [self._to_listing(document, fields) for document in documents],
+            "next_cursor": next_cursor
         }
     
+    async def export_organizations(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        prefix: Optional[str] = None,
+        sort: str = "_id",
+        descending: bool = False,
+        fields: Sequence[str] = LIST_FIELDS
+    ) -> AsyncIterator[dict]:
+        """
+        Stream up to ``limit`` matching organizations from a single server-side cursor.
+        
+        The cursor is checked before the stream is returned, so an invalid one
+        surfaces before a streaming response has started. Documents are
+        fetched in batches of ``ORG_EXPORT_BATCH_SIZE``, so memory stays
+        bounded by one batch however many organizations match. When more
+        organizations match, a final ``{"next_cursor": ...}`` row is yielded to
+        continue the export from.
+        
+        Raises:
+            HTTPException: 400 if the cursor is malformed or was issued for another sort
+        """
+        # Read one extra document to learn whether the export is truncated
+        pipeline = self._list_pipeline(prefix, sort, descending, cursor, fields, limit + 1)
+        
+        async def rows() -> AsyncIterator[dict]:
+            exported = 0
+            last = None
+            async for document in self.orgs_collection.aggregate(
+                pipeline, batchSize=settings.org_export_batch_size
+            ):
+                if exported == limit:
+                    yield {"next_cursor": encode_list_cursor(sort, descending, last)}
+                    return
+                exported += 1
+                last = document
+                yield self._to_listing(document, fields)
+        
+        return rows()
+    
+    @instrument("update_organization")
     async def update_organization(
         self,
         organization_name: str,
@@ -147,18 +744,11 @@ class OrganizationService:
             password: Admin password
             
         Returns:
-            Updated organization metadata dictionary
+            Updated organization metadata dictionary, or the job status when
+            the migration is deferred to a background job
         """
         # Get existing organization
-        org_data = await self.orgs_collection.find_one(
-            {"organization_name": organization_name}
-        )
-        
-        if not org_data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Organization '{organization_name}' not found"
-            )
+        org_data = await self._load_organization(organization_name)
         
         # Check if new name already exists (if different)
         if new_organization_name != organization_name:
@@ -172,9 +762,7 @@ class OrganizationService:
                 )
         
         # Verify admin credentials
-        admin_user = await self.users_collection.find_one(
-            {"_id": ObjectId(org_data["admin_user_id"])}
-        )
+        admin_user = org_data.get("admin")
         
         if not admin_user or admin_user["email"] != email:
             raise HTTPException(
@@ -182,98 +770,408 @@ class OrganizationService:
                 detail="Invalid admin credentials"
             )
         
-        if not verify_password(password, admin_user["password_hash"]):
+        if not await verify_password_async(password, admin_user["password_hash"]):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid admin credentials"
             )
         
-        # Handle collection migration only if organization name changes
-        if new_organization_name != organization_name:
-            # Get old collection
-            old_collection = get_organization_collection(organization_name)
+        # Large tenants are migrated by a background job
+        if new_organization_name != organization_name and await self._is_heavy(org_data):
+            job = await self.job_queue.enqueue(
+                "rename_organization",
+                tenant=str(org_data["_id"]),
+                payload={
+                    "organization_id": str(org_data["_id"]),
+                    "new_organization_name": new_organization_name
+                }
+            )
+            return serialize_job(job)
+        
+        return await self._rename_organization(org_data, new_organization_name)
+    
+    async def _rename_organization(
+        self,
+        org_data: dict,
+        new_organization_name: str,
+        progress_callback=None
+    ) -> dict:
+        """
+        Rename an organization, migrating its collection if the name changes
+        and its storage strategy is keyed by name.
+        
+        Args:
+            org_data: Joined organization record
+            new_organization_name: New organization name
+            progress_callback: Optional migration progress callback
             
+        Returns:
+            Updated organization metadata dictionary
+        """
+        organization_name = org_data["organization_name"]
+        storage = self.storage.for_organization(org_data)
+        
+        # A previous rename that stopped mid-migration is finished first
+        if org_data.get("migrating_from"):
+            await self._migrate_collection(
+                org_data["_id"], org_data["migrating_from"], org_data["collection_name"], progress_callback
+            )
+            if new_organization_name == organization_name:
+                return self._to_response(org_data)
+        
+        if new_organization_name != organization_name:
             # Create new collection name
             new_normalized_name = new_organization_name.lower().replace(' ', '_')
             new_collection_name = f"org_{new_normalized_name}"
-            new_collection = get_organization_collection(new_organization_name)
-            
-            # Migrate data from old collection to new collection
-            old_documents = await old_collection.find({}).to_list(length=None)
-            if old_documents:
-                # Remove _id fields for re-insertion
-                for doc in old_documents:
-                    doc.pop("_id", None)
-                await new_collection.insert_many(old_documents)
-            
-            # Delete old collection
-            await old_collection.drop()
         else:
             # Name hasn't changed, use existing collection name
             new_collection_name = org_data["collection_name"]
-        
-        # Update organization in master database
         update_data = {
             "organization_name": new_organization_name,
             "collection_name": new_collection_name,
             "updated_at": datetime.utcnow()
         }
+        # Names differing only in case or spaces vs underscores share a
+        # collection, so only a new collection name moves data
+        renames_collection = new_collection_name != org_data["collection_name"]
+        moves_data = renames_collection and storage.moves_on_rename
+        if moves_data:
+            update_data["migrating_from"] = org_data["collection_name"]
         
-        await self.orgs_collection.update_one(
-            {"_id": org_data["_id"]},
-            {"$set": update_data}
-        )
+        # Claim the new name before moving any data. The update only matches
+        # if nobody renamed or deleted the organization since it was loaded,
+        # and the unique indexes reject a name another request just took.
+        async def claim_name(session):
+            if renames_collection and await self.orgs_collection.find_one(
+                {"migrating_from": new_collection_name}, {"_id": 1}, session=session
+            ):
+                # Another rename is still moving data out of that collection
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Organization '{new_organization_name}' is being renamed, retry later"
+                )
+            try:
+                result = await self.orgs_collection.update_one(
+                    {
+                        "_id": org_data["_id"],
+                        "organization_name": organization_name,
+                        **IDLE_ORGANIZATION
+                    },
+                    {"$set": update_data},
+                    session=session
+                )
+            except DuplicateKeyError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Organization '{new_organization_name}' already exists"
+                ) from None
+            if result.matched_count == 0:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Organization '{organization_name}' was modified concurrently, retry the request"
+                )
+            await self.users_collection.update_one(
+                {"_id": ObjectId(org_data["admin_user_id"])},
+                {
+                    "$set": {
+                        "organization_name": new_organization_name,
+                        "updated_at": update_data["updated_at"]
+                    }
+                },
+                session=session
+            )
         
-        # Update admin user
-        await self.users_collection.update_one(
-            {"_id": ObjectId(org_data["admin_user_id"])},
-            {
-                "$set": {
-                    "organization_name": new_organization_name,
-                    "updated_at": datetime.utcnow()
-                }
-            }
-        )
+        await run_in_transaction(self.db, claim_name)
+        self.cache.invalidate(organization_name=organization_name, org_id=org_data["_id"])
+        
+        if new_organization_name != organization_name and self.existence_filter is not None:
+            self.existence_filter.add(organization_name=new_organization_name)
+            self.existence_filter.remove(organization_name=organization_name)
+        # Data only moves when the storage is named after the organization
+        if moves_data:
+            await self._migrate_collection(
+                org_data["_id"], org_data["collection_name"], new_collection_name, progress_callback
+            )
         
         return {
             "id": str(org_data["_id"]),
             "organization_name": new_organization_name,
             "collection_name": new_collection_name,
-            "admin_email": email,
+            "admin_email": org_data["admin"]["email"],
             "created_at": org_data["created_at"],
             "updated_at": update_data["updated_at"]
         }
     
-    async def delete_organization(
+    async def _migrate_collection(
         self,
-        organization_name: str,
-        admin_email: str
-    ) -> dict:
+        org_id: ObjectId,
+        source_name: str,
+        target_name: str,
+        progress_callback=None
+    ):
         """
-        Delete organization and its collection.
+        Move a renamed organization's data to its new collection.
+        
+        The organization document already names the target and records the
+        source in ``migrating_from``, which is cleared once the data has
+        moved. Until then the next rename finishes the migration first and a
+        delete drops both collections.
+        """
+        # Migrate data from old collection to new collection (drops the old one)
+        migrator = CollectionMigrator(self.db, progress_callback=progress_callback)
+        with component_timer("migration"):
+            await migrator.migrate(source_name, target_name)
+        await ensure_tenant_indexes(self.db[target_name])
+        await self.orgs_collection.update_one(
+            {"_id": org_id, "migrating_from": source_name},
+            {"$unset": {"migrating_from": ""}}
+        )
+        self.cache.invalidate(org_id=org_id)
+    
+    async def begin_storage_migration(self, organization_name: str, target: str) -> str:
+        """
+        Mark an organization as moving to another tenant storage strategy.
+        
+        Document reads and writes are refused with 409 from then on, so the
+        copy made by ``finish_storage_migration`` is complete once every
+        worker's cached record has expired.
         
         Args:
             organization_name: Name of the organization
-            admin_email: Admin email for verification
+            target: Name of the target storage strategy
             
         Returns:
-            Success message
+            The organization name
+            
+        Raises:
+            HTTPException: 404 if the organization does not exist, 409 if it is
+            being renamed, deleted or moved to a different strategy
         """
-        # Get organization
-        org_data = await self.orgs_collection.find_one(
-            {"organization_name": organization_name}
+        self.storage.get(target)
+        results = await self._fetch_organizations({"organization_name": organization_name})
+        if not results:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Organization '{organization_name}' not found"
+            )
+        org_data = results[0]
+        if org_data.get("storage_migration") == target:
+            # Claimed by an earlier run that did not finish
+            return organization_name
+        if self.storage.for_organization(org_data).name == target:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Organization '{organization_name}' already uses '{target}' storage"
+            )
+        result = await self.orgs_collection.update_one(
+            {
+                "_id": org_data["_id"],
+                "organization_name": organization_name,
+                **IDLE_ORGANIZATION
+            },
+            {"$set": {"storage_migration": target, "updated_at": datetime.utcnow()}}
+        )
+        if result.matched_count == 0:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Organization '{organization_name}' is being renamed, deleted or moved, retry later"
+            )
+        self.cache.invalidate(organization_name=organization_name, org_id=org_data["_id"])
+        return organization_name
+    
+    @instrument("migrate_tenant_storage")
+    async def finish_storage_migration(self, organization_name: str, progress_callback=None) -> dict:
+        """
+        Copy a claimed organization's documents to its target storage.
+        
+        The copy resumes where an interrupted run stopped, then a second
+        pass copies any source ``_id`` the target still lacks. The source is
+        only dropped once the target holds as many documents, and before the
+        organization switches strategy, so a crash in between leaves the
+        migration claimed and a re-run completes it.
+        
+        Args:
+            organization_name: Name of the organization
+            progress_callback: Optional callback receiving the documents copied
+            
+        Returns:
+            Dictionary with the organization name, its new ``storage`` and the
+            number of documents ``copied``
+            
+        Raises:
+            HTTPException: 409 if the organization has no storage migration in progress
+            RuntimeError: The copy is incomplete; the source is kept
+        """
+        org_data = await self.orgs_collection.find_one({"organization_name": organization_name})
+        if org_data is None or not org_data.get("storage_migration"):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Organization '{organization_name}' has no storage migration in progress"
+            )
+        source = self.storage.for_organization(org_data)
+        target = self.storage.get(org_data["storage_migration"], org_data.get("cluster"))
+        target_location = target.locate(org_data)
+        
+        source_location = source.locate(org_data)
+        await target.ensure_indexes(target_location)
+        with component_timer("migration"):
+            copied = await copy_tenant_documents(
+                source_location, target_location, progress_callback=progress_callback
+            )
+            # A resumed copy only continues past the target's highest _id,
+            # which skips documents whose _id has another BSON type
+            copied += await copy_missing_documents(
+                source_location, target_location, progress_callback=progress_callback
+            )
+        await check_copied(source_location, target_location)
+        await source.drop(org_data)
+        await self.orgs_collection.update_one(
+            {"_id": org_data["_id"], "storage_migration": target.name},
+            {
+                "$set": {"storage": target.name, "updated_at": datetime.utcnow()},
+                "$unset": {"storage_migration": ""}
+            }
         )
+        self.cache.invalidate(organization_name=organization_name, org_id=org_data["_id"])
+        return {"organization_name": organization_name, "storage": target.name, "copied": copied}
+    
+    @instrument("move_organization_cluster")
+    async def move_organization_cluster(
+        self,
+        organization_name: str,
+        target: str,
+        drain_seconds: Optional[float] = None,
+        progress_callback=None
+    ) -> dict:
+        """
+        Move an organization's documents to another tenant cluster while it keeps serving.
+        
+        The move is recorded in ``cluster_move`` and runs in phases, each
+        resumed by calling this again after an interruption:
         
-        if not org_data:
+        1. Copy every document to the target while reads and writes continue
+           on the source.
+        2. Freeze: writes are refused with 409. After ``drain_seconds`` every
+           worker's cached record shows the freeze, so the documents
+           inserted during the copy are caught up and the organization
+           switches to the target, remembering the source in ``moved_from``.
+        3. After another ``drain_seconds`` no worker still reads from the
+           source, which is then dropped.
+        
+        Args:
+            organization_name: Name of the organization
+            target: Name of the target cluster
+            drain_seconds: Wait for cached records to expire (defaults to the
+                metadata cache TTL)
+            progress_callback: Optional callback receiving the documents copied
+            
+        Returns:
+            Dictionary with the organization name, its new ``cluster`` and the
+            number of documents ``copied``
+        """
+        self.storage.get(self.storage.default.name, target)
+        if drain_seconds is None:
+            drain_seconds = settings.org_cache_ttl_seconds + 1
+        org_data = await self.orgs_collection.find_one({"organization_name": organization_name})
+        if org_data is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Organization '{organization_name}' not found"
             )
+        move = org_data.get("cluster_move")
+        if move is None and not org_data.get("moved_from"):
+            if (org_data.get("cluster") or DEFAULT_CLUSTER) == target:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Organization '{organization_name}' is already on cluster '{target}'"
+                )
+            move = {"target": target, "frozen": False}
+            result = await self.orgs_collection.update_one(
+                {"_id": org_data["_id"], "organization_name": organization_name, **IDLE_ORGANIZATION},
+                {"$set": {"cluster_move": move, "updated_at": datetime.utcnow()}}
+            )
+            if result.matched_count == 0:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Organization '{organization_name}' is being renamed, deleted or moved, retry later"
+                )
+        elif move is not None and move["target"] != target:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Organization '{organization_name}' is already moving to cluster '{move['target']}'"
+            )
         
-        # Verify admin user
-        admin_user = await self.users_collection.find_one(
-            {"_id": ObjectId(org_data["admin_user_id"])}
+        storage = self.storage.for_organization(org_data)
+        copied = 0
+        if move is not None:
+            source_location = storage.locate(org_data)
+            target_storage = self.storage.get(storage.name, target)
+            target_location = target_storage.locate(org_data)
+            if not move["frozen"]:
+                await target_storage.ensure_indexes(target_location)
+                with component_timer("migration"):
+                    copied += await copy_tenant_documents(
+                        source_location, target_location, progress_callback=progress_callback
+                    )
+                await self.orgs_collection.update_one(
+                    {"_id": org_data["_id"], "cluster_move.target": target},
+                    {"$set": {"cluster_move.frozen": True}}
+                )
+                self.cache.invalidate(organization_name=organization_name, org_id=org_data["_id"])
+            
+            await asyncio.sleep(drain_seconds)
+            with component_timer("migration"):
+                copied += await copy_missing_documents(
+                    source_location, target_location, progress_callback=progress_callback
+                )
+            await check_copied(source_location, target_location)
+            source_cluster = org_data.get("cluster") or DEFAULT_CLUSTER
+            await self.orgs_collection.update_one(
+                {"_id": org_data["_id"], "cluster_move.target": target},
+                {
+                    "$set": {"cluster": target, "moved_from": source_cluster, "updated_at": datetime.utcnow()},
+                    "$unset": {"cluster_move": ""}
+                }
+            )
+            self.cache.invalidate(organization_name=organization_name, org_id=org_data["_id"])
+            org_data = {**org_data, "cluster": target, "moved_from": source_cluster}
+        
+        # Workers with a cached record from before the switch may still read the source
+        await asyncio.sleep(drain_seconds)
+        await self.storage.get(storage.name, org_data["moved_from"]).drop(org_data)
+        await self.orgs_collection.update_one(
+            {"_id": org_data["_id"], "moved_from": org_data["moved_from"]},
+            {"$unset": {"moved_from": ""}}
         )
+        self.cache.invalidate(organization_name=organization_name, org_id=org_data["_id"])
+        return {"organization_name": organization_name, "cluster": org_data["cluster"], "copied": copied}
+    
+    @instrument("delete_organization")
+    async def delete_organization(
+        self,
+        organization_name: str,
+        admin_email: str
+    ) -> dict:
+        """
+        Delete an organization by tombstoning it.
+        
+        The organization and its admin disappear from reads at once; the
+        reaper drops the tenant's data and master documents once
+        ``TENANT_UNDELETE_WINDOW_SECONDS`` have passed, and until then
+        ``restore_organization`` brings everything back.
+        
+        Args:
+            organization_name: Name of the organization
+            admin_email: Admin email for verification
+            
+        Returns:
+            Success message with the time until which the organization can be restored
+        """
+        # Get organization
+        org_data = await self._load_organization(organization_name)
+        
+        # Verify admin user
+        admin_user = org_data.get("admin")
         
         if not admin_user or admin_user["email"] != admin_email:
             raise HTTPException(
@@ -281,17 +1179,225 @@ class OrganizationService:
                 detail="Unauthorized: Only the organization admin can delete"
             )
         
-        # Delete organization collection
-        org_collection = get_organization_collection(organization_name)
-        await org_collection.drop()
+        deleted_at = datetime.utcnow()
+        purge_after = deleted_at + timedelta(seconds=settings.tenant_undelete_window_seconds)
         
-        # Delete admin user
-        await self.users_collection.delete_one({"_id": ObjectId(org_data["admin_user_id"])})
+        async def tombstone(session):
+            result = await self.orgs_collection.update_one(
+                {
+                    "_id": org_data["_id"],
+                    "organization_name": organization_name,
+                    "deleting": {"$exists": False},
+                    # Wait for a cluster move, whose copy would outlive the purge
+                    "cluster_move": {"$exists": False},
+                    **NOT_DELETED
+                },
+                {"$set": {"deleted_at": deleted_at, "purge_after": purge_after, "updated_at": deleted_at}},
+                session=session
+            )
+            if result.matched_count == 0:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Organization '{organization_name}' was modified concurrently, retry the request"
+                )
+            await self.users_collection.update_one(
+                {"_id": ObjectId(org_data["admin_user_id"])},
+                {"$set": {"deleted_at": deleted_at}},
+                session=session
+            )
         
-        # Delete organization from master database
-        await self.orgs_collection.delete_one({"_id": org_data["_id"]})
+        await run_in_transaction(self.db, tombstone)
+        self.cache.invalidate(organization_name=organization_name, org_id=org_data["_id"])
         
         return {
-            "message": f"Organization '{organization_name}' deleted successfully"
+            "message": f"Organization '{organization_name}' deleted successfully",
+            "restorable_until": purge_after
         }
-
+    
+    @instrument("restore_organization")
+    async def restore_organization(self, organization_name: str, email: str, password: str) -> dict:
+        """
+        Undo the deletion of an organization within the undelete window.
+        
+        Args:
+            organization_name: Name of the deleted organization
+            email: Admin email
+            password: Admin password
+            
+        Returns:
+            Organization metadata dictionary
+            
+        Raises:
+            HTTPException: 404 if no such organization was deleted, 401 for
+            wrong credentials, 410 once the window has passed
+        """
+        results = await self._fetch_organizations(
+            {"organization_name": organization_name, "deleted_at": {"$exists": True}},
+            include_deleted=True
+        )
+        if not results:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No deleted organization '{organization_name}'"
+            )
+        org_data = results[0]
+        admin_user = org_data.get("admin")
+        if not admin_user or admin_user["email"] != email:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid admin credentials"
+            )
+        if not await verify_password_async(password, admin_user["password_hash"]):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid admin credentials"
+            )
+        
+        restored_at = datetime.utcnow()
+        
+        async def restore(session):
+            # Never matches once the reaper may have claimed the tombstone
+            result = await self.orgs_collection.update_one(
+                {"_id": org_data["_id"], "purge_after": {"$gt": restored_at}, "deleting": {"$exists": False}},
+                {
+                    "$set": {"updated_at": restored_at},
+                    "$unset": {"deleted_at": "", "purge_after": "", "reaping_until": ""}
+                },
+                session=session
+            )
+            if result.matched_count == 0:
+                raise HTTPException(
+                    status_code=status.HTTP_410_GONE,
+                    detail=f"Organization '{organization_name}' can no longer be restored"
+                )
+            await self.users_collection.update_one(
+                {"_id": ObjectId(org_data["admin_user_id"])},
+                {"$unset": {"deleted_at": ""}},
+                session=session
+            )
+        
+        await run_in_transaction(self.db, restore)
+        self.cache.invalidate(organization_name=organization_name, org_id=org_data["_id"])
+        return self._to_response({**org_data, "updated_at": restored_at})
+    
+    async def purge_organization(self, organization_id: ObjectId):
+        """
+        Drop a tombstoned organization's data and master documents.
+        
+        Called by the reaper after the undelete window; every step is
+        idempotent, so a purge interrupted by a crash is simply repeated.
+        """
+        results = await self._fetch_organizations({"_id": organization_id}, include_deleted=True)
+        if results:
+            await self._drop_organization(results[0])
+    
+    async def _drop_organization(self, org_data: dict):
+        """Drop an organization's data and its master documents."""
+        # Mark the organization first so a concurrent rename cannot move its
+        # data to a collection that is not dropped. The mark stays on retries.
+        current = await self.orgs_collection.find_one_and_update(
+            {
+                "_id": org_data["_id"],
+                "organization_name": org_data["organization_name"],
+                # Wait for a cluster move, whose copy would outlive the drop
+                "cluster_move": {"$exists": False}
+            },
+            {"$set": {"deleting": True, "updated_at": datetime.utcnow()}},
+            return_document=ReturnDocument.AFTER
+        )
+        if current is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Organization '{org_data['organization_name']}' was modified concurrently, retry the request"
+            )
+        
+        # Delete the tenant's documents (and the source of an unfinished
+        # rename or cluster move, or the target of an unfinished storage
+        # migration)
+        await self.storage.for_organization(current).drop(current)
+        if current.get("migrating_from"):
+            await self.db[current["migrating_from"]].drop()
+        if current.get("storage_migration"):
+            await self.storage.get(current["storage_migration"], current.get("cluster")).drop(current)
+        if current.get("moved_from"):
+            await self.storage.for_organization({**current, "cluster": current["moved_from"]}).drop(current)
+        
+        # Delete admin user and organization from master database
+        async def delete_documents(session):
+            await self.users_collection.delete_one(
+                {"_id": ObjectId(current["admin_user_id"])}, session=session
+            )
+            await self.orgs_collection.delete_one({"_id": current["_id"]}, session=session)
+        
+        await run_in_transaction(self.db, delete_documents)
+        self.cache.invalidate(organization_name=org_data["organization_name"], org_id=org_data["_id"])
+        if self.existence_filter is not None:
+            admin_user = org_data.get("admin")
+            self.existence_filter.remove(
+                organization_name=org_data["organization_name"],
+                email=admin_user["email"] if admin_user else None
+            )
+    
+    async def _is_heavy(self, org_data: dict) -> bool:
+        """Whether a tenant is large enough to be handled by a background job."""
+        if self.job_queue is None or self.job_queue.jobs is None:
+            return False
+        document_count = await self.storage.for_organization(org_data).count(org_data)
+        return document_count >= settings.job_background_threshold_docs
+    
+    async def is_organization_admin(self, organization_id: str, admin_user_id: str) -> bool:
+        """
+        Check that an admin administers the organization with this id.
+        
+        Args:
+            organization_id: Organization ObjectId as a string (a job's tenant)
+            admin_user_id: Id of the authenticated admin (the token subject)
+            
+        Returns:
+            False if the organization is gone or has another admin
+        """
+        try:
+            org_data = await self._load_organization_by_id(organization_id)
+        except LookupError:
+            return False
+        return org_data["admin_user_id"] == admin_user_id
+    
+    async def _load_organization_by_id(self, organization_id: str) -> dict:
+        """Load a joined organization record by its ObjectId."""
+        record = self.cache.get_by_id(organization_id)
+        if record is not None:
+            return record
+        results = await self._fetch_organizations({"_id": ObjectId(organization_id)})
+        if not results:
+            raise LookupError(f"Organization {organization_id} no longer exists")
+        self.cache.set(results[0])
+        return results[0]
+    
+    @instrument("rename_organization_job")
+    async def _run_rename_job(self, job: dict, report_progress) -> dict:
+        """Job handler for background organization renames."""
+        payload = job["payload"]
+        org_data = await self._load_organization_by_id(payload["organization_id"])
+        new_organization_name = payload["new_organization_name"]
+        if new_organization_name != org_data["organization_name"]:
+            existing_org = await self.orgs_collection.find_one(
+                {"organization_name": new_organization_name}
+            )
+            if existing_org:
+                raise ValueError(f"Organization '{new_organization_name}' already exists")
+        result = await self._rename_organization(org_data, new_organization_name, report_progress)
+        return {
+            "organization_name": result["organization_name"],
+            "collection_name": result["collection_name"]
+        }
+    
+    @instrument("delete_organization_job")
+    async def _run_delete_job(self, job: dict, report_progress) -> dict:
+        """Job handler for background deletes queued before deletes became tombstones."""
+        try:
+            org_data = await self._load_organization_by_id(job["payload"]["organization_id"])
+        except LookupError:
+            # Already deleted by an earlier attempt
+            return {"deleted": True}
+        await self._drop_organization(org_data)
+        return {"deleted": True}
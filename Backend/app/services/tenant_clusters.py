@@ -0,0 +1,155 @@
+"""
+Tenant placement across MongoDB clusters.
+
+Tenant data can live on several deployments: the master database's own
+(``default``) plus the ones named in ``TENANT_CLUSTERS``, each with its own
+pooled client. The ``cluster`` field of an organization's master document
+records where it lives; organizations without one are on ``default``. New
+organizations are placed by ``TENANT_PLACEMENT``:
+
+* ``least_loaded``: the open cluster holding the fewest organizations;
+* ``round_robin``: the open clusters in turn;
+* a cluster name: always that cluster.
+
+Only clusters listed in ``TENANT_PLACEMENT_CLUSTERS`` (all when empty) are
+open to new tenants, so a cluster can be reserved for tenants moved there on
+purpose. Organizations are moved between clusters online with the CLI:
+
+    python -m app.services.tenant_clusters --status
+    python -m app.services.tenant_clusters --move "Acme Corp" --to dedicated
+"""
+import argparse
+import asyncio
+import itertools
+import time
+from typing import Dict, List, Optional
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+from app.config import settings
+from app.database import DEFAULT_CLUSTER
+from app.metrics import registry
+
+PLACEMENT_POLICIES = ("least_loaded", "round_robin")
+
+CLUSTER_ORGANIZATIONS = registry.gauge(
+    "tenant_cluster_organizations",
+    "Organizations placed on each tenant cluster, as of the last refresh.",
+    ("cluster",)
+)
+
+
+class ClusterRouter:
+    """Maps organizations to tenant clusters and places new ones."""
+    
+    def __init__(
+        self,
+        databases: Dict[str, AsyncIOMotorDatabase],
+        orgs_collection: AsyncIOMotorCollection,
+        policy: Optional[str] = None,
+        placement_clusters: Optional[List[str]] = None,
+        refresh_seconds: Optional[float] = None
+    ):
+        if DEFAULT_CLUSTER not in databases:
+            raise ValueError(f"The '{DEFAULT_CLUSTER}' cluster is required")
+        self.databases = databases
+        self.orgs_collection = orgs_collection
+        self.policy = policy or settings.tenant_placement
+        self.placement_clusters = placement_clusters or [
+            name.strip() for name in settings.tenant_placement_clusters.split(",") if name.strip()
+        ] or list(databases)
+        self.refresh_seconds = (
+            refresh_seconds if refresh_seconds is not None else settings.tenant_placement_refresh_seconds
+        )
+        for name in self.placement_clusters:
+            self.database(name)
+        if self.policy not in PLACEMENT_POLICIES:
+            self.database(self.policy)
+        self._round_robin = itertools.cycle(self.placement_clusters)
+        self._loads: Dict[str, int] = {}
+        self._loads_at: Optional[float] = None
+    
+    def database(self, cluster: Optional[str]) -> AsyncIOMotorDatabase:
+        """The tenant database on a cluster (``default`` when None)."""
+        try:
+            return self.databases[cluster or DEFAULT_CLUSTER]
+        except KeyError:
+            raise ValueError(
+                f"Unknown tenant cluster '{cluster}'; configured: {sorted(self.databases)}"
+            ) from None
+    
+    async def loads(self) -> Dict[str, int]:
+        """Organizations per cluster, recounted every ``TENANT_PLACEMENT_REFRESH_SECONDS``."""
+        now = time.monotonic()
+        if self._loads_at is None or now - self._loads_at >= self.refresh_seconds:
+            counts = {name: 0 for name in self.databases}
+            async for row in self.orgs_collection.aggregate([
+                {"$group": {"_id": {"$ifNull": ["$cluster", DEFAULT_CLUSTER]}, "count": {"$sum": 1}}}
+            ]):
+                counts[row["_id"]] = row["count"]
+            for name, count in counts.items():
+                CLUSTER_ORGANIZATIONS.set(count, name)
+            self._loads = counts
+            self._loads_at = now
+        return self._loads
+    
+    async def place(self) -> str:
+        """Pick the cluster for a new organization."""
+        if self.policy == "round_robin":
+            return next(self._round_robin)
+        if self.policy == "least_loaded":
+            loads = await self.loads()
+            cluster = min(self.placement_clusters, key=lambda name: loads.get(name, 0))
+            # Count the placement until the next refresh so bursts spread out
+            loads[cluster] = loads.get(cluster, 0) + 1
+            return cluster
+        return self.policy
+
+
+async def _run_cli(args) -> int:
+    from app.database import close_mongo_connection, connect_to_mongo, get_cluster_databases, get_database
+    from app.services.organization_service import OrganizationService
+    from app.services.tenant_storage import TenantStorageRouter
+    
+    await connect_to_mongo()
+    try:
+        database = get_database()
+        clusters = ClusterRouter(get_cluster_databases(), database["organizations"])
+        if args.status:
+            for name, count in sorted((await clusters.loads()).items()):
+                marker = "" if name in clusters.placement_clusters else "  (closed to new tenants)"
+                print(f"{name:<20} {count:>8} organizations{marker}")
+            return 0
+        
+        service = OrganizationService(database, storage=TenantStorageRouter(database, clusters=clusters))
+        
+        def progress(copied: int):
+            print(f"  {copied} documents copied")
+        
+        try:
+            result = await service.move_organization_cluster(
+                args.move, args.to, drain_seconds=args.drain_seconds, progress_callback=progress
+            )
+        except Exception as exc:
+            print(f"{args.move}: failed ({getattr(exc, 'detail', exc)}); re-run to resume")
+            return 1
+        print(f"{args.move}: {result['copied']} documents moved to cluster '{result['cluster']}'")
+        return 0
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect tenant clusters and move organizations between them")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--status", action="store_true", help="Organizations per cluster")
+    group.add_argument("--move", metavar="ORGANIZATION", help="Organization to move")
+    parser.add_argument("--to", help="Target cluster for --move")
+    parser.add_argument(
+        "--drain-seconds",
+        type=float,
+        default=settings.org_cache_ttl_seconds + 1,
+        help="Wait for cached metadata to expire around the switch (defaults to the cache TTL)"
+    )
+    args = parser.parse_args()
+    if args.move and not args.to:
+        parser.error("--move requires --to")
+    raise SystemExit(asyncio.run(_run_cli(args)))
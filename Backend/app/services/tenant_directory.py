@@ -0,0 +1,344 @@
+"""
+Per-worker in-memory directory of organizations and admin users.
+
+Each worker loads the ``organizations`` and ``admin_users`` master
+collections at startup, streaming a projection, and answers organization
+and login lookups from memory. It follows the writes of every worker:
+
+* on a replica set, with a change stream on the two collections. The resume
+  token of the last applied change is kept, so a stream that fails is
+  reopened where it stopped; if the oplog no longer reaches back that far,
+  the directory is reloaded instead;
+* on a standalone server, by reloading both collections every
+  ``TENANT_DIRECTORY_POLL_SECONDS`` and swapping in the difference.
+
+``TENANT_DIRECTORY_SYNC`` selects ``change_stream``, ``poll`` or ``auto``
+(a change stream when the server offers one).
+
+Lookups the directory cannot vouch for fall through to MongoDB: names and
+emails it does not hold, every lookup while it is loading or its stream is
+down, and organizations this worker changed itself until the directory has
+caught up with that write. So a worker always reads its own writes, and
+sees other workers' writes as soon as they reach the stream (or the next
+poll). A write counts as caught up once the stream applies an event at or
+past the write's operation time (or goes idle), or a poll that started after
+it completes.
+"""
+import asyncio
+import time
+from typing import Dict, Optional, Tuple
+from bson import Timestamp
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import OperationFailure
+from app.config import settings
+from app.db_metrics import ClusterTimeListener
+from app.metrics import registry
+from app.services.organization_service import NOT_DELETED, ORGANIZATION_PROJECTION
+
+SYNC_MODES = ("auto", "change_stream", "poll")
+
+WATCHED_COLLECTIONS = ["organizations", "admin_users"]
+
+# The organization/admin join without the join itself
+ORGANIZATION_FIELDS = {field: 1 for field in ORGANIZATION_PROJECTION if field != "admin"}
+USER_FIELDS = {"email": 1, "password_hash": 1, "organization_name": 1, "deleted_at": 1}
+
+# Changes that do not describe a single document; the directory reloads
+APPLIED_OPERATIONS = ("insert", "update", "replace", "delete")
+
+# ChangeStreamFatalError and ChangeStreamHistoryLost: the token is too old
+RESUME_FAILED = (280, 286)
+
+STREAM_RETRY_SECONDS = 1.0
+
+# How long an idle getMore waits for changes
+STREAM_AWAIT_MS = 500
+
+DIRECTORY_ORGANIZATIONS = registry.gauge(
+    "tenant_directory_organizations",
+    "Organizations held in this worker's tenant directory."
+)
+DIRECTORY_CHANGES = registry.counter(
+    "tenant_directory_changes_total",
+    "Organization and admin changes applied to the tenant directory, by source.",
+    ("source",)
+)
+DIRECTORY_RELOADS = registry.counter(
+    "tenant_directory_reloads_total",
+    "Full loads of the tenant directory, by reason.",
+    ("reason",)
+)
+
+
+def _project(document: dict, fields: dict) -> dict:
+    projected = {"_id": document["_id"]}
+    projected.update((field, document[field]) for field in fields if field in document)
+    return projected
+
+
+def _diff(old: dict, new: dict) -> int:
+    """Number of keys added, removed or changed between two snapshots."""
+    return len(old.keys() ^ new.keys()) + sum(1 for key in old.keys() & new.keys() if old[key] != new[key])
+
+
+class TenantDirectory:
+    """
+    Every live organization and admin user, kept coherent across workers.
+    
+    Answers the lookups of ``OrganizationCache`` (``get_by_name``,
+    ``get_by_id``, ``set``, ``invalidate``), so it is handed to
+    ``OrganizationService`` in place of the cache, and ``admin_by_email`` for
+    logins. Returned records are shared and must be treated as read-only.
+    """
+    
+    def __init__(
+        self,
+        database: AsyncIOMotorDatabase,
+        sync: Optional[str] = None,
+        poll_seconds: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        cluster_clock: Optional[ClusterTimeListener] = None
+    ):
+        self.db = database
+        # Operation times of the client that writes the master collections
+        self.cluster_clock = cluster_clock
+        self.orgs_collection = database["organizations"]
+        self.users_collection = database["admin_users"]
+        self.sync = sync or settings.tenant_directory_sync
+        if self.sync not in SYNC_MODES:
+            raise ValueError(f"Unknown tenant directory sync '{self.sync}'; use one of {SYNC_MODES}")
+        self.poll_seconds = poll_seconds if poll_seconds is not None else settings.tenant_directory_poll_seconds
+        self.batch_size = batch_size or settings.tenant_directory_batch_size
+        # The mode in use once started: change_stream or poll
+        self.mode: Optional[str] = None
+        self.ready = False
+        self.resume_token: Optional[dict] = None
+        self.hits = 0
+        self.misses = 0
+        self._organizations: Dict[str, dict] = {}
+        self._ids_by_name: Dict[str, str] = {}
+        self._users: Dict[str, dict] = {}
+        self._user_ids_by_email: Dict[str, str] = {}
+        # Names and ids this worker changed, with the monotonic time of the
+        # change and the operation time it was acknowledged at (if known)
+        self._changed: Dict[str, Tuple[float, Optional[Timestamp]]] = {}
+        self._task: Optional[asyncio.Task] = None
+    
+    async def start(self):
+        """Load the directory and start following changes."""
+        self.mode = "poll" if self.sync == "poll" else "change_stream"
+        if self.mode == "change_stream":
+            try:
+                self.resume_token = await self._current_token()
+            except OperationFailure as exc:
+                if self.sync == "change_stream":
+                    raise
+                print(f"Tenant directory falls back to polling, no change stream: {exc}")
+                self.mode = "poll"
+        await self.reload("startup")
+        self.ready = True
+        self._task = asyncio.create_task(self._follow() if self.mode == "change_stream" else self._poll())
+    
+    async def stop(self):
+        self.ready = False
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+    
+    async def reload(self, reason: str) -> int:
+        """
+        Replace the directory with a fresh load of both collections.
+        
+        Returns:
+            Number of organizations and users that changed
+        """
+        started = time.monotonic()
+        organizations: Dict[str, dict] = {}
+        async for org in self.orgs_collection.find(NOT_DELETED, ORGANIZATION_FIELDS, batch_size=self.batch_size):
+            organizations[str(org["_id"])] = org
+        users: Dict[str, dict] = {}
+        async for user in self.users_collection.find({}, USER_FIELDS, batch_size=self.batch_size):
+            users[str(user["_id"])] = user
+        
+        changed = _diff(self._organizations, organizations) + _diff(self._users, users)
+        self._organizations = organizations
+        self._ids_by_name = {org["organization_name"]: org_id for org_id, org in organizations.items()}
+        self._users = users
+        self._user_ids_by_email = {user["email"]: user_id for user_id, user in users.items()}
+        DIRECTORY_ORGANIZATIONS.set(len(organizations))
+        DIRECTORY_RELOADS.inc(reason)
+        self._caught_up(started)
+        return changed
+    
+    def _caught_up(self, as_of: float):
+        """Every write acknowledged before the monotonic time ``as_of`` is now reflected."""
+        if self._changed:
+            self._changed = {key: mark for key, mark in self._changed.items() if mark[0] >= as_of}
+    
+    def _passed(self, cluster_time: Timestamp):
+        """Every write up to the operation time ``cluster_time`` is now reflected."""
+        if self._changed:
+            self._changed = {
+                key: mark for key, mark in self._changed.items()
+                if mark[1] is None or mark[1] > cluster_time
+            }
+    
+    async def _poll(self):
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            try:
+                DIRECTORY_CHANGES.inc("poll", amount=await self.reload("poll"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                print(f"Tenant directory poll failed: {exc}")
+    
+    def _watch(self, resume_after: Optional[dict] = None):
+        return self.db.watch(
+            [{"$match": {"ns.coll": {"$in": WATCHED_COLLECTIONS}}}],
+            full_document="updateLookup",
+            resume_after=resume_after,
+            max_await_time_ms=STREAM_AWAIT_MS
+        )
+    
+    async def _current_token(self) -> dict:
+        """A resume token for the present; a load that follows sees everything before it."""
+        async with self._watch() as stream:
+            await stream.try_next()
+            return stream.resume_token
+    
+    async def _resync(self, reason: str):
+        self.ready = False
+        self.resume_token = await self._current_token()
+        await self.reload(reason)
+        self.ready = True
+    
+    async def _follow(self):
+        while True:
+            try:
+                async with self._watch(self.resume_token) as stream:
+                    while True:
+                        requested = time.monotonic()
+                        change = await stream.try_next()
+                        self.ready = True
+                        if change is None:
+                            self._caught_up(requested)
+                        elif self._apply(change):
+                            self._passed(change["clusterTime"])
+                        else:
+                            break
+                        self.resume_token = stream.resume_token
+                await self._resync("invalidated")
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self.ready = False
+                print(f"Tenant directory change stream failed: {exc}")
+                await asyncio.sleep(STREAM_RETRY_SECONDS)
+                if isinstance(exc, OperationFailure) and exc.code in RESUME_FAILED:
+                    try:
+                        await self._resync("history_lost")
+                    except Exception as reload_exc:
+                        print(f"Tenant directory reload failed: {reload_exc}")
+    
+    def _apply(self, change: dict) -> bool:
+        """Apply one change event; False if the directory has to be reloaded."""
+        if change["operationType"] not in APPLIED_OPERATIONS:
+            return False
+        key = str(change["documentKey"]["_id"])
+        # Absent for deletes, and for updates to documents deleted since
+        document = change.get("fullDocument")
+        if change["ns"]["coll"] == "organizations":
+            self._remove_organization(key)
+            if document is not None and "deleted_at" not in document:
+                org = _project(document, ORGANIZATION_FIELDS)
+                self._organizations[key] = org
+                self._ids_by_name[org["organization_name"]] = key
+            DIRECTORY_ORGANIZATIONS.set(len(self._organizations))
+        else:
+            self._remove_user(key)
+            if document is not None:
+                user = _project(document, USER_FIELDS)
+                self._users[key] = user
+                self._user_ids_by_email[user["email"]] = key
+        DIRECTORY_CHANGES.inc("change_stream")
+        return True
+    
+    def _remove_organization(self, org_id: str):
+        org = self._organizations.pop(org_id, None)
+        if org is not None and self._ids_by_name.get(org["organization_name"]) == org_id:
+            del self._ids_by_name[org["organization_name"]]
+    
+    def _remove_user(self, user_id: str):
+        user = self._users.pop(user_id, None)
+        if user is not None and self._user_ids_by_email.get(user["email"]) == user_id:
+            del self._user_ids_by_email[user["email"]]
+    
+    def _record(self, org_id: Optional[str]) -> Optional[dict]:
+        org = self._organizations.get(org_id) if self.ready and org_id else None
+        if org is None or org_id in self._changed or org["organization_name"] in self._changed:
+            self.misses += 1
+            return None
+        self.hits += 1
+        admin = self._users.get(org["admin_user_id"])
+        if admin is None:
+            return org
+        return {**org, "admin": {"_id": admin["_id"], "email": admin["email"], "password_hash": admin["password_hash"]}}
+    
+    def get_by_name(self, organization_name: str) -> Optional[dict]:
+        """Return the joined record for an organization name, if the directory vouches for it."""
+        if organization_name in self._changed:
+            self.misses += 1
+            return None
+        return self._record(self._ids_by_name.get(organization_name))
+    
+    def get_by_id(self, org_id) -> Optional[dict]:
+        """Return the joined record for an organization ObjectId, if the directory vouches for it."""
+        return self._record(str(org_id))
+    
+    def admin_by_email(self, email: str) -> Optional[dict]:
+        """
+        Return the admin user with this email, if the directory vouches for it.
+        
+        Admins of deleted organizations, or of organizations this worker has
+        just changed, are left to MongoDB.
+        """
+        user_id = self._user_ids_by_email.get(email) if self.ready else None
+        user = self._users.get(user_id) if user_id else None
+        if user is None or user.get("deleted_at"):
+            self.misses += 1
+            return None
+        org = self._record(self._ids_by_name.get(user["organization_name"]))
+        if org is None or org["admin_user_id"] != user_id:
+            return None
+        return user
+    
+    def set(self, record: dict):
+        """
+        Ignore a record read from MongoDB.
+        
+        The directory only takes state from its change stream or poll, which
+        apply writes in order, so it never goes back in time.
+        """
+    
+    def invalidate(self, organization_name: Optional[str] = None, org_id=None):
+        """Leave an organization to MongoDB until the directory has caught up with this worker's write."""
+        # Called once the write is acknowledged, so the clock is at or past it
+        mark = (time.monotonic(), self.cluster_clock.latest if self.cluster_clock is not None else None)
+        if organization_name is not None:
+            self._changed[organization_name] = mark
+        if org_id is not None:
+            self._changed[str(org_id)] = mark
+    
+    def stats(self) -> dict:
+        """Return size and hit/miss counters."""
+        return {
+            "mode": self.mode,
+            "ready": self.ready,
+            "organizations": len(self._organizations),
+            "admin_users": len(self._users),
+            "pending": len(self._changed),
+            "hits": self.hits,
+            "misses": self.misses
+        }
@@ -0,0 +1,116 @@
+"""
+Background purge of deleted organizations.
+
+Deleting an organization only tombstones it. Every worker runs a reaper that
+claims tombstones whose undelete window has passed, one at a time, and
+purges them: tenant data first, then the admin user and the organization
+document. Purges are throttled to ``TENANT_REAPER_DROPS_PER_MINUTE`` with a
+token bucket in the ``rate_limits`` collection, independent of
+``RATE_LIMIT_BACKEND``, so the budget is shared by all workers and dropping
+many large tenants never stacks up catalog locks.
+
+A claim is a lease (``reaping_until``) on the organization document. If a
+worker dies mid-purge the lease expires and another reaper repeats the
+purge, whose steps are all idempotent.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Optional
+from pymongo import ReturnDocument
+from app.config import settings
+from app.metrics import registry
+from app.rate_limit import MongoBackend, RateLimitBackend, Rule
+from app.services.organization_service import OrganizationService
+
+REAPER_PURGES = registry.counter(
+    "tenant_reaper_purges_total",
+    "Deleted organizations purged by the reaper, by outcome.",
+    ("result",)
+)
+
+THROTTLE_KEY = "tenant_reaper"
+
+
+class TenantReaper:
+    """Purges tombstoned organizations after their undelete window."""
+    
+    def __init__(
+        self,
+        organization_service: OrganizationService,
+        backend: Optional[RateLimitBackend] = None,
+        drops_per_minute: Optional[float] = None,
+        poll_seconds: Optional[float] = None,
+        lease_seconds: Optional[float] = None
+    ):
+        self.organization_service = organization_service
+        self.orgs_collection = organization_service.orgs_collection
+        # Per-worker buckets would multiply the budget by the number of workers
+        self.backend = backend if backend is not None else MongoBackend(organization_service.db)
+        drops_per_minute = drops_per_minute or settings.tenant_reaper_drops_per_minute
+        # Bursts of at most one drop: the budget is spread evenly over the minute
+        self.rule = Rule(1, 60 / drops_per_minute)
+        self.poll_seconds = poll_seconds if poll_seconds is not None else settings.tenant_reaper_poll_seconds
+        # A lease must outlast the wait for the throttle
+        self.lease_seconds = max(lease_seconds or settings.tenant_reaper_lease_seconds, 2 * self.rule.period)
+        self._task: Optional[asyncio.Task] = None
+    
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+    
+    async def _run(self):
+        while True:
+            try:
+                purged = await self.reap_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                print(f"Tenant reaper failed: {exc}")
+                purged = False
+            if not purged:
+                await asyncio.sleep(self.poll_seconds)
+    
+    async def _claim(self) -> Optional[dict]:
+        """Lease the tombstone that has been due the longest."""
+        now = datetime.utcnow()
+        return await self.orgs_collection.find_one_and_update(
+            {
+                "purge_after": {"$lte": now},
+                "$or": [{"reaping_until": {"$exists": False}}, {"reaping_until": {"$lt": now}}]
+            },
+            {"$set": {"reaping_until": now + timedelta(seconds=self.lease_seconds)}},
+            projection={"organization_name": 1},
+            sort=[("purge_after", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+    
+    async def reap_once(self) -> bool:
+        """
+        Purge one due organization, waiting for the throttle first.
+        
+        Returns:
+            Whether an organization was claimed
+        """
+        org_data = await self._claim()
+        if org_data is None:
+            return False
+        # The lease outlasts the wait, so no other reaper takes the tombstone meanwhile
+        while True:
+            wait = await self.backend.acquire(THROTTLE_KEY, self.rule)
+            if not wait:
+                break
+            await asyncio.sleep(wait)
+        try:
+            await self.organization_service.purge_organization(org_data["_id"])
+        except Exception:
+            REAPER_PURGES.inc("failed")
+            raise
+        REAPER_PURGES.inc("purged")
+        print(f"Purged deleted organization '{org_data['organization_name']}'")
+        return True
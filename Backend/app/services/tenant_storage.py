@@ -0,0 +1,458 @@
+"""
+Tenant storage strategies.
+
+Where an organization's documents live is decided by the strategy named in
+its ``storage`` field (organizations created before strategies existed have
+none and use ``collection``):
+
+* ``collection``: one ``org_<name>`` collection per tenant in the master
+  database, the original layout;
+* ``database``: one database per tenant, named after the organization id,
+  holding a ``documents`` collection;
+* ``shared``: every tenant in one ``tenant_documents`` collection, scoped by
+  a ``tenant_id`` field that leads every index. Stored ``_id``s are
+  ``{tenant_id, id}`` documents so that tenants can reuse each other's ids.
+
+Each strategy is applied on the organization's tenant cluster (see
+``app.services.tenant_clusters``). ``collection_name`` remains each
+organization's unique logical name under every strategy. New organizations use ``TENANT_STORAGE_STRATEGY``; existing
+ones are moved between strategies with the CLI:
+
+    python -m app.services.tenant_storage --to shared
+    python -m app.services.tenant_storage --to database --organization "Acme Corp"
+"""
+import argparse
+import asyncio
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from bson import ObjectId, json_util
+from pymongo.errors import BulkWriteError
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+from app.config import settings
+from app.database import DEFAULT_CLUSTER
+from app.indexes import SHARED_TENANT_COLLECTION, ensure_shared_tenant_indexes, ensure_tenant_indexes
+from app.services.migration import DUPLICATE_KEY
+from app.services.tenant_clusters import ClusterRouter
+
+TENANT_DATABASE_COLLECTION = "documents"
+
+
+class TenantLocation:
+    """One tenant's documents: a collection plus the filter scoping it to the tenant."""
+    
+    __slots__ = ("collection", "scope")
+    
+    # Stored field holding the ``_id`` clients see, used for sorting
+    key = "_id"
+    
+    def __init__(self, collection: AsyncIOMotorCollection, scope: Optional[dict] = None):
+        self.collection = collection
+        self.scope = scope or {}
+    
+    def query(self, query: dict) -> dict:
+        """Restrict a filter to this tenant."""
+        if not self.scope:
+            return query
+        return {"$and": [self.scope, query]} if query else dict(self.scope)
+    
+    def prepare(self, document: dict) -> dict:
+        """Tag a document for insertion into this tenant's storage."""
+        document.update(self.scope)
+        return document
+    
+    def strip(self, document: dict) -> dict:
+        """Remove the scoping fields from a document read from this storage."""
+        for field in self.scope:
+            document.pop(field, None)
+        return document
+    
+    def document_id(self, stored_id: Any) -> Any:
+        """The ``_id`` clients see for a stored ``_id``."""
+        return stored_id
+
+
+class SharedTenantLocation(TenantLocation):
+    """
+    A tenant in the shared collection.
+    
+    ``_id`` is unique across the whole collection, so documents are stored
+    under ``{"tenant_id": <organization id>, "id": <client _id>}``. Filters on
+    ``_id`` are rewritten to ``_id.id`` (at the top level and inside
+    ``$and``/``$or``/``$nor``) and the client ``_id`` is restored on the way out.
+    """
+    
+    __slots__ = ()
+    
+    key = "_id.id"
+    
+    def query(self, query: dict) -> dict:
+        return super().query(self._rewrite(query))
+    
+    def _rewrite(self, query: dict) -> dict:
+        rewritten = {}
+        for field, value in query.items():
+            if field == "_id":
+                field = self.key
+            elif field in ("$and", "$or", "$nor") and isinstance(value, list):
+                value = [self._rewrite(item) if isinstance(item, dict) else item for item in value]
+            rewritten[field] = value
+        return rewritten
+    
+    def prepare(self, document: dict) -> dict:
+        document["_id"] = {"tenant_id": self.scope["tenant_id"], "id": document.get("_id", ObjectId())}
+        return super().prepare(document)
+    
+    def strip(self, document: dict) -> dict:
+        if "_id" in document:
+            document["_id"] = self.document_id(document["_id"])
+        return super().strip(document)
+    
+    def document_id(self, stored_id: Any) -> Any:
+        return stored_id["id"]
+
+
+class TenantStorage:
+    """A way of laying out tenant documents in MongoDB."""
+    
+    name = ""
+    # Whether renaming an organization has to move its documents
+    moves_on_rename = False
+    
+    def __init__(self, database: AsyncIOMotorDatabase):
+        self.db = database
+    
+    def locate(self, org_data: dict) -> TenantLocation:
+        raise NotImplementedError
+    
+    async def ensure_indexes(self, location: TenantLocation):
+        await ensure_tenant_indexes(location.collection)
+    
+    async def initialize(self, org_data: dict):
+        """Create a new tenant's storage with its seed document and indexes."""
+        location = self.locate(org_data)
+        # Initialize with a basic schema/document
+        await location.collection.insert_one(location.prepare({
+            "organization_name": org_data["organization_name"],
+            "created_at": datetime.utcnow(),
+            "initialized": True
+        }))
+        await self.ensure_indexes(location)
+    
+    async def count(self, org_data: dict) -> int:
+        """Approximate number of documents the tenant holds."""
+        return await self.locate(org_data).collection.estimated_document_count()
+    
+    async def drop(self, org_data: dict):
+        """Delete all of a tenant's documents."""
+        await self.locate(org_data).collection.drop()
+
+
+class CollectionPerTenant(TenantStorage):
+    """One collection per tenant in the master database."""
+    
+    name = "collection"
+    moves_on_rename = True
+    
+    def locate(self, org_data: dict) -> TenantLocation:
+        return TenantLocation(self.db[org_data["collection_name"]])
+
+
+class DatabasePerTenant(TenantStorage):
+    """One database per tenant, named after the organization id so renames are free."""
+    
+    name = "database"
+    
+    def __init__(self, database: AsyncIOMotorDatabase, prefix: Optional[str] = None):
+        super().__init__(database)
+        self.prefix = prefix or settings.tenant_database_prefix
+    
+    def database_name(self, org_data: dict) -> str:
+        return f"{self.prefix}{org_data['_id']}"
+    
+    def locate(self, org_data: dict) -> TenantLocation:
+        return TenantLocation(self.db.client[self.database_name(org_data)][TENANT_DATABASE_COLLECTION])
+    
+    async def drop(self, org_data: dict):
+        await self.db.client.drop_database(self.database_name(org_data))
+
+
+class SharedCollection(TenantStorage):
+    """All tenants in one collection, keyed by ``tenant_id`` (the organization id)."""
+    
+    name = "shared"
+    
+    def __init__(self, database: AsyncIOMotorDatabase):
+        super().__init__(database)
+        self._indexes_ready = False
+    
+    def locate(self, org_data: dict) -> TenantLocation:
+        return SharedTenantLocation(self.db[SHARED_TENANT_COLLECTION], {"tenant_id": org_data["_id"]})
+    
+    async def ensure_indexes(self, location: TenantLocation):
+        # The indexes are shared by every tenant, so they are ensured once per process
+        if not self._indexes_ready:
+            await ensure_shared_tenant_indexes(location.collection)
+            self._indexes_ready = True
+    
+    async def count(self, org_data: dict) -> int:
+        location = self.locate(org_data)
+        return await location.collection.count_documents(location.scope)
+    
+    async def drop(self, org_data: dict):
+        location = self.locate(org_data)
+        await location.collection.delete_many(location.scope)
+
+
+STRATEGIES = {strategy.name: strategy for strategy in (CollectionPerTenant, DatabasePerTenant, SharedCollection)}
+
+
+class TenantStorageRouter:
+    """Picks the storage strategy and cluster of each organization."""
+    
+    def __init__(
+        self,
+        database: AsyncIOMotorDatabase,
+        default: Optional[str] = None,
+        database_prefix: Optional[str] = None,
+        clusters: Optional[ClusterRouter] = None
+    ):
+        self.database = database
+        self.database_prefix = database_prefix
+        self.clusters = clusters
+        self._strategies: Dict[Tuple[str, str], TenantStorage] = {}
+        self.default = self.get(default or settings.tenant_storage_strategy)
+    
+    def get(self, name: str, cluster: Optional[str] = None) -> TenantStorage:
+        """The named strategy on a cluster (``default`` when None)."""
+        cluster = cluster or DEFAULT_CLUSTER
+        strategy = self._strategies.get((cluster, name))
+        if strategy is None:
+            if name not in STRATEGIES:
+                raise ValueError(
+                    f"Unknown tenant storage strategy '{name}'; choose from {sorted(STRATEGIES)}"
+                )
+            if self.clusters is not None:
+                database = self.clusters.database(cluster)
+            elif cluster == DEFAULT_CLUSTER:
+                database = self.database
+            else:
+                raise ValueError(f"Unknown tenant cluster '{cluster}'; no tenant clusters are configured")
+            if name == DatabasePerTenant.name:
+                strategy = DatabasePerTenant(database, self.database_prefix)
+            else:
+                strategy = STRATEGIES[name](database)
+            self._strategies[(cluster, name)] = strategy
+        return strategy
+    
+    def for_organization(self, org_data: dict) -> TenantStorage:
+        return self.get(org_data.get("storage") or CollectionPerTenant.name, org_data.get("cluster"))
+    
+    async def place(self) -> str:
+        """Pick the cluster for a new organization."""
+        if self.clusters is None:
+            return DEFAULT_CLUSTER
+        return await self.clusters.place()
+
+
+async def copy_tenant_documents(
+    source: TenantLocation,
+    target: TenantLocation,
+    batch_size: Optional[int] = None,
+    progress_callback: Optional[Callable[[int], object]] = None
+) -> int:
+    """
+    Copy a tenant's documents in ``_id`` order, resuming after the last one copied.
+    
+    Documents keep their client ``_id``s, so re-running after an interruption
+    skips what the target already has.
+    
+    Returns:
+        Number of documents copied by this call
+    """
+    batch_size = batch_size or settings.migration_batch_size
+    copied = 0
+    batch: List[dict] = []
+    
+    async def flush():
+        nonlocal copied
+        await _insert_copies(target, batch)
+        copied += len(batch)
+        batch.clear()
+        await _report(progress_callback, copied)
+    
+    last = await target.collection.find(
+        target.query({}), {"_id": 1}
+    ).sort(target.key, -1).limit(1).to_list(length=1)
+    query = source.query({"_id": {"$gt": target.document_id(last[0]["_id"])}} if last else {})
+    async for document in source.collection.find(query).sort(source.key, 1).batch_size(batch_size):
+        batch.append(target.prepare(source.strip(document)))
+        if len(batch) >= batch_size:
+            await flush()
+    if batch:
+        await flush()
+    return copied
+
+
+async def copy_missing_documents(
+    source: TenantLocation,
+    target: TenantLocation,
+    batch_size: Optional[int] = None,
+    progress_callback: Optional[Callable[[int], object]] = None
+) -> int:
+    """
+    Copy the source documents whose ``_id`` the target does not have yet.
+    
+    Catches up with documents inserted at any ``_id`` while an earlier
+    ``copy_tenant_documents`` ran. Only ``_id``s are compared, so documents
+    changed in place after being copied are not picked up.
+    
+    Returns:
+        Number of documents copied
+    """
+    batch_size = batch_size or settings.migration_batch_size
+    copied = 0
+    ids: List[Any] = []
+    
+    async def flush():
+        nonlocal copied
+        present = await _present_ids(target, ids)
+        missing = [value for value in ids if _id_key(value) not in present]
+        ids.clear()
+        if not missing:
+            return
+        documents = await source.collection.find(source.query({"_id": {"$in": missing}})).to_list(length=None)
+        await _insert_copies(target, [target.prepare(source.strip(document)) for document in documents])
+        copied += len(documents)
+        await _report(progress_callback, copied)
+    
+    async for document in source.collection.find(source.query({}), {"_id": 1}).sort(source.key, 1).batch_size(batch_size):
+        ids.append(source.document_id(document["_id"]))
+        if len(ids) >= batch_size:
+            await flush()
+    if ids:
+        await flush()
+    return copied
+
+
+async def check_copied(source: TenantLocation, target: TenantLocation):
+    """
+    Check that the target holds at least as many of the tenant's documents as the source.
+    
+    Raises:
+        RuntimeError: Documents are missing from the target, so the source must be kept
+    """
+    source_count = await source.collection.count_documents(source.query({}))
+    target_count = await target.collection.count_documents(target.query({}))
+    if target_count < source_count:
+        raise RuntimeError(
+            f"Copy incomplete: {target_count} of {source_count} documents in the target; the source was kept"
+        )
+
+
+def _id_key(value: Any) -> Any:
+    """A hashable stand-in for an ``_id``, which may be an embedded document."""
+    try:
+        hash(value)
+    except TypeError:
+        return json_util.dumps(value)
+    return value
+
+
+async def _present_ids(location: TenantLocation, ids: List[Any]) -> set:
+    """The ``_id_key``s of the given client ``_id``s this tenant already has."""
+    return {
+        _id_key(location.document_id(document["_id"]))
+        async for document in location.collection.find(location.query({"_id": {"$in": ids}}), {"_id": 1})
+    }
+
+
+async def _insert_copies(target: TenantLocation, documents: List[dict]):
+    """
+    Insert prepared copies, skipping the ones this tenant already has.
+    
+    A duplicate key is only ignored once the tenant is confirmed to hold a
+    document with the same ``_id``; a clash on any other unique index would
+    otherwise lose the document when the source is dropped.
+    """
+    if not documents:
+        return
+    try:
+        await target.collection.insert_many(documents, ordered=False)
+    except BulkWriteError as exc:
+        errors = exc.details.get("writeErrors", [])
+        if any(error.get("code") != DUPLICATE_KEY for error in errors):
+            raise
+        ids = [target.document_id(documents[error["index"]]["_id"]) for error in errors]
+        present = await _present_ids(target, ids)
+        if any(_id_key(value) not in present for value in ids):
+            raise
+
+
+async def _report(progress_callback: Optional[Callable[[int], object]], copied: int):
+    if progress_callback:
+        result = progress_callback(copied)
+        if asyncio.iscoroutine(result):
+            await result
+
+
+async def _run_cli(target: str, organizations: List[str], drain_seconds: float) -> int:
+    from app.database import close_mongo_connection, connect_to_mongo, get_cluster_databases, get_database
+    from app.services.organization_service import OrganizationService
+    
+    await connect_to_mongo()
+    database = get_database()
+    clusters = ClusterRouter(get_cluster_databases(), database["organizations"])
+    service = OrganizationService(database, storage=TenantStorageRouter(database, clusters=clusters))
+    try:
+        service.storage.get(target)
+        # Organizations without a storage field use collections
+        current = {"$exists": True, "$ne": target} if target == CollectionPerTenant.name else {"$ne": target}
+        query = {"$or": [{"storage": current}, {"storage_migration": {"$exists": True}}]}
+        if organizations:
+            query["organization_name"] = {"$in": organizations}
+        names = [
+            org["organization_name"]
+            async for org in service.orgs_collection.find(query, {"organization_name": 1})
+        ]
+        
+        claimed = []
+        for name in names:
+            try:
+                claimed.append(await service.begin_storage_migration(name, target))
+            except Exception as exc:
+                print(f"{name}: skipped ({getattr(exc, 'detail', exc)})")
+        if not claimed:
+            print("Nothing to migrate")
+            return 0
+        
+        # Let every worker's cached copy of the organizations expire, so
+        # writes see the migration and are refused instead of landing in
+        # the old storage after it was copied
+        print(f"Claimed {len(claimed)} organizations; draining writes for {drain_seconds:.0f}s")
+        await asyncio.sleep(drain_seconds)
+        
+        failed = 0
+        for name in claimed:
+            try:
+                result = await service.finish_storage_migration(name)
+                print(f"{name}: {result['copied']} documents moved to '{result['storage']}'")
+            except Exception as exc:
+                failed += 1
+                print(f"{name}: failed ({getattr(exc, 'detail', exc)}); re-run to resume")
+        return 1 if failed else 0
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move tenants to another storage strategy")
+    parser.add_argument("--to", required=True, dest="target", help="collection, database or shared")
+    parser.add_argument("--organization", action="append", default=[], help="Only these organizations")
+    parser.add_argument(
+        "--drain-seconds",
+        type=float,
+        default=settings.org_cache_ttl_seconds + 1,
+        help="Wait between claiming and copying (defaults to the metadata cache TTL)"
+    )
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(_run_cli(args.target, args.organization, args.drain_seconds)))
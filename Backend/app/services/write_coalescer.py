@@ -0,0 +1,162 @@
+"""
+Write coalescing for tenant document inserts.
+
+Concurrent single-document inserts into the same collection are buffered
+and sent as one unordered ``bulk_write`` when the buffer reaches
+``TENANT_WRITE_BATCH_SIZE`` documents or ``TENANT_WRITE_WINDOW_MS`` after its
+first document, whichever comes first. Every caller awaits the outcome of its
+own document.
+"""
+import asyncio
+import contextvars
+from typing import Any, Dict, List, Optional, Set
+from bson import ObjectId
+from pymongo import InsertOne
+from pymongo.errors import BulkWriteError
+from motor.motor_asyncio import AsyncIOMotorCollection
+from app.config import settings
+from app.metrics import registry
+from app.services.migration import DUPLICATE_KEY
+
+COALESCED_BATCH_SIZE = registry.histogram(
+    "tenant_write_batch_size",
+    "Documents per coalesced bulk_write.",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+)
+COALESCER_FLUSHES = registry.counter(
+    "tenant_write_flushes_total",
+    "Coalesced bulk_writes by what triggered them.",
+    ("reason",)
+)
+
+
+class DocumentWriteError(Exception):
+    """A single document of a coalesced batch was rejected by the server."""
+    
+    def __init__(self, code: Optional[int], message: str):
+        super().__init__(message)
+        self.code = code
+    
+    @property
+    def duplicate_key(self) -> bool:
+        return self.code == DUPLICATE_KEY
+
+
+class _Batch:
+    """Documents waiting to be written to one collection."""
+    
+    __slots__ = ("collection", "documents", "futures", "timer")
+    
+    def __init__(self, collection: AsyncIOMotorCollection):
+        self.collection = collection
+        self.documents: List[dict] = []
+        self.futures: List[asyncio.Future] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class WriteCoalescer:
+    """
+    Buffers inserts per collection and flushes them as bulk writes.
+    
+    Batches are written with ``ordered=False`` so one rejected document does
+    not stop the rest, and write errors are mapped back to the callers by
+    index. A caller that is cancelled while waiting loses its
+    acknowledgement, not its write. Flushes run in an empty context so their
+    MongoDB time is not attributed to whichever request triggered them.
+    """
+    
+    def __init__(self, max_batch_size: Optional[int] = None, max_delay: Optional[float] = None):
+        self.max_batch_size = max_batch_size or settings.tenant_write_batch_size
+        self.max_delay = max_delay if max_delay is not None else settings.tenant_write_window_ms / 1000
+        self._batches: Dict[str, _Batch] = {}
+        self._flushes: Set[asyncio.Task] = set()
+        self._closed = False
+        self.batches_written = 0
+    
+    async def insert(self, collection: AsyncIOMotorCollection, document: dict) -> Any:
+        """
+        Insert a document as part of the next batch for its collection.
+        
+        Returns:
+            The document's ``_id`` (generated if missing)
+        
+        Raises:
+            DocumentWriteError: The server rejected this document
+        """
+        if self._closed:
+            raise RuntimeError("Write coalescer is closed")
+        if "_id" not in document:
+            document["_id"] = ObjectId()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        
+        key = collection.full_name
+        batch = self._batches.get(key)
+        if batch is None:
+            batch = self._batches[key] = _Batch(collection)
+            batch.timer = loop.call_later(
+                self.max_delay, self._flush, key, batch, "window", context=contextvars.Context()
+            )
+        batch.documents.append(document)
+        batch.futures.append(future)
+        if len(batch.documents) >= self.max_batch_size:
+            self._flush(key, batch, "size")
+        return await future
+    
+    def _flush(self, key: str, batch: _Batch, reason: str):
+        if self._batches.get(key) is not batch:
+            # Already flushed by size before its window expired
+            return
+        del self._batches[key]
+        batch.timer.cancel()
+        COALESCER_FLUSHES.inc(reason)
+        self.batches_written += 1
+        task = contextvars.Context().run(asyncio.create_task, self._write(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+    
+    @staticmethod
+    async def _write(batch: _Batch):
+        COALESCED_BATCH_SIZE.observe(len(batch.documents))
+        failed: Dict[int, DocumentWriteError] = {}
+        try:
+            await batch.collection.bulk_write(
+                [InsertOne(document) for document in batch.documents], ordered=False
+            )
+        except BulkWriteError as exc:
+            for error in exc.details.get("writeErrors", []):
+                failed[error["index"]] = DocumentWriteError(error.get("code"), error.get("errmsg", "Write failed"))
+            concern_errors = exc.details.get("writeConcernErrors")
+            if concern_errors:
+                # Written, but not acknowledged as durable by the requested write concern
+                concern_error = DocumentWriteError(
+                    concern_errors[0].get("code"), concern_errors[0].get("errmsg", "Write concern error")
+                )
+                for index in range(len(batch.documents)):
+                    failed.setdefault(index, concern_error)
+        except Exception as exc:
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        
+        for index, (document, future) in enumerate(zip(batch.documents, batch.futures)):
+            if future.done():
+                continue
+            error = failed.get(index)
+            if error is None:
+                future.set_result(document["_id"])
+            else:
+                future.set_exception(error)
+    
+    def pending(self) -> int:
+        """Documents buffered but not yet sent."""
+        return sum(len(batch.documents) for batch in self._batches.values())
+    
+    async def close(self):
+        """Flush every buffered document and wait for in-flight writes."""
+        self._closed = True
+        for key, batch in list(self._batches.items()):
+            self._flush(key, batch, "shutdown")
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
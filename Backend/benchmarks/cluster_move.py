@@ -0,0 +1,109 @@
+"""
+Move a tenant between clusters under write load and check nothing is lost.
+
+Creates an organization with ``--documents`` documents, then moves it to
+``--to`` (or any other cluster) with ``move_organization_cluster`` while
+``--writers`` clients keep inserting and one keeps reading. Reports how long
+the move took, the longest gap between acknowledged writes (the freeze),
+the statuses seen, and whether the target holds every acknowledged document
+and the source was dropped. Runs the app in-process; configure at least two
+clusters, e.g. with two local mongod processes:
+
+    mongod --port 27017 --dbpath /tmp/mongo-a
+    mongod --port 27018 --dbpath /tmp/mongo-b
+    TENANT_CLUSTERS='{"second": "mongodb://localhost:27018"}' \\
+        python -m benchmarks.cluster_move --documents 50000 --writers 8
+
+Requires ``httpx``.
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from collections import Counter
+from typing import List, Optional
+from benchmarks.load_test import open_client
+
+PASSWORD = "move-bench-pass"
+
+
+async def run(documents: int, writers: int, target: Optional[str], drain_seconds: float) -> int:
+    from app.main import app
+    
+    name = f"move-{uuid.uuid4().hex[:8]}"
+    email = f"{name}@bench.example.com"
+    async with open_client(None) as client:
+        service = app.state.organization_service
+        clusters = sorted(service.storage.clusters.databases)
+        if len(clusters) < 2:
+            print("Configure a second cluster with TENANT_CLUSTERS")
+            return 1
+        
+        await client.post("/org/create", json={"organization_name": name, "email": email, "password": PASSWORD})
+        token = (await client.post("/admin/login", json={"email": email, "password": PASSWORD})).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        base = f"/org/{name}/documents"
+        for start in range(0, documents, 1000):
+            await client.post(base, json=[{"seq": seq} for seq in range(start, min(start + 1000, documents))], headers=headers)
+        
+        org_data = await service.orgs_collection.find_one({"organization_name": name})
+        source = org_data["cluster"]
+        target = target or next(cluster for cluster in clusters if cluster != source)
+        
+        statuses: Counter = Counter()
+        acknowledged: List[float] = []
+        stop = asyncio.Event()
+        
+        async def write(writer: int):
+            seq = 0
+            while not stop.is_set():
+                response = await client.post(base, json={"writer": writer, "seq": seq}, headers=headers)
+                statuses[f"POST {response.status_code}"] += 1
+                if response.status_code == 201:
+                    acknowledged.append(time.perf_counter())
+                    seq += 1
+                else:
+                    await asyncio.sleep(0.01)
+        
+        async def read():
+            while not stop.is_set():
+                response = await client.get(base, params={"limit": 10}, headers=headers)
+                statuses[f"GET {response.status_code}"] += 1
+        
+        tasks = [asyncio.create_task(write(writer)) for writer in range(writers)]
+        tasks.append(asyncio.create_task(read()))
+        started = time.perf_counter()
+        result = await service.move_organization_cluster(name, target, drain_seconds=drain_seconds)
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await asyncio.gather(*tasks)
+        
+        org_data = await service.orgs_collection.find_one({"organization_name": name})
+        storage = service.storage.for_organization(org_data)
+        location = storage.locate(org_data)
+        stored = await location.collection.count_documents(location.query({}))
+        expected = 1 + documents + statuses["POST 201"]
+        left_behind = await service.storage.get(storage.name, source).count(org_data)
+        gaps = [later - earlier for earlier, later in zip(acknowledged, acknowledged[1:])]
+        
+        print(f"moved {name} {source} -> {result['cluster']} in {elapsed:.2f}s, {result['copied']} documents copied")
+        print(f"longest write gap {max(gaps, default=0):.2f}s; statuses {dict(statuses)}")
+        print(f"target holds {stored} documents, expected {expected}; {left_behind} left on the source")
+        
+        await client.request("DELETE", "/org/delete", json={"organization_name": name, "email": email}, headers=headers)
+    return 0 if stored == expected and left_behind == 0 else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--documents", type=int, default=20000)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--to", dest="target", help="Target cluster (another one by default)")
+    parser.add_argument(
+        "--drain-seconds",
+        type=float,
+        default=1.0,
+        help="A single in-process worker needs no cache drain beyond its own invalidation"
+    )
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(run(args.documents, args.writers, args.target, args.drain_seconds)))
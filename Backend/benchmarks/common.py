@@ -0,0 +1,12 @@
+"""
+Shared helpers for the benchmark scripts.
+"""
+
+
+def percentile(samples: list, pct: float) -> float:
+    """Return the pct-th percentile of samples (nearest-rank)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
@@ -0,0 +1,246 @@
+"""
+Race concurrent create, rename and delete requests and check for anomalies.
+
+Every phase sends many conflicting requests at once:
+
+* ``create-same-name``: ``--contenders`` creates per organization name, each
+  with a different admin email; exactly one may succeed per name.
+* ``create-same-email``: ``--contenders`` creates per admin email, each with a
+  different organization name; exactly one may succeed per email.
+* ``rename-same-target``: pairs of organizations renamed to the same new name;
+  exactly one may succeed per target.
+* ``rename-vs-delete``: a rename and a delete of the same organization.
+
+Losing requests must fail cleanly with 400 or 409. Afterwards the master
+collections are checked directly: names, collection names and emails are
+unique, every organization has its admin and tenant storage (and every
+tenant collection its organization), a deleted organization's admin is
+deleted with it, and no rename or delete was left half done.
+
+The app is exercised in-process unless ``--base-url`` is given (start the
+server with RATE_LIMIT_ENABLED=False); the checks read MONGODB_URL and
+MONGODB_DB_NAME either way. Run it against a replica set and a standalone
+server to cover both the transactional and the fallback code paths.
+Requires ``httpx``.
+
+Usage:
+    python -m benchmarks.concurrency_stress --names 20 --contenders 25
+"""
+import argparse
+import asyncio
+import uuid
+from collections import Counter
+from typing import Awaitable, Callable, Dict, List, Optional
+import httpx
+from motor.motor_asyncio import AsyncIOMotorClient
+from benchmarks.load_test import open_client
+
+PASSWORD = "stress-pass"
+ALLOWED_FAILURES = {400, 409}
+
+
+async def race(requests: List[Callable[[], Awaitable[httpx.Response]]]) -> List[httpx.Response]:
+    """Start every request at the same time."""
+    start = asyncio.Event()
+    
+    async def one(make_request):
+        await start.wait()
+        return await make_request()
+    
+    tasks = [asyncio.create_task(one(make_request)) for make_request in requests]
+    await asyncio.sleep(0)
+    start.set()
+    return await asyncio.gather(*tasks)
+
+
+def tally(phase: str, responses: List[httpx.Response], success: int, problems: List[str]) -> Counter:
+    """Count status codes and flag unexpected ones."""
+    statuses = Counter(response.status_code for response in responses)
+    unexpected = {code: count for code, count in statuses.items() if code != success and code not in ALLOWED_FAILURES}
+    if unexpected:
+        problems.append(f"{phase}: unexpected statuses {unexpected}")
+    return statuses
+
+
+async def run_phases(client: httpx.AsyncClient, prefix: str, names: int, contenders: int) -> dict:
+    problems: List[str] = []
+    report: Dict[str, dict] = {}
+    admins: Dict[str, str] = {}
+    
+    # Same organization name, different emails
+    responses = await race([
+        (lambda i=i, c=c: client.post("/org/create", json={
+            "organization_name": f"{prefix} name {i}",
+            "email": f"name{i}-{c}@{prefix}.example.com",
+            "password": PASSWORD
+        }))
+        for i in range(names) for c in range(contenders)
+    ])
+    report["create-same-name"] = tally("create-same-name", responses, 201, problems)
+    for response in responses:
+        if response.status_code == 201:
+            body = response.json()
+            admins[body["organization_name"]] = body["admin_email"]
+    for i in range(names):
+        if f"{prefix} name {i}" not in admins:
+            problems.append(f"create-same-name: no create of '{prefix} name {i}' succeeded")
+    if report["create-same-name"][201] > names:
+        problems.append(f"create-same-name: {report['create-same-name'][201]} creates succeeded for {names} names")
+    
+    # Same email, different organization names
+    responses = await race([
+        (lambda i=i, c=c: client.post("/org/create", json={
+            "organization_name": f"{prefix} email {i} {c}",
+            "email": f"email{i}@{prefix}.example.com",
+            "password": PASSWORD
+        }))
+        for i in range(names) for c in range(contenders)
+    ])
+    report["create-same-email"] = tally("create-same-email", responses, 201, problems)
+    victims = [response.json() for response in responses if response.status_code == 201]
+    if report["create-same-email"][201] != names:
+        problems.append(
+            f"create-same-email: {report['create-same-email'][201]} creates succeeded for {names} emails"
+        )
+    
+    # Two organizations renamed to the same target
+    sources = sorted(admins)
+    pairs = [(sources[i], sources[i + 1]) for i in range(0, len(sources) - 1, 2)]
+    requests = []
+    for index, pair in enumerate(pairs):
+        for source in pair:
+            requests.append(lambda source=source, index=index: client.put("/org/update", json={
+                "current_organization_name": source,
+                "new_organization_name": f"{prefix} target {index}",
+                "email": admins[source],
+                "password": PASSWORD
+            }))
+    responses = await race(requests)
+    report["rename-same-target"] = tally("rename-same-target", responses, 200, problems)
+    if report["rename-same-target"][200] > len(pairs):
+        problems.append(
+            f"rename-same-target: {report['rename-same-target'][200]} renames succeeded for {len(pairs)} targets"
+        )
+    
+    # Rename and delete of the same organization
+    requests = []
+    for victim in victims:
+        name, email = victim["organization_name"], victim["admin_email"]
+        requests.append(lambda name=name, email=email: client.put("/org/update", json={
+            "current_organization_name": name,
+            "new_organization_name": f"{name} moved",
+            "email": email,
+            "password": PASSWORD
+        }))
+        requests.append(lambda name=name, email=email: client.request("DELETE", "/org/delete", json={
+            "organization_name": name, "email": email
+        }))
+    responses = await race(requests)
+    # A rename that loses to the delete sees the organization gone
+    report["rename-vs-delete"] = tally(
+        "rename-vs-delete", [r for r in responses if r.status_code != 404], 200, problems
+    )
+    
+    return {"statuses": {phase: dict(counts) for phase, counts in report.items()}, "problems": problems}
+
+
+async def check_invariants(prefix: str) -> List[str]:
+    """Inspect the master collections for duplicates and orphans."""
+    from app.config import settings
+    from app.database import DEFAULT_CLUSTER
+    from app.services.tenant_clusters import ClusterRouter
+    from app.services.tenant_storage import CollectionPerTenant, TenantStorageRouter
+    client = AsyncIOMotorClient(settings.mongodb_url)
+    database = client[settings.mongodb_db_name]
+    cluster_clients = {name: AsyncIOMotorClient(url) for name, url in settings.tenant_clusters.items()}
+    clusters = ClusterRouter(
+        {DEFAULT_CLUSTER: database, **{name: c[settings.mongodb_db_name] for name, c in cluster_clients.items()}},
+        database["organizations"]
+    )
+    storage = TenantStorageRouter(database, clusters=clusters)
+    problems = []
+    try:
+        orgs = await database["organizations"].find({"organization_name": {"$regex": f"^{prefix} "}}).to_list(None)
+        users = await database["admin_users"].find({"email": {"$regex": f"@{prefix}\\."}}).to_list(None)
+        collections = {
+            name for name in await database.list_collection_names() if name.startswith(f"org_{prefix}_")
+        }
+        
+        for field, values in (
+            ("organization_name", [org["organization_name"] for org in orgs]),
+            ("collection_name", [org["collection_name"] for org in orgs]),
+            ("email", [user["email"] for user in users])
+        ):
+            duplicates = [value for value, count in Counter(values).items() if count > 1]
+            if duplicates:
+                problems.append(f"duplicate {field}: {duplicates[:5]}")
+        
+        users_by_id = {str(user["_id"]): user for user in users}
+        admin_ids = set()
+        for org in orgs:
+            user = users_by_id.get(org["admin_user_id"])
+            admin_ids.add(org["admin_user_id"])
+            if user is None:
+                problems.append(f"organization '{org['organization_name']}' has no admin user")
+            elif user["organization_name"] != org["organization_name"]:
+                problems.append(
+                    f"admin of '{org['organization_name']}' points at '{user['organization_name']}'"
+                )
+            strategy = storage.for_organization(org)
+            if isinstance(strategy, CollectionPerTenant) and strategy.db is database:
+                has_storage = org["collection_name"] in collections
+            else:
+                # The seed document is always there
+                has_storage = await strategy.count(org) > 0
+            if not has_storage:
+                problems.append(f"organization '{org['organization_name']}' has no tenant storage")
+            elif bool(user.get("deleted_at")) != bool(org.get("deleted_at")):
+                problems.append(f"admin of '{org['organization_name']}' disagrees on its deletion")
+            if org.get("migrating_from") or org.get("deleting"):
+                problems.append(f"organization '{org['organization_name']}' was left mid-rename or mid-delete")
+        for user_id, user in users_by_id.items():
+            if user_id not in admin_ids:
+                problems.append(f"admin user '{user['email']}' has no organization")
+        orphans = collections - {
+            org["collection_name"] for org in orgs
+            if isinstance(storage.for_organization(org), CollectionPerTenant) and storage.for_organization(org).db is database
+        }
+        if orphans:
+            problems.append(f"tenant collections without an organization: {sorted(orphans)[:5]}")
+    finally:
+        client.close()
+        for cluster_client in cluster_clients.values():
+            cluster_client.close()
+    return problems
+
+
+async def run(base_url: Optional[str], names: int, contenders: int) -> dict:
+    prefix = f"st{uuid.uuid4().hex[:8]}"
+    async with open_client(base_url) as client:
+        result = await run_phases(client, prefix, names, contenders)
+    result["problems"].extend(await check_invariants(prefix))
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--base-url", help="Target a running server instead of the in-process app")
+    parser.add_argument("--names", type=int, default=20, help="Contested names/emails per phase")
+    parser.add_argument("--contenders", type=int, default=25, help="Concurrent requests per contested key")
+    args = parser.parse_args()
+    
+    result = asyncio.run(run(args.base_url, args.names, args.contenders))
+    for phase, statuses in result["statuses"].items():
+        summary = ", ".join(f"{code}: {count}" for code, count in sorted(statuses.items()))
+        print(f"{phase:<20} {summary}")
+    if result["problems"]:
+        print("Anomalies:")
+        for problem in result["problems"]:
+            print(f"  {problem}")
+        return 1
+    print("No anomalies")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
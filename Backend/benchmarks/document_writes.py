@@ -0,0 +1,74 @@
+"""
+Benchmark coalesced tenant document inserts on a local mongod.
+
+Issues ``--documents`` concurrent single-document inserts, at most
+``--concurrency`` in flight, once with one ``insert_one`` per document and
+once through the WriteCoalescer, reporting throughput, p50/p99 latency and
+the number of round-trips.
+
+Usage:
+    python -m benchmarks.document_writes --documents 20000 --concurrency 500
+"""
+import argparse
+import asyncio
+import time
+from motor.motor_asyncio import AsyncIOMotorClient
+from app.config import settings
+from app.services.write_coalescer import WriteCoalescer
+from benchmarks.common import percentile
+
+BENCH_DB = "org_document_write_benchmark"
+
+
+async def drive(insert, documents: int, concurrency: int) -> list:
+    """Run `documents` inserts with at most `concurrency` in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    
+    async def one(index: int):
+        async with semaphore:
+            started = time.perf_counter()
+            await insert({"seq": index, "payload": "x" * 100})
+            latencies.append(time.perf_counter() - started)
+    
+    await asyncio.gather(*(one(index) for index in range(documents)))
+    return latencies
+
+
+def report(label: str, latencies: list, elapsed: float, round_trips: int):
+    print(
+        f"{label:<12} docs={len(latencies):>7} time={elapsed:7.2f}s "
+        f"rate={len(latencies) / elapsed:9.0f} docs/s  p50={percentile(latencies, 50) * 1000:7.2f}ms "
+        f"p99={percentile(latencies, 99) * 1000:7.2f}ms  round-trips={round_trips}"
+    )
+
+
+async def run(documents: int, concurrency: int, batch_size: int, window_ms: float):
+    client = AsyncIOMotorClient(settings.mongodb_url)
+    collection = client[BENCH_DB]["org_bench_documents"]
+    try:
+        await collection.drop()
+        started = time.perf_counter()
+        latencies = await drive(collection.insert_one, documents, concurrency)
+        report("insert_one", latencies, time.perf_counter() - started, documents)
+        
+        await collection.drop()
+        coalescer = WriteCoalescer(max_batch_size=batch_size, max_delay=window_ms / 1000)
+        started = time.perf_counter()
+        latencies = await drive(lambda document: coalescer.insert(collection, document), documents, concurrency)
+        elapsed = time.perf_counter() - started
+        await coalescer.close()
+        report("coalesced", latencies, elapsed, coalescer.batches_written)
+    finally:
+        await client.drop_database(BENCH_DB)
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--documents", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=settings.tenant_write_batch_size)
+    parser.add_argument("--window-ms", type=float, default=settings.tenant_write_window_ms)
+    args = parser.parse_args()
+    asyncio.run(run(args.documents, args.concurrency, args.batch_size, args.window_ms))
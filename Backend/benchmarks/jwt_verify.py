@@ -0,0 +1,65 @@
+"""
+Microbenchmark of JWT verification throughput.
+
+Compares the previous per-call ``jose.jwt.decode`` with a string secret
+against the prepared-key backends and the memoizing TokenVerifier.
+
+Usage:
+    python -m benchmarks.jwt_verify --seconds 2
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+from jose import jwt as jose_jwt
+from app.config import settings
+from app.auth.jwt_handler import JWT_BACKENDS, TokenVerifier, build_backend
+
+
+def measure(verify, tokens: list, seconds: float) -> float:
+    """Return verifications per second over roughly `seconds`."""
+    count = 0
+    deadline = time.perf_counter() + seconds
+    started = time.perf_counter()
+    while time.perf_counter() < deadline:
+        for token in tokens:
+            verify(token)
+        count += len(tokens)
+    return count / (time.perf_counter() - started)
+
+
+def main(seconds: float, distinct_tokens: int):
+    claims = {
+        "sub": "65a1f0c2e4b0a1b2c3d4e5f6",
+        "email": "admin@acme.com",
+        "organization_name": "Acme Corp",
+        "exp": datetime.utcnow() + timedelta(minutes=30)
+    }
+    tokens = [
+        jose_jwt.encode({**claims, "n": n}, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
+        for n in range(distinct_tokens)
+    ]
+    
+    def baseline(token):
+        return jose_jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
+    
+    results = [("jose.jwt.decode (before)", measure(baseline, tokens, seconds))]
+    for name in JWT_BACKENDS:
+        try:
+            backend = build_backend(name, settings.jwt_secret_key, settings.jwt_algorithm)
+        except RuntimeError as exc:
+            print(f"skipping {name}: {exc}")
+            continue
+        results.append((f"{name} prepared key", measure(backend.decode, tokens, seconds)))
+        verifier = TokenVerifier(backend, max_entries=distinct_tokens)
+        results.append((f"{name} + decoded-token LRU", measure(verifier.verify, tokens, seconds)))
+    
+    for label, rate in results:
+        print(f"{label:<28} {rate:12.0f} tokens/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--distinct-tokens", type=int, default=100)
+    args = parser.parse_args()
+    main(args.seconds, args.distinct_tokens)
@@ -0,0 +1,215 @@
+"""
+Load test every API endpoint and compare against a stored baseline.
+
+Each run provisions ``--tenants`` organizations with a unique prefix and then
+drives the endpoints phase by phase (create, get, login, update, delete) with
+``--concurrency`` requests in flight. Throughput and p50/p95/p99 latency are
+reported per endpoint.
+
+By default the app is exercised in-process through an ASGI transport (its
+lifespan connects to MONGODB_URL, e.g. a local mongod); pass ``--base-url`` to
+target a running server instead (start it with RATE_LIMIT_ENABLED=False).
+Requires ``httpx``.
+
+Usage:
+    python -m benchmarks.load_test --tenants 200 --concurrency 32
+    python -m benchmarks.load_test --save-baseline benchmarks/baseline.json
+    python -m benchmarks.load_test --baseline benchmarks/baseline.json --tolerance 0.2
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Callable, List, Optional
+import httpx
+from benchmarks.common import percentile
+
+PASSWORD = "loadtest-pass"
+
+
+class EndpointResult:
+    """Latency samples and error count for one endpoint phase."""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.elapsed = 0.0
+    
+    def summary(self) -> dict:
+        total = len(self.latencies) + self.errors
+        return {
+            "requests": total,
+            "errors": self.errors,
+            "throughput_rps": total / self.elapsed if self.elapsed else 0.0,
+            "p50_ms": percentile(self.latencies, 50) * 1000,
+            "p95_ms": percentile(self.latencies, 95) * 1000,
+            "p99_ms": percentile(self.latencies, 99) * 1000
+        }
+
+
+@asynccontextmanager
+async def open_client(base_url: Optional[str]):
+    """Yield an httpx client for a remote server or the in-process app."""
+    if base_url:
+        async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+            yield client
+        return
+    from app.config import settings
+    from app.main import app
+    # One client drives every tenant, which the login/create limits would throttle
+    settings.rate_limit_enabled = False
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=60) as client:
+            yield client
+
+
+async def run_phase(
+    name: str,
+    make_request: Callable[[int], "asyncio.Future"],
+    count: int,
+    concurrency: int,
+    expected_status: int
+) -> EndpointResult:
+    """Issue `count` requests with at most `concurrency` in flight."""
+    result = EndpointResult(name)
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def one(index: int):
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await make_request(index)
+                ok = response.status_code == expected_status
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                result.latencies.append(time.perf_counter() - started)
+            else:
+                result.errors += 1
+    
+    started = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(count)))
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+async def run(base_url: Optional[str], tenants: int, concurrency: int, reads_per_tenant: int) -> dict:
+    prefix = f"lt{uuid.uuid4().hex[:8]}"
+    
+    def name(index: int) -> str:
+        return f"{prefix} org {index}"
+    
+    def renamed(index: int) -> str:
+        return f"{prefix} renamed {index}"
+    
+    def email(index: int) -> str:
+        return f"admin{index}@{prefix}.example.com"
+    
+    results = []
+    async with open_client(base_url) as client:
+        results.append(await run_phase(
+            "POST /org/create",
+            lambda i: client.post("/org/create", json={
+                "organization_name": name(i), "email": email(i), "password": PASSWORD
+            }),
+            tenants, concurrency, 201
+        ))
+        results.append(await run_phase(
+            "GET /org/get",
+            lambda i: client.request("GET", "/org/get", json={"organization_name": name(i % tenants)}),
+            tenants * reads_per_tenant, concurrency, 200
+        ))
+        results.append(await run_phase(
+            "POST /admin/login",
+            lambda i: client.post("/admin/login", json={"email": email(i), "password": PASSWORD}),
+            tenants, concurrency, 200
+        ))
+        results.append(await run_phase(
+            "PUT /org/update",
+            lambda i: client.put("/org/update", json={
+                "current_organization_name": name(i),
+                "new_organization_name": renamed(i),
+                "email": email(i),
+                "password": PASSWORD
+            }),
+            tenants, concurrency, 200
+        ))
+        results.append(await run_phase(
+            "DELETE /org/delete",
+            lambda i: client.request("DELETE", "/org/delete", json={
+                "organization_name": renamed(i), "email": email(i)
+            }),
+            tenants, concurrency, 200
+        ))
+    
+    return {
+        "config": {"tenants": tenants, "concurrency": concurrency, "reads_per_tenant": reads_per_tenant},
+        "endpoints": {result.name: result.summary() for result in results}
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Return regressions of p95 latency or throughput beyond `tolerance`."""
+    regressions = []
+    for endpoint, current in report["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(endpoint)
+        if not previous:
+            continue
+        if previous["p95_ms"] and current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{endpoint}: p95 {current['p95_ms']:.1f}ms vs baseline {previous['p95_ms']:.1f}ms"
+            )
+        if current["throughput_rps"] < previous["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{endpoint}: {current['throughput_rps']:.1f} req/s vs baseline "
+                f"{previous['throughput_rps']:.1f} req/s"
+            )
+    return regressions
+
+
+def print_report(report: dict):
+    print(f"{'endpoint':<20} {'requests':>8} {'errors':>6} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for endpoint, stats in report["endpoints"].items():
+        print(
+            f"{endpoint:<20} {stats['requests']:>8} {stats['errors']:>6} {stats['throughput_rps']:>9.1f} "
+            f"{stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--base-url", help="Target a running server instead of the in-process app")
+    parser.add_argument("--tenants", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--reads-per-tenant", type=int, default=5)
+    parser.add_argument("--baseline", help="Baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression")
+    parser.add_argument("--save-baseline", help="Write this run's results to a baseline JSON")
+    args = parser.parse_args()
+    
+    report = asyncio.run(run(args.base_url, args.tenants, args.concurrency, args.reads_per_tenant))
+    print_report(report)
+    
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"Baseline written to {args.save_baseline}")
+    
+    if args.baseline:
+        with open(args.baseline) as fh:
+            regressions = compare(report, json.load(fh), args.tolerance)
+        if regressions:
+            print("Regressions against baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
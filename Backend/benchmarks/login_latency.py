@@ -0,0 +1,90 @@
+"""
+Benchmark login latency under concurrent load.
+
+Compares the old inline bcrypt path (``verify_password`` called directly in the
+coroutine) against the pooled path (``verify_password_async``). Alongside the
+logins a lightweight "health" coroutine ticks every few milliseconds, which
+shows how long the event loop is stalled for every other request.
+
+Usage:
+    python -m benchmarks.login_latency --concurrency 32 --rounds 4
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from app.auth.password import (
+    hash_password,
+    verify_password,
+    verify_password_async,
+    password_pool
+)
+from benchmarks.common import percentile
+
+
+async def _login_inline(password: str, password_hash: str):
+    verify_password(password, password_hash)
+
+
+async def _login_pooled(password: str, password_hash: str):
+    await verify_password_async(password, password_hash)
+
+
+async def _timed(login, submitted: float, password_hash: str) -> float:
+    # Latency is measured from batch submission, as a client would see it.
+    await login("benchmark-pass", password_hash)
+    return time.perf_counter() - submitted
+
+
+async def _heartbeat(stop: asyncio.Event, interval: float, lags: list):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+
+async def run_scenario(login, concurrency: int, rounds: int, password_hash: str) -> dict:
+    """Fire `concurrency` simultaneous logins `rounds` times and collect latencies."""
+    latencies = []
+    lags = []
+    stop = asyncio.Event()
+    heartbeat = asyncio.create_task(_heartbeat(stop, 0.005, lags))
+    started = time.perf_counter()
+    for _ in range(rounds):
+        submitted = time.perf_counter()
+        latencies.extend(await asyncio.gather(
+            *(_timed(login, submitted, password_hash) for _ in range(concurrency))
+        ))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await heartbeat
+    return {
+        "logins_per_sec": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_loop_stall_ms": max(lags or [0]) * 1000,
+        "mean_loop_stall_ms": statistics.mean(lags or [0]) * 1000
+    }
+
+
+async def main(concurrency: int, rounds: int):
+    password_hash = hash_password("benchmark-pass")
+    print(f"Pool: {password_pool.executor_type} x{password_pool.max_workers}, "
+          f"concurrency={concurrency}, rounds={rounds}")
+    for label, login in (("inline (before)", _login_inline), ("pooled (after)", _login_pooled)):
+        result = await run_scenario(login, concurrency, rounds, password_hash)
+        print(
+            f"{label:<16} {result['logins_per_sec']:8.1f} logins/s  "
+            f"p50={result['p50_ms']:8.1f}ms  p99={result['p99_ms']:8.1f}ms  "
+            f"loop stall max={result['max_loop_stall_ms']:7.1f}ms "
+            f"mean={result['mean_loop_stall_ms']:6.1f}ms"
+        )
+    password_pool.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency, args.rounds))
@@ -0,0 +1,86 @@
+"""
+Microbenchmark of per-request response serialization.
+
+"before" reproduces the previous route path: build the Pydantic response
+model from the service dict, let FastAPI validate it against the route's
+response_model (``serialize_response``) and render it with the stdlib
+``json`` module. "after" wraps the service dict in the orjson response the
+routes now return.
+
+Usage:
+    python -m benchmarks.serialization --iterations 20000
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+from app.api.organization import router
+from app.responses import ORJSONResponse
+from app.schemas.organization import OrganizationBatchResponse, OrganizationResponse
+
+
+def organization(n: int) -> dict:
+    now = datetime.utcnow()
+    return {
+        "id": str(ObjectId()),
+        "organization_name": f"Acme Corp {n}",
+        "collection_name": f"org_acme_corp_{n}",
+        "admin_email": f"admin{n}@acme.com",
+        "created_at": now,
+        "updated_at": now
+    }
+
+
+def response_field(path: str):
+    for route in router.routes:
+        if isinstance(route, APIRoute) and route.path == path:
+            return route.secure_cloned_response_field
+    raise LookupError(path)
+
+
+async def measure(render, iterations: int) -> float:
+    """Return microseconds per call."""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await render()
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+async def main(iterations: int):
+    single = organization(0)
+    batch = {"organizations": [organization(n) for n in range(100)], "not_found": []}
+    cases = [
+        ("/org/get (1 org)", "/org/get", OrganizationResponse, single, iterations),
+        ("/org/get-many (100 orgs)", "/org/get-many", OrganizationBatchResponse, batch, iterations // 10)
+    ]
+    
+    print(f"{'payload':<26} {'before us':>10} {'after us':>10} {'speedup':>8}")
+    for label, path, model, payload, count in cases:
+        field = response_field(path)
+        
+        async def before():
+            content = await serialize_response(
+                field=field, response_content=model(**payload), is_coroutine=True
+            )
+            return JSONResponse(content).body
+        
+        async def after():
+            return ORJSONResponse(payload).body
+        
+        # Both paths must produce the same document
+        assert json.loads(await before()) == json.loads(await after())
+        count = max(1, count)
+        before_us = await measure(before, count)
+        after_us = await measure(after, count)
+        print(f"{label:<26} {before_us:>10.1f} {after_us:>10.1f} {before_us / after_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations))
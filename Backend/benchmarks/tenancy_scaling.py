@@ -0,0 +1,137 @@
+"""
+Benchmark tenant storage strategies as the number of tenants grows.
+
+For each strategy, creates ``--tenants`` tenants (seed document plus tenant
+indexes, as organization create does) with ``--concurrency`` in flight and
+writes ``--documents`` documents to each. At every checkpoint it reports the
+p50/p99 latency of the creates since the previous checkpoint, of ``--sample``
+single-document reads from random tenants, and the server's resident memory,
+WiredTiger cache size and open data handles. Per-collection and
+per-database tenants cost files and cache on the server; the shared
+collection does not, at the price of one large index.
+
+Runs against MONGODB_URL using throwaway databases that are dropped
+afterwards. Collection- and database-per-tenant runs at 100k tenants need
+a raised open files limit on the mongod host.
+
+Usage:
+    python -m benchmarks.tenancy_scaling --tenants 100000 --checkpoints 1000,10000,100000
+"""
+import argparse
+import asyncio
+import random
+import time
+from typing import List
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+from app.config import settings
+from app.services.tenant_storage import TenantStorageRouter
+from benchmarks.common import percentile
+
+BENCH_DB = "org_tenancy_benchmark"
+BENCH_DATABASE_PREFIX = "tbench_"
+
+
+async def server_stats(client: AsyncIOMotorClient) -> dict:
+    status = await client.admin.command("serverStatus")
+    wired_tiger = status.get("wiredTiger", {})
+    return {
+        "resident_mb": status.get("mem", {}).get("resident", 0),
+        "cache_mb": wired_tiger.get("cache", {}).get("bytes currently in the cache", 0) / 1024 / 1024,
+        "open_handles": wired_tiger.get("data-handle", {}).get("connection data handles currently active", 0)
+    }
+
+
+async def run_strategy(
+    client: AsyncIOMotorClient,
+    name: str,
+    tenants: int,
+    checkpoints: List[int],
+    concurrency: int,
+    documents: int,
+    sample: int
+):
+    storage = TenantStorageRouter(client[BENCH_DB], default=name, database_prefix=BENCH_DATABASE_PREFIX).default
+    created: List[dict] = []
+    semaphore = asyncio.Semaphore(concurrency)
+    create_latencies: List[float] = []
+    
+    async def create(index: int):
+        org_data = {
+            "_id": ObjectId(),
+            "organization_name": f"Bench {index}",
+            "collection_name": f"org_bench_{index}"
+        }
+        async with semaphore:
+            started = time.perf_counter()
+            await storage.initialize(org_data)
+            create_latencies.append(time.perf_counter() - started)
+            if documents:
+                location = storage.locate(org_data)
+                await location.collection.insert_many([
+                    location.prepare({"seq": seq, "payload": "x" * 100}) for seq in range(documents)
+                ])
+        created.append(org_data)
+    
+    async def read(org_data: dict) -> float:
+        location = storage.locate(org_data)
+        started = time.perf_counter()
+        await location.collection.find_one(location.query({"seq": {"$exists": True}}))
+        return time.perf_counter() - started
+    
+    done = 0
+    for checkpoint in checkpoints:
+        create_latencies.clear()
+        started = time.perf_counter()
+        await asyncio.gather(*(create(index) for index in range(done, checkpoint)))
+        elapsed = time.perf_counter() - started
+        done = checkpoint
+        
+        read_latencies = [
+            await read(org_data) for org_data in random.sample(created, min(sample, len(created)))
+        ]
+        stats = await server_stats(client)
+        print(
+            f"{name:<10} tenants={done:>7} create p50={percentile(create_latencies, 50) * 1000:7.2f}ms "
+            f"p99={percentile(create_latencies, 99) * 1000:7.2f}ms ({len(create_latencies) / elapsed:6.0f}/s)  "
+            f"get p50={percentile(read_latencies, 50) * 1000:6.2f}ms p99={percentile(read_latencies, 99) * 1000:6.2f}ms  "
+            f"resident={stats['resident_mb']}MB cache={stats['cache_mb']:.0f}MB handles={stats['open_handles']}"
+        )
+
+
+async def cleanup(client: AsyncIOMotorClient):
+    await client.drop_database(BENCH_DB)
+    for name in await client.list_database_names():
+        if name.startswith(BENCH_DATABASE_PREFIX):
+            await client.drop_database(name)
+
+
+async def run(strategies: List[str], tenants: int, checkpoints: List[int], concurrency: int, documents: int, sample: int):
+    checkpoints = sorted({checkpoint for checkpoint in checkpoints if checkpoint < tenants} | {tenants})
+    client = AsyncIOMotorClient(settings.mongodb_url)
+    try:
+        for name in strategies:
+            await cleanup(client)
+            await run_strategy(client, name, tenants, checkpoints, concurrency, documents, sample)
+    finally:
+        await cleanup(client)
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--strategies", default="collection,database,shared")
+    parser.add_argument("--tenants", type=int, default=10000)
+    parser.add_argument("--checkpoints", default="100,1000,10000,100000")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--documents", type=int, default=10, help="Documents written per tenant")
+    parser.add_argument("--sample", type=int, default=200, help="Reads per checkpoint")
+    args = parser.parse_args()
+    asyncio.run(run(
+        args.strategies.split(","),
+        args.tenants,
+        [int(checkpoint) for checkpoint in args.checkpoints.split(",")],
+        args.concurrency,
+        args.documents,
+        args.sample
+    ))
@@ -0,0 +1,43 @@
+"""
+Shared fixtures for the unit tests.
+
+Most tests run against mongomock through ``mongomock-motor``, so no MongoDB
+server is needed. Tests of the organization read paths need a real server,
+since mongomock lacks the ``$lookup`` that joins admin users; they use
+``mongo_database`` and are skipped unless ``MONGODB_TEST_URL`` is set.
+Settings are read when ``app.config`` is first imported, so the overrides
+below are applied before any test module imports the app.
+"""
+import os
+
+os.environ.setdefault("PASSWORD_BCRYPT_ROUNDS", "4")
+os.environ.setdefault("MONGODB_TRANSACTIONS", "off")
+
+import pytest
+from bson import ObjectId
+from mongomock_motor import AsyncMongoMockClient
+from motor import motor_asyncio
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def database():
+    """A fresh in-memory master database."""
+    return AsyncMongoMockClient()["test_master"]
+
+
+@pytest.fixture
+async def mongo_database():
+    """A throwaway database on the server at ``MONGODB_TEST_URL``, dropped afterwards."""
+    url = os.environ.get("MONGODB_TEST_URL")
+    if not url:
+        pytest.skip("MONGODB_TEST_URL is not set")
+    client = motor_asyncio.AsyncIOMotorClient(url, serverSelectionTimeoutMS=2000)
+    name = f"test_{ObjectId()}"
+    yield client[name]
+    await client.drop_database(name)
+    client.close()
@@ -0,0 +1,162 @@
+"""Tests for the bulk create route's JSON and NDJSON bodies."""
+import anyio
+import httpx
+import orjson
+import pytest
+from bson import ObjectId
+from app.config import settings
+from app.dependencies import get_organization_service
+from app.main import app
+
+
+class FakeOrganizationService:
+    """Creates every item and records the chunks it was given."""
+    
+    def __init__(self):
+        self.chunks = []
+    
+    async def bulk_create_organizations(self, items):
+        self.chunks.append([item["organization_name"] for item in items])
+        return [
+            {
+                "organization_name": item["organization_name"],
+                "status": "created",
+                "organization": {"id": ObjectId(), "organization_name": item["organization_name"]},
+                "error": None
+            }
+            for item in items
+        ]
+
+
+def _item(name):
+    return {"organization_name": name, "email": f"{name}@example.com", "password": "secret123"}
+
+
+def _ndjson(*names):
+    return b"".join(orjson.dumps(_item(name)) + b"\n" for name in names)
+
+
+@pytest.fixture
+def service():
+    service = FakeOrganizationService()
+    app.dependency_overrides[get_organization_service] = lambda: service
+    yield service
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+async def client(service):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+def _results(response):
+    return [orjson.loads(line) for line in response.content.splitlines()]
+
+
+@pytest.mark.anyio
+async def test_json_body_returns_the_service_results_unvalidated(client):
+    response = await client.post("/org/bulk-create", json={"organizations": [_item("acme"), _item("globex")]})
+    
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["created"], body["failed"]) == (2, 0)
+    # The organization dicts are passed through as-is, not reshaped by the response model
+    assert set(body["results"][0]["organization"]) == {"id", "organization_name"}
+
+
+@pytest.mark.anyio
+async def test_json_body_over_the_cap_is_rejected(client, monkeypatch):
+    monkeypatch.setattr(settings, "bulk_create_max_request_bytes", 64)
+    
+    response = await client.post("/org/bulk-create", json={"organizations": [_item("acme"), _item("globex")]})
+    
+    assert response.status_code == 413
+
+
+@pytest.mark.anyio
+async def test_ndjson_declared_length_over_the_cap_is_rejected(client, service, monkeypatch):
+    monkeypatch.setattr(settings, "bulk_create_max_ndjson_bytes", 64)
+    
+    response = await client.post(
+        "/org/bulk-create",
+        content=_ndjson("acme", "globex"),
+        headers={"Content-Type": "application/x-ndjson"}
+    )
+    
+    assert response.status_code == 413
+    assert service.chunks == []
+
+
+@pytest.mark.anyio
+async def test_ndjson_reports_oversized_and_invalid_lines_individually(client, service, monkeypatch):
+    monkeypatch.setattr(settings, "bulk_create_max_line_bytes", 128)
+    body = _ndjson("acme") + b'{"organization_name": "' + b"x" * 500 + b'"}\n' + b"{}\n" + _ndjson("globex")
+    
+    response = await client.post("/org/bulk-create", content=body, headers={"Content-Type": "application/x-ndjson"})
+    
+    results = _results(response)
+    assert [result["index"] for result in results] == [1, 2, 0, 3]
+    assert "exceeds 128 bytes" in results[0]["error"]
+    assert results[1]["status"] == "error"
+    assert service.chunks == [["acme", "globex"]]
+
+
+@pytest.mark.anyio
+async def test_ndjson_stream_over_the_cap_stops_reading(client, service, monkeypatch):
+    monkeypatch.setattr(settings, "bulk_create_max_ndjson_bytes", 200)
+    monkeypatch.setattr(settings, "bulk_create_chunk_size", 1)
+    
+    async def body():
+        # No Content-Length, so the cap is enforced while reading
+        for name in ("acme", "globex", "initech", "hooli"):
+            yield _ndjson(name)
+    
+    response = await client.post("/org/bulk-create", content=body(), headers={"Content-Type": "application/x-ndjson"})
+    
+    results = _results(response)
+    assert [result["status"] for result in results] == ["created", "created", "error"]
+    assert results[-1]["index"] == 2
+    assert "exceeds 200 bytes" in results[-1]["error"]
+    assert service.chunks == [["acme"], ["globex"]]
+
+
+@pytest.mark.anyio
+async def test_ndjson_results_stream_before_the_body_is_read(service, monkeypatch):
+    monkeypatch.setattr(settings, "bulk_create_chunk_size", 1)
+    body = [_ndjson("acme"), _ndjson("globex")]
+    sent = []
+    first_result = anyio.Event()
+    
+    async def receive():
+        if len(body) == 1:
+            # Hand over the last line only after the first result went out
+            with anyio.fail_after(2):
+                await first_result.wait()
+        return {"type": "http.request", "body": body.pop(0), "more_body": bool(body)}
+    
+    async def send(message):
+        sent.append(message)
+        if message["type"] == "http.response.body" and message.get("body"):
+            first_result.set()
+    
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/org/bulk-create",
+        "raw_path": b"/org/bulk-create",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"content-type", b"application/x-ndjson"), (b"host", b"test")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("test", 80),
+        "app": app
+    }
+    with anyio.fail_after(5):
+        await app(scope, receive, send)
+    
+    lines = [orjson.loads(message["body"]) for message in sent if message.get("body")]
+    assert [line["organization_name"] for line in lines] == ["acme", "globex"]
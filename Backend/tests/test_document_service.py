@@ -0,0 +1,78 @@
+"""Tests for the tenant document service."""
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+from app.services.document_service import INVALID_ID_ERROR, TenantDocumentService
+from app.services.tenant_storage import TenantStorageRouter
+from app.services.write_coalescer import WriteCoalescer
+
+
+class FakeOrganizationService:
+    """Resolves every organization to one tenant location."""
+    
+    def __init__(self, location):
+        self.location = location
+    
+    async def get_tenant_location(self, organization_name, admin_user_id, writable=False):
+        return self.location
+
+
+@pytest.fixture(params=["collection", "shared"])
+async def service(request, database):
+    org_data = {"_id": ObjectId(), "organization_name": "Acme", "collection_name": "org_acme"}
+    location = TenantStorageRouter(database).get(request.param).locate(org_data)
+    coalescer = WriteCoalescer(max_batch_size=100, max_delay=0.01)
+    yield TenantDocumentService(FakeOrganizationService(location), coalescer)
+    await coalescer.close()
+
+
+@pytest.mark.anyio
+async def test_only_object_ids_are_accepted(service):
+    given = ObjectId()
+    
+    results = await service.insert_documents("Acme", "admin", [{"_id": given}, {"_id": "a"}, {"_id": 7}, {}])
+    
+    assert [result["status"] for result in results] == ["inserted", "error", "error", "inserted"]
+    assert results[0]["inserted_id"] == given
+    assert results[1]["error"] == INVALID_ID_ERROR
+    assert isinstance(results[3]["inserted_id"], ObjectId)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("descending", [False, True])
+async def test_pages_cover_every_document(service, descending):
+    await service.insert_documents("Acme", "admin", [{"n": n} for n in range(7)])
+    seen, cursor = [], None
+    
+    while True:
+        page = await service.find_documents("Acme", "admin", {}, 3, cursor=cursor, descending=descending)
+        seen.extend(document["n"] for document in page["documents"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    
+    assert sorted(seen) == list(range(7))
+    assert seen == sorted(seen, reverse=descending)
+
+
+@pytest.mark.anyio
+async def test_get_document_by_hex_id(service):
+    results = await service.insert_documents("Acme", "admin", [{"n": 1}])
+    document_id = str(results[0]["inserted_id"])
+    
+    assert (await service.get_document("Acme", "admin", document_id))["n"] == 1
+    for missing in (str(ObjectId()), "not-an-object-id"):
+        with pytest.raises(HTTPException) as error:
+            await service.get_document("Acme", "admin", missing)
+        assert error.value.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_export_streams_matching_documents_without_scope_fields(service):
+    await service.insert_documents("Acme", "admin", [{"n": n} for n in range(5)])
+    
+    documents = await service.export_documents("Acme", "admin", {"n": {"$gte": 2}}, fields=["n"])
+    
+    exported = [document async for document in documents]
+    assert [document["n"] for document in exported] == [2, 3, 4]
+    assert all(set(document) == {"_id", "n"} for document in exported)
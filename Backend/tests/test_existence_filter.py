@@ -0,0 +1,107 @@
+"""Tests for the counting Bloom filter and the existence filters built on it."""
+from datetime import datetime
+import pytest
+from fastapi import HTTPException
+from app.services.existence_filter import CountingBloomFilter, ExistenceFilter
+from app.services.organization_service import OrganizationService
+
+
+def test_added_keys_are_always_contained():
+    bloom = CountingBloomFilter(capacity=1000, error_rate=0.01)
+    keys = [f"org-{index}" for index in range(1000)]
+    for key in keys:
+        bloom.add(key)
+    
+    assert all(key in bloom for key in keys)
+    assert bloom.count == 1000
+
+
+def test_remove_forgets_the_key_but_keeps_the_others():
+    bloom = CountingBloomFilter(capacity=100, error_rate=0.01)
+    for key in ("acme", "globex", "initech"):
+        bloom.add(key)
+    
+    bloom.remove("globex")
+    
+    assert "globex" not in bloom
+    assert "acme" in bloom
+    assert "initech" in bloom
+    assert bloom.count == 2
+
+
+def test_key_added_twice_survives_one_remove():
+    bloom = CountingBloomFilter(capacity=100, error_rate=0.01)
+    bloom.add("acme")
+    bloom.add("acme")
+    
+    bloom.remove("acme")
+    
+    assert "acme" in bloom
+
+
+def test_removing_an_absent_key_changes_nothing():
+    bloom = CountingBloomFilter(capacity=100, error_rate=0.01)
+    bloom.add("acme")
+    counters = bytes(bloom.counters)
+    
+    bloom.remove("never-added")
+    
+    assert bytes(bloom.counters) == counters
+    assert bloom.count == 1
+
+
+def test_saturated_counters_never_drop_to_zero():
+    bloom = CountingBloomFilter(capacity=10, error_rate=0.1)
+    for _ in range(300):
+        bloom.add("hot")
+    for _ in range(300):
+        bloom.remove("hot")
+    
+    assert "hot" in bloom
+
+
+@pytest.fixture
+async def existence_filter(database):
+    now = datetime.utcnow()
+    await database["organizations"].insert_one({"organization_name": "Acme", "updated_at": now})
+    await database["admin_users"].insert_one({"email": "admin@acme.com", "created_at": now})
+    existence_filter = ExistenceFilter(database, capacity=1000, error_rate=0.01, sync_interval=1)
+    await existence_filter.warm()
+    return existence_filter
+
+
+@pytest.mark.anyio
+async def test_warm_filter_rules_out_unknown_keys(existence_filter):
+    assert existence_filter.might_have_organization("Acme")
+    assert existence_filter.might_have_email("admin@acme.com")
+    assert not existence_filter.might_have_organization("Globex")
+    assert not existence_filter.might_have_email("admin@globex.com")
+
+
+@pytest.mark.anyio
+async def test_sync_adds_other_workers_writes_once(existence_filter, database):
+    await database["organizations"].insert_one({"organization_name": "Globex", "updated_at": datetime.utcnow()})
+    
+    await existence_filter.sync()
+    # The next poll overlaps the previous one and sees Globex again
+    await existence_filter.sync()
+    existence_filter.remove(organization_name="Globex")
+    
+    assert not existence_filter.might_have_organization("Globex")
+    assert existence_filter.might_have_organization("Acme")
+
+
+@pytest.mark.anyio
+async def test_service_answers_definite_misses_without_a_query(existence_filter, database):
+    service = OrganizationService(database, existence_filter=existence_filter)
+    
+    async def fail_fetch(match, include_deleted=False):
+        raise AssertionError(f"unexpected query for {match}")
+    
+    service._fetch_organizations = fail_fetch
+    
+    with pytest.raises(HTTPException) as error:
+        await service.get_organization("Globex")
+    
+    assert error.value.status_code == 404
+    assert (await service.get_organizations(["Globex"]))["not_found"] == ["Globex"]
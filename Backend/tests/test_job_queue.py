@@ -0,0 +1,159 @@
+"""Tests for the MongoDB-backed job queue and the job status routes."""
+import asyncio
+import httpx
+import pytest
+from app.auth.jwt_handler import create_access_token
+from app.dependencies import get_job_queue, get_organization_service
+from app.main import app
+from app.services.job_queue import CANCELLED, FAILED, SUCCEEDED, JobQueue
+
+
+async def wait_for_status(queue: JobQueue, job_id, *statuses: str, timeout: float = 5) -> dict:
+    async def poll():
+        while True:
+            job = await queue.get(str(job_id))
+            if job["status"] in statuses:
+                return job
+            await asyncio.sleep(0.01)
+    
+    return await asyncio.wait_for(poll(), timeout)
+
+
+@pytest.fixture
+async def queue(database):
+    queue = JobQueue(workers=2, max_attempts=1, poll_interval=0.01, lease_seconds=30)
+    yield queue
+    await queue.stop()
+
+
+@pytest.mark.anyio
+async def test_job_runs_and_reports_progress(queue, database):
+    async def handler(job, report):
+        await report({"copied": 5})
+        return {"total": job["payload"]["n"] * 2}
+    
+    queue.register("double", handler)
+    await queue.start(database)
+    job = await queue.enqueue("double", "tenant-a", {"n": 21})
+    
+    finished = await wait_for_status(queue, job["_id"], SUCCEEDED, FAILED)
+    
+    assert finished["status"] == SUCCEEDED
+    assert finished["result"] == {"total": 42}
+    assert finished["progress"] == {"copied": 5}
+    assert finished["attempts"] == 1
+    assert await database["job_locks"].count_documents({}) == 0
+
+
+@pytest.mark.anyio
+async def test_failed_job_records_the_error(queue, database):
+    async def handler(job, report):
+        raise RuntimeError("disk full")
+    
+    queue.register("broken", handler)
+    await queue.start(database)
+    job = await queue.enqueue("broken", "tenant-a", {})
+    
+    finished = await wait_for_status(queue, job["_id"], FAILED, SUCCEEDED)
+    
+    assert finished["status"] == FAILED
+    assert finished["error"] == "RuntimeError: disk full"
+
+
+@pytest.mark.anyio
+async def test_queued_job_can_be_cancelled(queue, database):
+    queue.bind(database)
+    job = await queue.enqueue("anything", "tenant-a", {})
+    
+    cancelled = await queue.cancel(str(job["_id"]))
+    
+    assert cancelled["status"] == CANCELLED
+    assert await queue.cancel("not-an-id") is None
+    assert await queue.get("not-an-id") is None
+
+
+@pytest.mark.anyio
+async def test_running_job_can_be_cancelled(queue, database):
+    started = asyncio.Event()
+    
+    async def handler(job, report):
+        started.set()
+        await asyncio.sleep(60)
+    
+    queue.register("slow", handler)
+    await queue.start(database)
+    job = await queue.enqueue("slow", "tenant-a", {})
+    await asyncio.wait_for(started.wait(), 5)
+    
+    await queue.cancel(str(job["_id"]))
+    
+    finished = await wait_for_status(queue, job["_id"], CANCELLED)
+    assert finished["finished_at"] is not None
+
+
+@pytest.mark.anyio
+async def test_jobs_for_one_tenant_never_overlap(queue, database):
+    running = {"tenant-a": 0}
+    overlaps = []
+    
+    async def handler(job, report):
+        running[job["tenant"]] += 1
+        overlaps.append(running[job["tenant"]])
+        await asyncio.sleep(0.02)
+        running[job["tenant"]] -= 1
+    
+    queue.register("work", handler)
+    await queue.start(database)
+    jobs = [await queue.enqueue("work", "tenant-a", {}) for _ in range(3)]
+    
+    for job in jobs:
+        await wait_for_status(queue, job["_id"], SUCCEEDED)
+    
+    assert max(overlaps) == 1
+
+
+class FakeOrganizationService:
+    """Acme (tenant ``org-acme``) is administered by ``admin-acme``."""
+    
+    async def is_organization_admin(self, organization_id, admin_user_id):
+        return (organization_id, admin_user_id) == ("org-acme", "admin-acme")
+
+
+@pytest.fixture
+async def client(queue, database):
+    queue.bind(database)
+    app.dependency_overrides[get_job_queue] = lambda: queue
+    app.dependency_overrides[get_organization_service] = FakeOrganizationService
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+def bearer(admin_user_id: str) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'sub': admin_user_id})}"}
+
+
+@pytest.mark.anyio
+async def test_job_routes_serve_the_organization_admin(client, queue):
+    job = await queue.enqueue("anything", "org-acme", {})
+    
+    status = await client.get(f"/org/jobs/{job['_id']}", headers=bearer("admin-acme"))
+    cancelled = await client.post(f"/org/jobs/{job['_id']}/cancel", headers=bearer("admin-acme"))
+    
+    assert status.status_code == 200
+    assert cancelled.json()["status"] == CANCELLED
+
+
+@pytest.mark.anyio
+async def test_other_admins_cannot_see_or_cancel_a_job(client, queue):
+    job = await queue.enqueue("anything", "org-acme", {})
+    
+    missing = await client.get(f"/org/jobs/{job['_id']}")
+    status = await client.get(f"/org/jobs/{job['_id']}", headers=bearer("admin-globex"))
+    cancelled = await client.post(f"/org/jobs/{job['_id']}/cancel", headers=bearer("admin-globex"))
+    
+    assert missing.status_code == 401
+    # Reported as missing, so job ids cannot be probed
+    assert status.status_code == 404
+    assert cancelled.status_code == 404
+    assert (await queue.get(str(job["_id"])))["status"] != CANCELLED
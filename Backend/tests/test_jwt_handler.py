@@ -0,0 +1,125 @@
+"""Tests for token verification and its memoization."""
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+from app.auth import jwt_handler
+from app.auth.jwt_handler import TokenVerifier, build_backend, create_access_token
+from app.dependencies import get_current_admin
+
+
+class CountingBackend:
+    """Decodes tokens from a fixed table and counts the calls."""
+    
+    def __init__(self, tokens: dict):
+        self.tokens = tokens
+        self.decodes = 0
+    
+    def decode(self, token: str):
+        self.decodes += 1
+        payload = self.tokens.get(token)
+        return dict(payload) if payload is not None else None
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(jwt_handler, "time", SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+def test_valid_token_is_decoded_once(clock):
+    backend = CountingBackend({"a": {"sub": "1", "exp": 1060}})
+    verifier = TokenVerifier(backend)
+    
+    assert verifier.verify("a") == {"sub": "1", "exp": 1060}
+    assert verifier.verify("a") == {"sub": "1", "exp": 1060}
+    assert backend.decodes == 1
+    assert verifier.hits == 1
+
+
+def test_cached_claims_cannot_be_mutated_by_callers(clock):
+    verifier = TokenVerifier(CountingBackend({"a": {"sub": "1", "exp": 1060}}))
+    
+    verifier.verify("a")["sub"] = "2"
+    
+    assert verifier.verify("a")["sub"] == "1"
+
+
+def test_expired_entry_is_checked_again(clock):
+    backend = CountingBackend({"a": {"sub": "1", "exp": 1060}})
+    verifier = TokenVerifier(backend)
+    verifier.verify("a")
+    
+    clock.now = 1060
+    # The backend is the one that rejects expired tokens
+    backend.tokens.clear()
+    
+    assert verifier.verify("a") is None
+    assert backend.decodes == 2
+    assert verifier.verify("a") is None
+    assert backend.decodes == 3
+
+
+def test_invalid_and_non_expiring_tokens_are_not_cached(clock):
+    backend = CountingBackend({"forever": {"sub": "1"}})
+    verifier = TokenVerifier(backend)
+    
+    assert verifier.verify("forged") is None
+    assert verifier.verify("forever") == {"sub": "1"}
+    assert verifier.verify("forever") == {"sub": "1"}
+    assert backend.decodes == 3
+
+
+def test_cache_is_bounded(clock):
+    backend = CountingBackend({str(index): {"sub": str(index), "exp": 2000} for index in range(5)})
+    verifier = TokenVerifier(backend, max_entries=2)
+    for index in range(5):
+        verifier.verify(str(index))
+    
+    verifier.verify("0")
+    
+    assert backend.decodes == 6
+
+
+def test_jose_backend_rejects_expired_tokens():
+    backend = build_backend("jose", "secret", "HS256")
+    fresh = backend.encode({"sub": "1", "exp": int(time.time()) + 60})
+    expired = backend.encode({"sub": "1", "exp": int(time.time()) - 60})
+    
+    assert backend.decode(fresh)["sub"] == "1"
+    assert backend.decode(expired) is None
+    assert backend.decode(fresh + "x") is None
+
+
+@pytest.fixture
+def admin_app():
+    jwt_handler.token_verifier.clear()
+    application = FastAPI()
+    
+    @application.get("/me")
+    async def me(admin: dict = Depends(get_current_admin)):
+        return {"sub": admin["sub"]}
+    
+    yield application
+    jwt_handler.token_verifier.clear()
+
+
+@pytest.mark.anyio
+async def test_admin_dependency_reuses_verified_tokens(admin_app):
+    token = create_access_token({"sub": "admin-id"})
+    expired = create_access_token({"sub": "admin-id"}, expires_delta=timedelta(minutes=-1))
+    hits = jwt_handler.token_verifier.hits
+    
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=admin_app), base_url="http://test") as client:
+        first = await client.get("/me", headers={"Authorization": f"Bearer {token}"})
+        second = await client.get("/me", headers={"Authorization": f"Bearer {token}"})
+        tampered = await client.get("/me", headers={"Authorization": f"Bearer {token}x"})
+        stale = await client.get("/me", headers={"Authorization": f"Bearer {expired}"})
+    
+    assert first.json() == second.json() == {"sub": "admin-id"}
+    assert jwt_handler.token_verifier.hits == hits + 1
+    assert tampered.status_code == 401
+    assert stale.status_code == 401
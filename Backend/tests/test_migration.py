@@ -0,0 +1,75 @@
+"""Tests for the collection migration engine used by renames."""
+import pytest
+from bson import ObjectId
+from pymongo.errors import OperationFailure
+from app.services.migration import CollectionMigrator
+
+
+@pytest.mark.anyio
+async def test_rename_moves_the_collection(database):
+    await database["org_acme"].insert_many([{"n": n} for n in range(5)])
+    
+    result = await CollectionMigrator(database).migrate("org_acme", "org_acme_corp")
+    
+    assert result["strategy"] == "rename"
+    assert await database["org_acme_corp"].count_documents({}) == 5
+    assert "org_acme" not in await database.list_collection_names()
+
+
+@pytest.mark.anyio
+async def test_migrating_a_collection_onto_itself_keeps_it(database):
+    await database["org_acme"].insert_many([{"n": n} for n in range(5)])
+    
+    result = await CollectionMigrator(database).migrate("org_acme", "org_acme")
+    
+    assert result == {"strategy": "noop", "copied": 0}
+    assert await database["org_acme"].count_documents({}) == 5
+
+
+@pytest.mark.anyio
+async def test_unexpected_rename_failure_keeps_the_source(database):
+    await database["org_acme"].insert_many([{"n": n} for n in range(5)])
+    await database["org_taken"].insert_one({"n": 0})
+    
+    with pytest.raises(OperationFailure):
+        await CollectionMigrator(database).migrate("org_acme", "org_taken")
+    
+    assert await database["org_acme"].count_documents({}) == 5
+    assert await database["org_taken"].count_documents({}) == 1
+
+
+@pytest.mark.anyio
+async def test_copy_streams_in_batches_and_reports_progress(database):
+    await database["org_acme"].insert_many([{"n": n} for n in range(25)])
+    progress = []
+    migrator = CollectionMigrator(database, batch_size=10, progress_callback=progress.append)
+    
+    result = await migrator.migrate("org_acme", "org_acme_corp", allow_rename=False)
+    
+    assert result == {"strategy": "copy", "copied": 25}
+    assert [update["copied"] for update in progress] == [10, 20, 25]
+    assert await database["org_acme_corp"].count_documents({}) == 25
+    assert "org_acme" not in await database.list_collection_names()
+    assert await migrator.pending() == []
+
+
+@pytest.mark.anyio
+async def test_resume_copies_ids_of_every_type(database):
+    documents = [{"_id": ObjectId()}, {"_id": ObjectId()}, {"_id": 7}, {"_id": "a"}, {"_id": "b"}, {"_id": "c"}]
+    await database["org_acme"].insert_many(documents)
+    # Interrupted after copying "a" and "b": the checkpoint points at "b"
+    await database["org_acme_corp"].insert_many([{"_id": "a"}, {"_id": "b"}])
+    await database["collection_migrations"].insert_one({
+        "_id": "org_acme->org_acme_corp",
+        "source": "org_acme",
+        "target": "org_acme_corp",
+        "copied": 2,
+        "total": 6,
+        "last_id": "b"
+    })
+    
+    await CollectionMigrator(database).migrate("org_acme", "org_acme_corp")
+    
+    copied = await database["org_acme_corp"].distinct("_id")
+    assert sorted(map(str, copied)) == sorted(str(document["_id"]) for document in documents)
+    assert "org_acme" not in await database.list_collection_names()
@@ -0,0 +1,78 @@
+"""Tests for the operator-only endpoints."""
+import httpx
+import pytest
+from fastapi import FastAPI
+from app.api import internal, profiling
+from app.auth.jwt_handler import create_access_token
+from app.config import settings
+from app.main import app
+
+
+@pytest.fixture
+def operator_token(monkeypatch):
+    monkeypatch.setattr(settings, "operator_token", "operator-secret")
+    return "operator-secret"
+
+
+def _client(application):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=application), base_url="http://test")
+
+
+@pytest.fixture
+def profiling_app():
+    application = FastAPI()
+    application.include_router(profiling.router)
+    return application
+
+
+@pytest.mark.anyio
+async def test_profiles_are_disabled_without_an_operator_token(monkeypatch, profiling_app):
+    monkeypatch.setattr(settings, "operator_token", None)
+    async with _client(profiling_app) as client:
+        response = await client.get("/internal/profiles", headers={"Authorization": "Bearer anything"})
+    assert response.status_code == 403
+
+
+@pytest.mark.anyio
+async def test_profiles_reject_tenant_admin_tokens(operator_token, profiling_app):
+    admin_token = create_access_token({"sub": "admin-id", "org_id": "org-id"})
+    async with _client(profiling_app) as client:
+        missing = await client.get("/internal/profiles")
+        admin = await client.get("/internal/profiles", headers={"Authorization": f"Bearer {admin_token}"})
+    assert missing.status_code == 401
+    assert admin.status_code == 401
+
+
+@pytest.mark.anyio
+async def test_profiles_accept_the_operator_token(operator_token, profiling_app):
+    async with _client(profiling_app) as client:
+        response = await client.get("/internal/profiles", headers={"Authorization": f"Bearer {operator_token}"})
+    assert response.status_code == 200
+    assert "profiles" in response.json()
+
+
+@pytest.fixture
+def internal_app():
+    application = FastAPI()
+    application.include_router(internal.router)
+    return application
+
+
+@pytest.mark.anyio
+async def test_database_metrics_require_the_operator_token(operator_token, internal_app):
+    async with _client(internal_app) as client:
+        missing = await client.get("/internal/metrics/db")
+        allowed = await client.get("/internal/metrics/db", headers={"Authorization": f"Bearer {operator_token}"})
+    assert missing.status_code == 401
+    assert allowed.status_code == 200
+    assert set(allowed.json()) == {"pool", "commands"}
+
+
+@pytest.mark.anyio
+async def test_prometheus_metrics_require_the_operator_token(operator_token):
+    async with _client(app) as client:
+        missing = await client.get("/metrics")
+        allowed = await client.get("/metrics", headers={"Authorization": f"Bearer {operator_token}"})
+    assert missing.status_code == 401
+    assert allowed.status_code == 200
+    assert allowed.headers["content-type"].startswith("text/plain")
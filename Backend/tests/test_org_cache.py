@@ -0,0 +1,95 @@
+"""Tests for the organization metadata cache."""
+from types import SimpleNamespace
+import pytest
+from bson import ObjectId
+from app.services import org_cache
+from app.services.org_cache import OrganizationCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(org_cache, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+def record(name: str) -> dict:
+    return {"_id": ObjectId(), "organization_name": name}
+
+
+def test_lookup_by_name_and_id(clock):
+    cache = OrganizationCache()
+    acme = record("Acme")
+    cache.set(acme)
+    
+    assert cache.get_by_name("Acme") is acme
+    assert cache.get_by_id(acme["_id"]) is acme
+    assert cache.get_by_id(str(acme["_id"])) is acme
+    assert cache.get_by_name("Globex") is None
+    assert cache.stats()["hits"] == 3
+    assert cache.stats()["misses"] == 1
+
+
+def test_entries_expire_after_the_ttl(clock):
+    cache = OrganizationCache(ttl_seconds=60)
+    acme = record("Acme")
+    cache.set(acme)
+    
+    clock.now += 59
+    assert cache.get_by_name("Acme") is acme
+    clock.now += 1
+    assert cache.get_by_name("Acme") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = OrganizationCache(max_entries=2)
+    acme, globex, initech = record("Acme"), record("Globex"), record("Initech")
+    cache.set(acme)
+    cache.set(globex)
+    cache.get_by_name("Acme")
+    
+    cache.set(initech)
+    
+    assert cache.get_by_name("Globex") is None
+    assert cache.get_by_name("Acme") is acme
+    assert cache.get_by_name("Initech") is initech
+
+
+def test_rename_replaces_the_old_name(clock):
+    cache = OrganizationCache()
+    acme = record("Acme")
+    cache.set(acme)
+    
+    cache.set({**acme, "organization_name": "Acme Corp"})
+    
+    assert cache.get_by_name("Acme") is None
+    assert cache.get_by_name("Acme Corp")["_id"] == acme["_id"]
+
+
+def test_invalidate_by_name_or_id(clock):
+    cache = OrganizationCache()
+    acme, globex = record("Acme"), record("Globex")
+    cache.set(acme)
+    cache.set(globex)
+    
+    cache.invalidate(organization_name="Acme")
+    cache.invalidate(org_id=globex["_id"])
+    
+    assert cache.get_by_id(acme["_id"]) is None
+    assert cache.get_by_name("Globex") is None
+
+
+def test_disabled_cache_stores_nothing(clock):
+    cache = OrganizationCache(max_entries=0)
+    cache.set(record("Acme"))
+    
+    assert cache.get_by_name("Acme") is None
@@ -0,0 +1,130 @@
+"""Tests for the organization listing and its NDJSON export."""
+from datetime import datetime, timedelta
+import httpx
+import orjson
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+from app.dependencies import get_organization_service
+from app.main import app
+from app.services.organization_service import OrganizationService, decode_list_cursor, encode_list_cursor
+
+
+@pytest.fixture
+async def service(database):
+    created = datetime(2024, 1, 1)
+    await database["organizations"].insert_many([
+        {
+            "organization_name": f"Org {index:02d}",
+            "collection_name": f"org_org_{index:02d}",
+            "admin_user_id": str(ObjectId()),
+            # Pairs share a created_at, so the _id tie-breaker matters
+            "created_at": created + timedelta(minutes=index // 2),
+            "updated_at": created
+        }
+        for index in range(11)
+    ])
+    await database["organizations"].insert_one({
+        "organization_name": "Gone",
+        "collection_name": "org_gone",
+        "admin_user_id": str(ObjectId()),
+        "created_at": created,
+        "deleted_at": created
+    })
+    return OrganizationService(database)
+
+
+@pytest.fixture
+async def client(service):
+    app.dependency_overrides[get_organization_service] = lambda: service
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+def test_cursor_round_trip_on_id():
+    document = {"_id": ObjectId()}
+    
+    position = decode_list_cursor(encode_list_cursor("_id", False, document), "_id", False)
+    
+    assert position["id"] == document["_id"]
+    assert "value" not in position
+
+
+def test_cursor_round_trip_keeps_the_sort_value_type():
+    document = {"_id": ObjectId(), "created_at": datetime(2024, 5, 1, 12, 30)}
+    
+    position = decode_list_cursor(encode_list_cursor("created_at", True, document), "created_at", True)
+    
+    assert position["id"] == document["_id"]
+    assert position["value"] == document["created_at"]
+
+
+@pytest.mark.parametrize("sort, descending", [("organization_name", False), ("_id", True)])
+def test_cursor_for_another_ordering_is_rejected(sort, descending):
+    cursor = encode_list_cursor("_id", False, {"_id": ObjectId()})
+    
+    with pytest.raises(HTTPException) as error:
+        decode_list_cursor(cursor, sort, descending)
+    
+    assert error.value.status_code == 400
+
+
+@pytest.mark.parametrize("cursor", ["", "not base64!", "bm90IGpzb24=", "eyJmb28iOiAxfQ=="])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_list_cursor(cursor, "_id", False)
+    
+    assert error.value.status_code == 400
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("sort", ["_id", "organization_name", "created_at"])
+@pytest.mark.parametrize("descending", [False, True])
+async def test_pages_cover_every_live_organization_once(service, sort, descending):
+    names, cursor = [], None
+    while True:
+        page = await service.list_organizations(4, cursor=cursor, sort=sort, descending=descending)
+        names.extend(item["organization_name"] for item in page["organizations"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    
+    assert sorted(names) == [f"Org {index:02d}" for index in range(11)]
+
+
+@pytest.mark.anyio
+async def test_prefix_and_fields(service):
+    page = await service.list_organizations(50, prefix="Org 1", fields=("organization_name",))
+    
+    assert page["organizations"] == [{"organization_name": "Org 10"}]
+
+
+@pytest.mark.anyio
+async def test_export_ends_with_a_cursor_when_truncated(service):
+    rows = [row async for row in await service.export_organizations(limit=5, sort="organization_name")]
+    
+    assert [row["organization_name"] for row in rows[:5]] == [f"Org {index:02d}" for index in range(5)]
+    rest = [row async for row in await service.export_organizations(
+        limit=50, cursor=rows[5]["next_cursor"], sort="organization_name"
+    )]
+    assert [row["organization_name"] for row in rest] == [f"Org {index:02d}" for index in range(5, 11)]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("format", ["json", "ndjson"])
+async def test_invalid_cursor_is_rejected_before_streaming(client, format):
+    response = await client.get("/org/list", params={"cursor": "garbage", "format": format})
+    
+    assert response.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_ndjson_export_route(client):
+    response = await client.get("/org/list", params={"format": "ndjson", "limit": 3})
+    
+    rows = [orjson.loads(line) for line in response.text.splitlines()]
+    assert response.status_code == 200
+    assert len(rows) == 4
+    assert "next_cursor" in rows[-1]
+    assert "admin_email" not in rows[0]
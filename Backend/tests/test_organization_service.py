@@ -0,0 +1,219 @@
+"""Tests for organization service writes, reads, caching and tenant access."""
+import asyncio
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+from app import database as database_module
+from app.indexes import ensure_master_indexes
+from app.services.migration import CollectionMigrator
+from app.services.organization_service import OrganizationService
+
+
+@pytest.mark.anyio
+async def test_concurrent_creates_without_transactions_leave_one_organization(database, monkeypatch):
+    monkeypatch.setattr(database_module.db, "transactions", False)
+    await ensure_master_indexes(database)
+    service = OrganizationService(database)
+    
+    # Every contender passes the existence check before any of them inserts
+    outcomes = await asyncio.gather(
+        *(service.create_organization("Acme", f"admin{index}@acme.com", "password123") for index in range(10)),
+        return_exceptions=True
+    )
+    
+    created = [outcome for outcome in outcomes if isinstance(outcome, dict)]
+    rejected = [outcome for outcome in outcomes if isinstance(outcome, HTTPException)]
+    assert len(created) == 1
+    assert len(rejected) == 9
+    assert all(error.status_code == 400 for error in rejected)
+    assert await database["organizations"].count_documents({"organization_name": "Acme"}) == 1
+    # The losers' admin users were rolled back by hand
+    admins = await database["admin_users"].find({}, {"email": 1}).to_list(length=None)
+    assert [admin["email"] for admin in admins] == [created[0]["admin_email"]]
+
+
+@pytest.mark.anyio
+async def test_concurrent_creates_with_one_email_register_it_once(database, monkeypatch):
+    monkeypatch.setattr(database_module.db, "transactions", False)
+    await ensure_master_indexes(database)
+    service = OrganizationService(database)
+    
+    outcomes = await asyncio.gather(
+        *(service.create_organization(f"Org {index}", "admin@acme.com", "password123") for index in range(5)),
+        return_exceptions=True
+    )
+    
+    assert sum(isinstance(outcome, dict) for outcome in outcomes) == 1
+    assert await database["admin_users"].count_documents({"email": "admin@acme.com"}) == 1
+    assert await database["organizations"].count_documents({}) == 1
+
+
+async def create_acme(database, name: str = "Acme") -> OrganizationService:
+    await ensure_master_indexes(database)
+    service = OrganizationService(database)
+    await service.create_organization(name, "admin@acme.com", "password123")
+    return service
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("old_name, new_name", [("Acme", "acme"), ("Acme Corp", "acme_corp")])
+async def test_rename_to_the_same_collection_keeps_the_data(mongo_database, monkeypatch, old_name, new_name):
+    service = await create_acme(mongo_database, old_name)
+    migrations = []
+    monkeypatch.setattr(CollectionMigrator, "migrate", lambda self, *names: migrations.append(names))
+    await mongo_database["org_" + old_name.lower().replace(" ", "_")].insert_many([{"n": n} for n in range(5)])
+    
+    result = await service.update_organization(old_name, new_name, "admin@acme.com", "password123")
+    
+    collection = mongo_database[result["collection_name"]]
+    assert result["organization_name"] == new_name
+    assert await collection.count_documents({"n": {"$exists": True}}) == 5
+    org_data = await mongo_database["organizations"].find_one({"organization_name": new_name})
+    assert "migrating_from" not in org_data
+    assert migrations == []
+
+
+@pytest.mark.anyio
+async def test_rename_moves_the_data_to_the_new_collection(mongo_database):
+    service = await create_acme(mongo_database)
+    await mongo_database["org_acme"].insert_many([{"n": n} for n in range(5)])
+    
+    result = await service.update_organization("Acme", "Globex", "admin@acme.com", "password123")
+    
+    assert result["collection_name"] == "org_globex"
+    assert await mongo_database["org_globex"].count_documents({"n": {"$exists": True}}) == 5
+    assert "org_acme" not in await mongo_database.list_collection_names()
+    admin = await mongo_database["admin_users"].find_one({"email": "admin@acme.com"})
+    assert admin["organization_name"] == "Globex"
+    assert (await service.get_organization("Globex"))["collection_name"] == "org_globex"
+
+
+@pytest.mark.anyio
+async def test_get_organization_joins_the_admin(mongo_database):
+    await create_acme(mongo_database)
+    # A fresh service has an empty cache, so this read runs the aggregation
+    service = OrganizationService(mongo_database)
+    
+    result = await service.get_organization("Acme")
+    
+    assert result["organization_name"] == "Acme"
+    assert result["collection_name"] == "org_acme"
+    assert result["admin_email"] == "admin@acme.com"
+
+
+@pytest.mark.anyio
+async def test_get_organizations_keeps_the_requested_order(mongo_database):
+    service = await create_acme(mongo_database)
+    await service.create_organization("Globex", "admin@globex.com", "password123")
+    service = OrganizationService(mongo_database)
+    
+    result = await service.get_organizations(["Globex", "Initech", "Acme", "Globex"])
+    
+    assert [org["organization_name"] for org in result["organizations"]] == ["Globex", "Acme"]
+    assert [org["admin_email"] for org in result["organizations"]] == ["admin@globex.com", "admin@acme.com"]
+    assert result["not_found"] == ["Initech"]
+
+
+@pytest.mark.anyio
+async def test_deleted_organizations_are_not_read(mongo_database):
+    service = await create_acme(mongo_database)
+    await service.delete_organization("Acme", "admin@acme.com")
+    service = OrganizationService(mongo_database)
+    
+    with pytest.raises(HTTPException) as error:
+        await service.get_organization("Acme")
+    
+    assert error.value.status_code == 404
+    assert (await service.get_organizations(["Acme"]))["not_found"] == ["Acme"]
+
+
+def count_fetches(service: OrganizationService) -> list:
+    calls = []
+    fetch = service._fetch_organizations
+    
+    async def counting_fetch(match, include_deleted=False):
+        calls.append(match)
+        return await fetch(match, include_deleted)
+    
+    service._fetch_organizations = counting_fetch
+    return calls
+
+
+@pytest.mark.anyio
+async def test_repeated_reads_are_served_from_the_cache(mongo_database):
+    await create_acme(mongo_database)
+    service = OrganizationService(mongo_database)
+    fetches = count_fetches(service)
+    
+    await service.get_organization("Acme")
+    await service.get_organization("Acme")
+    await service.get_organizations(["Acme"])
+    
+    assert len(fetches) == 1
+
+
+@pytest.mark.anyio
+async def test_rename_and_delete_invalidate_the_cache(mongo_database):
+    service = await create_acme(mongo_database)
+    await service.get_organization("Acme")
+    
+    await service.update_organization("Acme", "Globex", "admin@acme.com", "password123")
+    
+    with pytest.raises(HTTPException) as error:
+        await service.get_organization("Acme")
+    assert error.value.status_code == 404
+    assert (await service.get_organization("Globex"))["collection_name"] == "org_globex"
+    
+    await service.delete_organization("Globex", "admin@acme.com")
+    
+    with pytest.raises(HTTPException) as error:
+        await service.get_organization("Globex")
+    assert error.value.status_code == 404
+
+
+def cached_acme(database, **fields) -> OrganizationService:
+    service = OrganizationService(database)
+    service.cache.set({
+        "_id": ObjectId(),
+        "organization_name": "Acme",
+        "collection_name": "org_acme",
+        "admin_user_id": "admin-id",
+        **fields
+    })
+    return service
+
+
+@pytest.mark.anyio
+async def test_tenant_location_is_resolved_for_the_admin_only(database):
+    service = cached_acme(database)
+    
+    location = await service.get_tenant_location("Acme", "admin-id", writable=True)
+    
+    assert location.collection.name == "org_acme"
+    with pytest.raises(HTTPException) as error:
+        await service.get_tenant_location("Acme", "other-admin-id")
+    assert error.value.status_code == 403
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("fields, writable", [
+    ({"migrating_from": "org_old"}, False),
+    ({"storage_migration": "shared"}, False),
+    ({"cluster_move": {"frozen": True}}, True)
+])
+async def test_tenant_location_is_refused_while_documents_move(database, fields, writable):
+    service = cached_acme(database, **fields)
+    
+    with pytest.raises(HTTPException) as error:
+        await service.get_tenant_location("Acme", "admin-id", writable=writable)
+    
+    assert error.value.status_code == 409
+
+
+@pytest.mark.anyio
+async def test_frozen_cluster_move_still_allows_reads(database):
+    service = cached_acme(database, cluster_move={"frozen": True})
+    
+    location = await service.get_tenant_location("Acme", "admin-id")
+    
+    assert location.collection.name == "org_acme"
@@ -0,0 +1,117 @@
+"""Tests for the in-memory token bucket backend and the route dependency."""
+from types import SimpleNamespace
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+from app import dependencies, rate_limit
+from app.rate_limit import MemoryBackend, RateLimiter, Rule
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+def test_rule_parse():
+    rule = Rule.parse("10/60")
+    
+    assert rule.capacity == 10
+    assert rule.period == 60
+    with pytest.raises(ValueError):
+        Rule.parse("ten per minute")
+    with pytest.raises(ValueError):
+        Rule.parse("0/60")
+
+
+@pytest.mark.anyio
+async def test_burst_up_to_capacity_then_wait(clock):
+    backend = MemoryBackend()
+    rule = Rule(3, 30)
+    
+    assert [await backend.acquire("ip:1", rule) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert await backend.acquire("ip:1", rule) == pytest.approx(10.0)
+    # Other keys have their own bucket
+    assert await backend.acquire("ip:2", rule) == 0.0
+
+
+@pytest.mark.anyio
+async def test_tokens_refill_over_time(clock):
+    backend = MemoryBackend()
+    rule = Rule(3, 30)
+    for _ in range(3):
+        await backend.acquire("ip:1", rule)
+    
+    clock.now += 4
+    assert await backend.acquire("ip:1", rule) == pytest.approx(6.0)
+    clock.now += 7
+    assert await backend.acquire("ip:1", rule) == 0.0
+    assert await backend.acquire("ip:1", rule) > 0
+
+
+@pytest.mark.anyio
+async def test_refilled_buckets_are_evicted(clock):
+    backend = MemoryBackend()
+    rule = Rule(2, 10)
+    await backend.acquire("ip:1", rule)
+    await backend.acquire("ip:2", rule)
+    
+    clock.now += 10
+    await backend.acquire("ip:3", rule)
+    
+    assert len(backend) == 1
+
+
+@pytest.mark.anyio
+async def test_max_keys_bounds_memory(clock):
+    backend = MemoryBackend(max_keys=100)
+    rule = Rule(5, 60)
+    for index in range(1000):
+        await backend.acquire(f"ip:{index}", rule)
+    
+    assert len(backend) <= 100
+
+
+@pytest.fixture
+def limited_app():
+    application = FastAPI()
+    application.state.rate_limiter = RateLimiter(MemoryBackend(), {"/login": {"ip": "10/60", "email": "2/60"}})
+    
+    @application.post("/login", dependencies=[Depends(dependencies.rate_limit("/login"))])
+    async def login(body: dict):
+        return body
+    
+    return application
+
+
+@pytest.mark.anyio
+async def test_route_is_limited_per_email_with_retry_after(clock, limited_app):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=limited_app), base_url="http://test") as client:
+        allowed = [await client.post("/login", json={"email": email}) for email in ("a@x.com", "A@X.com")]
+        limited = await client.post("/login", json={"email": "a@x.com"})
+        other = await client.post("/login", json={"email": "b@x.com"})
+        clock.now += 30
+        refilled = await client.post("/login", json={"email": "a@x.com"})
+    
+    assert [response.status_code for response in allowed] == [200, 200]
+    assert limited.status_code == 429
+    assert limited.headers["Retry-After"] == "30"
+    assert other.status_code == 200
+    assert refilled.status_code == 200
+
+
+@pytest.mark.anyio
+async def test_ip_rule_covers_every_email(clock, limited_app):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=limited_app), base_url="http://test") as client:
+        responses = [await client.post("/login", json={"email": f"user{n}@x.com"}) for n in range(11)]
+    
+    assert [response.status_code for response in responses] == [200] * 10 + [429]
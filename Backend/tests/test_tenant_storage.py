@@ -0,0 +1,134 @@
+"""Tests for tenant storage locations and the copy helpers."""
+import pytest
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+from app.services import organization_service
+from app.services.organization_service import OrganizationService
+from app.services.tenant_storage import (
+    TenantStorageRouter,
+    check_copied,
+    copy_missing_documents,
+    copy_tenant_documents
+)
+
+
+def organization(name: str) -> dict:
+    return {"_id": ObjectId(), "organization_name": name, "collection_name": f"org_{name}"}
+
+
+async def documents(location) -> list:
+    cursor = location.collection.find(location.query({})).sort(location.key, 1)
+    return [location.strip(document) async for document in cursor]
+
+
+@pytest.mark.anyio
+async def test_shared_tenants_can_reuse_an_id(database):
+    router = TenantStorageRouter(database, default="collection")
+    collection, shared = router.get("collection"), router.get("shared")
+    acme, globex = organization("acme"), organization("globex")
+    await database["org_acme"].insert_many([{"_id": "settings", "owner": "acme"}, {"_id": 1}])
+    await database["org_globex"].insert_many([{"_id": "settings", "owner": "globex"}])
+    
+    for org in (acme, globex):
+        await copy_tenant_documents(collection.locate(org), shared.locate(org))
+    
+    assert await documents(shared.locate(acme)) == [{"_id": 1}, {"_id": "settings", "owner": "acme"}]
+    assert await documents(shared.locate(globex)) == [{"_id": "settings", "owner": "globex"}]
+    location = shared.locate(globex)
+    found = await location.collection.find_one(location.query({"$or": [{"_id": "settings"}]}))
+    assert location.strip(found) == {"_id": "settings", "owner": "globex"}
+
+
+@pytest.mark.anyio
+async def test_copies_resume_and_catch_up(database):
+    router = TenantStorageRouter(database, default="collection")
+    acme = organization("acme")
+    source, target = router.get("collection").locate(acme), router.get("shared").locate(acme)
+    await source.collection.insert_many([{"_id": n} for n in range(5)])
+    
+    assert await copy_tenant_documents(source, target, batch_size=2) == 5
+    assert await copy_tenant_documents(source, target, batch_size=2) == 0
+    # Written behind the copy's position while it ran
+    await source.collection.insert_one({"_id": -1})
+    assert await copy_tenant_documents(source, target) == 0
+    assert await copy_missing_documents(source, target) == 1
+    assert [document["_id"] for document in await documents(target)] == [-1, 0, 1, 2, 3, 4]
+
+
+@pytest.mark.anyio
+async def test_copy_raises_on_a_clash_with_another_document(database):
+    router = TenantStorageRouter(database, default="collection")
+    acme = organization("acme")
+    source, target = router.get("collection").locate(acme), router.get("database").locate(acme)
+    await target.collection.create_index("email", unique=True)
+    await target.collection.insert_one({"_id": "a", "email": "x@acme.com"})
+    await source.collection.insert_one({"_id": "b", "email": "x@acme.com"})
+    
+    with pytest.raises(BulkWriteError):
+        await copy_tenant_documents(source, target)
+
+
+@pytest.mark.anyio
+async def test_check_copied_refuses_an_incomplete_target(database):
+    router = TenantStorageRouter(database, default="collection")
+    acme = organization("acme")
+    source, target = router.get("collection").locate(acme), router.get("shared").locate(acme)
+    await source.collection.insert_many([{"_id": 1}, {"_id": 2}])
+    await target.collection.insert_one(target.prepare({"_id": 1}))
+    
+    with pytest.raises(RuntimeError):
+        await check_copied(source, target)
+    await copy_missing_documents(source, target)
+    await check_copied(source, target)
+
+
+@pytest.mark.anyio
+async def test_resumed_storage_migration_copies_ids_of_every_type(database):
+    acme = {**organization("acme"), "storage": "collection", "storage_migration": "shared"}
+    await database["organizations"].insert_one(acme)
+    service = OrganizationService(database, storage=TenantStorageRouter(database, default="collection"))
+    source = service.storage.get("collection").locate(acme)
+    target = service.storage.get("shared").locate(acme)
+    seed = ObjectId()
+    await source.collection.insert_many([{"_id": seed}, {"_id": "a"}, {"_id": "b"}])
+    # Interrupted after copying "a"; the ObjectId sorts after every string
+    await target.collection.insert_one(target.prepare({"_id": "a"}))
+    
+    result = await service.finish_storage_migration("acme")
+    
+    assert result["storage"] == "shared"
+    assert sorted(map(str, [document["_id"] for document in await documents(target)])) == sorted(["a", "b", str(seed)])
+    assert "org_acme" not in await database.list_collection_names()
+    org_data = await database["organizations"].find_one({"_id": acme["_id"]})
+    assert org_data["storage"] == "shared"
+    assert "storage_migration" not in org_data
+
+
+
+@pytest.mark.anyio
+async def test_incomplete_storage_migration_keeps_the_source_and_the_claim(database, monkeypatch):
+    acme = {**organization("acme"), "storage": "collection", "storage_migration": "shared"}
+    await database["organizations"].insert_one(acme)
+    service = OrganizationService(database, storage=TenantStorageRouter(database, default="collection"))
+    source = service.storage.get("collection").locate(acme)
+    await source.collection.insert_many([{"_id": "a"}, {"_id": "b"}])
+    
+    async def copy_first(source, target, progress_callback=None):
+        await target.collection.insert_one(target.prepare({"_id": "a"}))
+        return 1
+    
+    async def copy_none(source, target, progress_callback=None):
+        return 0
+    
+    with monkeypatch.context() as patch:
+        patch.setattr(organization_service, "copy_tenant_documents", copy_first)
+        patch.setattr(organization_service, "copy_missing_documents", copy_none)
+        with pytest.raises(RuntimeError):
+            await service.finish_storage_migration("acme")
+    
+    assert await source.collection.count_documents({}) == 2
+    org_data = await database["organizations"].find_one({"_id": acme["_id"]})
+    assert org_data["storage_migration"] == "shared"
+    # A re-run with working copies completes the migration
+    assert (await service.finish_storage_migration("acme"))["storage"] == "shared"
+    assert "org_acme" not in await database.list_collection_names()
@@ -0,0 +1,81 @@
+"""Tests for the tenant document write coalescer."""
+import asyncio
+import pytest
+from app.services.write_coalescer import DocumentWriteError, WriteCoalescer
+
+
+@pytest.mark.anyio
+async def test_flushes_when_the_batch_is_full(database):
+    collection = database["org_acme"]
+    coalescer = WriteCoalescer(max_batch_size=3, max_delay=60)
+    
+    # The window is a minute long, so only the size can trigger the write
+    ids = await asyncio.wait_for(
+        asyncio.gather(*(coalescer.insert(collection, {"n": n}) for n in range(3))), timeout=5
+    )
+    
+    assert coalescer.batches_written == 1
+    assert coalescer.pending() == 0
+    assert await collection.count_documents({"_id": {"$in": ids}}) == 3
+    await coalescer.close()
+
+
+@pytest.mark.anyio
+async def test_flushes_when_the_window_expires(database):
+    collection = database["org_acme"]
+    coalescer = WriteCoalescer(max_batch_size=100, max_delay=0.02)
+    
+    ids = await asyncio.wait_for(
+        asyncio.gather(*(coalescer.insert(collection, {"n": n}) for n in range(5))), timeout=5
+    )
+    
+    assert coalescer.batches_written == 1
+    assert len(set(ids)) == 5
+    assert await collection.count_documents({}) == 5
+    await coalescer.close()
+
+
+@pytest.mark.anyio
+async def test_batches_are_per_collection(database):
+    coalescer = WriteCoalescer(max_batch_size=2, max_delay=0.02)
+    
+    await asyncio.gather(
+        coalescer.insert(database["org_a"], {"n": 1}),
+        coalescer.insert(database["org_b"], {"n": 2})
+    )
+    
+    assert coalescer.batches_written == 2
+    await coalescer.close()
+
+
+@pytest.mark.anyio
+async def test_rejected_document_fails_alone(database):
+    collection = database["org_acme"]
+    await collection.insert_one({"_id": "taken"})
+    coalescer = WriteCoalescer(max_batch_size=2, max_delay=60)
+    
+    outcomes = await asyncio.gather(
+        coalescer.insert(collection, {"_id": "taken"}),
+        coalescer.insert(collection, {"_id": "free"}),
+        return_exceptions=True
+    )
+    
+    assert isinstance(outcomes[0], DocumentWriteError)
+    assert outcomes[0].duplicate_key
+    assert outcomes[1] == "free"
+    await coalescer.close()
+
+
+@pytest.mark.anyio
+async def test_close_flushes_buffered_documents(database):
+    collection = database["org_acme"]
+    coalescer = WriteCoalescer(max_batch_size=100, max_delay=60)
+    insert = asyncio.create_task(coalescer.insert(collection, {"n": 1}))
+    await asyncio.sleep(0)
+    
+    await coalescer.close()
+    
+    assert await insert is not None
+    assert await collection.count_documents({}) == 1
+    with pytest.raises(RuntimeError):
+        await coalescer.insert(collection, {"n": 2})